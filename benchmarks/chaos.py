@@ -0,0 +1,218 @@
+"""Run the integration against a fake SmartThings cloud injecting faults.
+
+A config entry is set up against the local fake cloud, then commands,
+scenes, a token refresh and signed webhook events are sent through it:
+
+    python -m benchmarks.chaos --devices 200 --latency 0.05 --jitter 0.2 \
+        --error-rate 0.05 --rate-limit-rate 0.02 --output chaos.json
+
+The report holds the outcome and latency of every phase with the state
+of the API policies, as the diagnostics of the entry report them.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+from collections import Counter
+from collections.abc import Awaitable, Callable
+from contextlib import nullcontext
+import itertools
+import time
+from typing import Any
+
+from aiohttp import ClientSession
+from pysmartthings import Capability
+
+from homeassistant.config_entries import ConfigEntry, ConfigEntryState
+from homeassistant.core import HomeAssistant
+
+from custom_components.notsosmartthings.const import DATA_BROKERS, DOMAIN
+from custom_components.notsosmartthings.diagnostics import (
+    async_get_config_entry_diagnostics,
+)
+from custom_components.notsosmartthings.metrics import async_get_metrics
+
+from .fake_cloud import Faults, FakeCloud
+from .fleet import FleetDevice, generate_events, generate_fleet
+from .harness import (
+    async_bench_hass,
+    async_cloud_entry,
+    async_serve_webhooks,
+    lift_rate_limit,
+    percentile,
+    run_cli,
+)
+
+
+async def async_measure_calls(
+    calls: list[Callable[[], Awaitable[Any]]], concurrency: int
+) -> dict[str, Any]:
+    """Make the calls with bounded concurrency and return their outcome."""
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies: list[float] = []
+    outcomes: Counter[str] = Counter()
+
+    async def measure(call: Callable[[], Awaitable[Any]]) -> None:
+        async with semaphore:
+            start = time.perf_counter()
+            try:
+                await call()
+            except Exception as ex:  # noqa: BLE001
+                outcomes[type(ex).__name__] += 1
+            else:
+                outcomes["ok"] += 1
+            latencies.append(time.perf_counter() - start)
+
+    await asyncio.gather(*(measure(call) for call in calls))
+
+    def milliseconds(percent: float) -> float | None:
+        value = percentile(latencies, percent)
+        return None if value is None else round(value * 1000, 3)
+
+    return {
+        "calls": len(calls),
+        "outcomes": dict(outcomes),
+        "p50_ms": milliseconds(50),
+        "p99_ms": milliseconds(99),
+    }
+
+
+async def async_run(args: argparse.Namespace) -> dict[str, Any]:
+    """Run every phase of the scenario and return the report."""
+    faults = Faults(
+        latency=args.latency,
+        jitter=args.jitter,
+        error_rate=args.error_rate,
+        rate_limit_rate=args.rate_limit_rate,
+        retry_after=args.retry_after,
+    )
+    fleet = generate_fleet(args.devices, "location", args.seed)
+    cloud = FakeCloud("location", faults, args.seed)
+    cloud.add_devices(fleet)
+    for index in range(args.scenes):
+        cloud.add_scene(f"Scene {index}")
+
+    async with (
+        async_bench_hass() as hass,
+        async_cloud_entry(hass, cloud) as entry,
+    ):
+        disable_metrics = async_get_metrics(hass).async_enable()
+        start = time.perf_counter()
+        await hass.config_entries.async_setup(entry.entry_id)
+        await hass.async_block_till_done()
+        report: dict[str, Any] = {
+            "faults": faults._asdict(),
+            "devices": args.devices,
+            "setup": {
+                "state": entry.state.value,
+                "seconds": round(time.perf_counter() - start, 3),
+            },
+        }
+        if entry.state is ConfigEntryState.LOADED:
+            report.update(await async_run_phases(hass, cloud, fleet, entry, args))
+        diagnostics = await async_get_config_entry_diagnostics(hass, entry)
+        disable_metrics()
+
+    report["api"] = diagnostics["api"]
+    report["cloud"] = {"requests": cloud.requests, "injected": dict(cloud.injected)}
+    return report
+
+
+async def async_run_phases(
+    hass: HomeAssistant,
+    cloud: FakeCloud,
+    fleet: list[FleetDevice],
+    entry: ConfigEntry,
+    args: argparse.Namespace,
+) -> dict[str, Any]:
+    """Send commands, scenes, a token refresh and events through the entry."""
+    broker = hass.data[DOMAIN][DATA_BROKERS][entry.entry_id]
+    report: dict[str, Any] = {"device_count": len(broker.devices)}
+
+    switches = [
+        device
+        for device in broker.devices.values()
+        if Capability.switch in device.capabilities
+    ]
+    report["commands"] = await async_measure_calls(
+        [
+            lambda device=device, value=value: device.command(
+                "main", Capability.switch, value
+            )
+            for device, value in zip(
+                itertools.islice(itertools.cycle(switches), args.commands),
+                itertools.cycle(("on", "off")),
+            )
+        ]
+        if switches
+        else [],
+        args.concurrency,
+    )
+    report["scenes"] = await async_measure_calls(
+        [scene.execute for scene in broker.scenes.values()], args.concurrency
+    )
+    report["token_refresh"] = await async_measure_calls(
+        [broker.tokens.async_refresh] * args.concurrency, args.concurrency
+    )
+
+    received = broker.event_counts["received"]
+    async with async_serve_webhooks(hass) as url, ClientSession() as session:
+        webhooks = await async_measure_calls(
+            [
+                lambda event=event: cloud.async_post_events(session, url, [event])
+                for event in generate_events(fleet, args.events, args.seed)
+            ],
+            args.concurrency,
+        )
+        await hass.async_block_till_done()
+    report["webhooks"] = {
+        **webhooks,
+        "events_received": broker.event_counts["received"] - received,
+    }
+    return report
+
+
+def add_arguments(parser: argparse.ArgumentParser) -> None:
+    """Add the options of the command line."""
+    parser.add_argument("--devices", type=int, default=100)
+    parser.add_argument("--scenes", type=int, default=5)
+    parser.add_argument("--commands", type=int, default=100)
+    parser.add_argument("--events", type=int, default=500)
+    parser.add_argument(
+        "--concurrency", type=int, default=10, help="calls in flight per phase"
+    )
+    parser.add_argument(
+        "--latency", type=float, default=0.0, help="seconds added to responses"
+    )
+    parser.add_argument(
+        "--jitter", type=float, default=0.0, help="seconds of random extra latency"
+    )
+    parser.add_argument(
+        "--error-rate", type=float, default=0.0, help="share of 503 responses"
+    )
+    parser.add_argument(
+        "--rate-limit-rate", type=float, default=0.0, help="share of 429 responses"
+    )
+    parser.add_argument(
+        "--retry-after", type=int, default=1, help="seconds sent with 429 responses"
+    )
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument(
+        "--rate-limit", action="store_true", help="keep the account rate limit"
+    )
+
+
+async def async_run_cli(args: argparse.Namespace) -> dict[str, Any]:
+    """Run the scenario, with the rate limit lifted unless kept."""
+    with nullcontext() if args.rate_limit else lift_rate_limit():
+        return await async_run(args)
+
+
+def main() -> None:
+    """Run the scenario from the command line."""
+    run_cli(__doc__, add_arguments, async_run_cli)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+"""Compare setup with the status listed with the devices and fetched per device.
+
+A config entry is set up against the local fake SmartThings cloud for each
+fleet size, once with the status included in the device listing and once
+with a cloud ignoring includeStatus, so each device status is refreshed on
+its own like before:
+
+    python -m benchmarks.device_status --sizes 10 100 1000 --latency 0.05
+
+The account rate limit is lifted unless --rate-limit is given, so setup
+times reflect the number of round-trips rather than the request budget.
+"""
+
+from __future__ import annotations
+
+import argparse
+from contextlib import nullcontext
+import sys
+import time
+from typing import Any
+
+from homeassistant.core import HomeAssistant
+
+from custom_components.notsosmartthings.const import DATA_BROKERS, DOMAIN
+
+from .fake_cloud import Faults, FakeCloud
+from .fleet import FleetDevice, generate_fleet
+from .harness import async_bench_hass, async_cloud_entry, lift_rate_limit, run_cli
+
+LOCATION_ID = "6b4e6f6c-9c4a-4f53-9b43-5d5c1c2e0a71"
+MODES = {"inline": True, "per_device": False}
+
+
+async def async_measure_setup(
+    hass: HomeAssistant, fleet: list[FleetDevice], inline_status: bool, latency: float
+) -> dict[str, Any]:
+    """Set up a config entry and return its duration and the requests made."""
+    cloud = FakeCloud(
+        LOCATION_ID, Faults(latency=latency), inline_status=inline_status
+    )
+    cloud.add_devices(fleet)
+    async with async_cloud_entry(hass, cloud) as entry:
+        start = time.perf_counter()
+        if not await hass.config_entries.async_setup(entry.entry_id):
+            raise RuntimeError(f"Setup failed in state {entry.state}")
+        await hass.async_block_till_done()
+        setup = time.perf_counter() - start
+        broker = hass.data[DOMAIN][DATA_BROKERS][entry.entry_id]
+        return {
+            "setup_s": round(setup, 3),
+            "devices_s": broker.setup_timings.get("devices"),
+            "first_entity_s": broker.setup_timings.get("first_entity"),
+            "last_entity_s": broker.setup_timings.get("last_entity"),
+            "api_requests": cloud.requests,
+            "devices": len(broker.devices),
+        }
+
+
+async def async_run(
+    sizes: list[int], latency: float, rate_limit: bool
+) -> dict[str, Any]:
+    """Run the benchmark for each fleet size and way of loading the status."""
+    results = {}
+    with nullcontext() if rate_limit else lift_rate_limit():
+        for size in sizes:
+            fleet = generate_fleet(size, LOCATION_ID)
+            result = {}
+            for mode, inline_status in MODES.items():
+                async with async_bench_hass() as hass:
+                    result[mode] = await async_measure_setup(
+                        hass, fleet, inline_status, latency
+                    )
+            results[str(size)] = result
+            print(
+                f"{size} devices set up in {result['inline']['setup_s']}s with the"
+                f" status listed, {result['per_device']['setup_s']}s per device",
+                file=sys.stderr,
+            )
+    return {"latency": latency, "rate_limit": rate_limit, "sizes": results}
+
+
+def add_arguments(parser: argparse.ArgumentParser) -> None:
+    """Add the options of the command line."""
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10, 100, 1000])
+    parser.add_argument(
+        "--latency", type=float, default=0.05, help="seconds added to each response"
+    )
+    parser.add_argument(
+        "--rate-limit", action="store_true", help="keep the account rate limit"
+    )
+
+
+def main() -> None:
+    """Run the benchmark from the command line."""
+    run_cli(
+        __doc__,
+        add_arguments,
+        lambda args: async_run(args.sizes, args.latency, args.rate_limit),
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,124 @@
+"""Count the tasks created to dispatch device events to the entities.
+
+Brokers are built from a generated fleet and events are handed to them
+with the entities updated by callbacks, then again with every entity given
+an async_update so each update runs in a task like it used to:
+
+    python -m benchmarks.dispatch --devices 500 --events 2000
+
+The report holds the tasks created and states written per event.
+"""
+
+from __future__ import annotations
+
+import argparse
+from contextlib import nullcontext
+import itertools
+import sys
+import time
+from typing import Any
+from unittest.mock import patch
+
+from pysmartapp.event import EventRequest
+
+from custom_components.notsosmartthings.entity import SmartThingsEntity
+
+from .fake_cloud import FakeCloud
+from .fleet import generate_events, generate_fleet
+from .harness import (
+    add_entry,
+    async_add_broker,
+    async_bench_hass,
+    async_setup_platforms,
+    count_state_writes,
+    count_tasks,
+    device_from_snapshot,
+    run_cli,
+)
+
+LOCATION_ID = "6b4e6f6c-9c4a-4f53-9b43-5d5c1c2e0a71"
+
+
+async def _async_update(self: SmartThingsEntity) -> None:
+    """Update the entity in a task, like every entity did before."""
+    # pylint: disable-next=protected-access
+    self._async_update_attrs()
+
+
+async def async_measure(
+    devices: int, count: int, batch: int, tasks_per_update: bool
+) -> dict[str, Any]:
+    """Hand events to a broker and return the tasks and states per event."""
+    fleet = generate_fleet(devices, LOCATION_ID)
+    cloud = FakeCloud(LOCATION_ID)
+    generated = generate_events(fleet, count)
+    requests = []
+    while chunk := list(itertools.islice(generated, batch)):
+        requests.append(EventRequest(cloud.event_payload(chunk)))
+
+    with (
+        patch.object(SmartThingsEntity, "async_update", _async_update, create=True)
+        if tasks_per_update
+        else nullcontext()
+    ):
+        async with async_bench_hass() as hass:
+            entry = add_entry(hass, cloud.installed_app_id, LOCATION_ID)
+            broker = await async_add_broker(
+                hass,
+                entry,
+                [
+                    device_from_snapshot(
+                        {"device": device.device, "status": device.status}
+                    )
+                    for device in fleet
+                ],
+            )
+            entities = sum((await async_setup_platforms(hass, entry)).values())
+            with count_tasks(hass) as tasks, count_state_writes(hass) as writes:
+                started = time.perf_counter()
+                for request in requests:
+                    # pylint: disable-next=protected-access
+                    await broker._event_handler(request, None, None)
+                    await hass.async_block_till_done()
+                elapsed = time.perf_counter() - started
+
+    return {
+        "entities": entities,
+        "events_per_sec": round(count / elapsed, 1) if elapsed else None,
+        "tasks_per_event": round(tasks.tasks / count, 2) if count else None,
+        "state_writes_per_event": round(writes.writes / count, 2) if count else None,
+    }
+
+
+async def async_run(devices: int, events: int, batch: int) -> dict[str, Any]:
+    """Run the benchmark with entities updated by callbacks and by tasks."""
+    report: dict[str, Any] = {"devices": devices, "events": events, "batch": batch}
+    for mode, tasks_per_update in (("callback", False), ("task", True)):
+        report[mode] = await async_measure(devices, events, batch, tasks_per_update)
+        print(
+            f"{report[mode]['tasks_per_event']} tasks per event updating by {mode}",
+            file=sys.stderr,
+        )
+    return report
+
+
+def add_arguments(parser: argparse.ArgumentParser) -> None:
+    """Add the options of the command line."""
+    parser.add_argument("--devices", type=int, default=500)
+    parser.add_argument("--events", type=int, default=2000)
+    parser.add_argument(
+        "--batch", type=int, default=1, help="events delivered per webhook request"
+    )
+
+
+def main() -> None:
+    """Run the benchmark from the command line."""
+    run_cli(
+        __doc__,
+        add_arguments,
+        lambda args: async_run(args.devices, args.events, args.batch),
+    )
+
+
+if __name__ == "__main__":
+    main()
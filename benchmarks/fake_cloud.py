@@ -0,0 +1,487 @@
+"""Local stand-in for the SmartThings cloud API.
+
+The account of a single installed app is served from memory by an aiohttp
+server bound to the loopback interface. Sessions created by the cloud send
+requests addressed to the SmartThings hosts to that server instead.
+
+Latency, server errors and rate limiting are injected according to the
+faults of the cloud, which can be changed while it runs. Webhook requests
+are signed with the key pair of the app like the SmartThings cloud does.
+Devices reporting power consumption have a history of reports, one every
+quarter of an hour of the day before the first request for it.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import base64
+from collections import Counter
+from collections.abc import Iterable
+from datetime import UTC, datetime, timedelta
+from email.utils import formatdate
+import hashlib
+from http import HTTPStatus
+import itertools
+import json
+import random
+from typing import Any, NamedTuple
+from urllib.parse import urlencode
+import uuid
+
+from aiohttp import ClientRequest, ClientSession, web
+from Crypto.PublicKey import RSA
+from httpsig.sign import HeaderSigner
+from yarl import URL
+
+from .fleet import FleetDevice
+
+API_HOSTS = {"api.smartthings.com", "auth-global.api.smartthings.com"}
+API_BASE = "https://api.smartthings.com/v1/"
+PAGE_SIZE = 200
+TIMESTAMP = "2024-01-01T00:00:00.000Z"
+SIGNED_HEADERS = ["(request-target)", "digest", "date"]
+HISTORY_PAGE_SIZE = 20
+HISTORY_REPORTS = 96
+HISTORY_INTERVAL = timedelta(minutes=15)
+
+
+class Faults(NamedTuple):
+    """Faults injected into the responses of the API."""
+
+    latency: float = 0.0  # seconds added to every response
+    jitter: float = 0.0  # seconds of uniformly distributed extra latency
+    error_rate: float = 0.0  # share of requests failing with a server error
+    rate_limit_rate: float = 0.0  # share of requests rejected with a 429
+    retry_after: int = 1  # seconds sent with injected 429 responses
+
+
+class FakeCloud:
+    """SmartThings account of an installed app served over HTTP."""
+
+    def __init__(
+        self,
+        location_id: str | None = None,
+        faults: Faults | None = None,
+        seed: int = 0,
+        inline_status: bool = True,
+    ) -> None:
+        """Create an empty account.
+
+        Without inline_status the device listing ignores includeStatus,
+        so the status of each device must be requested on its own.
+        """
+        self.faults = faults or Faults()
+        self.inline_status = inline_status
+        self.injected: Counter[str] = Counter()
+        self._random = random.Random(seed)
+        self._key = RSA.generate(2048)
+        self._signer = HeaderSigner(
+            f"/pl/useast1/{uuid.uuid4()}",
+            self._key.export_key().decode(),
+            algorithm="rsa-sha256",
+            headers=SIGNED_HEADERS,
+        )
+        self.location_id = location_id or str(uuid.uuid4())
+        self.app_id = str(uuid.uuid4())
+        self.installed_app_id = str(uuid.uuid4())
+        self.devices: dict[str, dict[str, Any]] = {}
+        self.statuses: dict[str, dict[str, Any]] = {}
+        self.scenes: dict[str, dict[str, Any]] = {}
+        self.subscriptions: dict[str, dict[str, Any]] = {}
+        self.histories: dict[str, list[dict[str, Any]]] = {}
+        self.commands: list[tuple[str, list[dict[str, Any]]]] = []
+        self.requests = 0
+        self._token_counter = itertools.count()
+        self._runner: web.AppRunner | None = None
+        self._url: URL | None = None
+
+    @property
+    def url(self) -> URL:
+        """Return the URL of the running server."""
+        assert self._url is not None
+        return self._url
+
+    def add_devices(self, fleet: Iterable[FleetDevice]) -> None:
+        """Add generated devices and their status to the account."""
+        for device in fleet:
+            device_id = device.device["deviceId"]
+            self.devices[device_id] = device.device
+            self.statuses[device_id] = device.status
+
+    def add_scene(self, name: str) -> dict[str, Any]:
+        """Add a scene to the location of the account."""
+        scene = {
+            "sceneId": str(uuid.uuid4()),
+            "sceneName": name,
+            "sceneIcon": "204",
+            "sceneColor": None,
+            "locationId": self.location_id,
+        }
+        self.scenes[scene["sceneId"]] = scene
+        return scene
+
+    def entry_data(self) -> dict[str, Any]:
+        """Return the data of a config entry of the installed app."""
+        return {
+            "app_id": self.app_id,
+            "installed_app_id": self.installed_app_id,
+            "location_id": self.location_id,
+            "access_token": str(uuid.uuid4()),
+            "client_id": str(uuid.uuid4()),
+            "client_secret": str(uuid.uuid4()),
+            "refresh_token": str(uuid.uuid4()),
+        }
+
+    async def async_start(self) -> None:
+        """Start serving the API on a free port of the loopback interface."""
+        app = web.Application(
+            middlewares=[self._count_requests, self._inject_faults]
+        )
+        app.add_routes(
+            [
+                web.get("/v1/apps/{app_id}", self._get_app),
+                web.get("/v1/installedapps/{installed_app_id}", self._get_installed_app),
+                web.get(
+                    "/v1/installedapps/{installed_app_id}/subscriptions",
+                    self._get_subscriptions,
+                ),
+                web.post(
+                    "/v1/installedapps/{installed_app_id}/subscriptions",
+                    self._create_subscription,
+                ),
+                web.delete(
+                    "/v1/installedapps/{installed_app_id}/subscriptions/{subscription_id}",
+                    self._delete_subscription,
+                ),
+                web.get("/v1/devices", self._get_devices),
+                web.get("/v1/devices/{device_id}", self._get_device),
+                web.get("/v1/devices/{device_id}/status", self._get_device_status),
+                web.post("/v1/devices/{device_id}/commands", self._post_commands),
+                web.get("/v1/history/devices", self._get_history),
+                web.get("/v1/scenes", self._get_scenes),
+                web.post("/v1/scenes/{scene_id}/execute", self._execute_scene),
+                web.post("/oauth/token", self._generate_tokens),
+            ]
+        )
+        self._runner = web.AppRunner(app, access_log=None)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, "127.0.0.1", 0)
+        await site.start()
+        host, port = self._runner.addresses[0][:2]
+        self._url = URL.build(scheme="http", host=host, port=port)
+
+    async def async_stop(self) -> None:
+        """Stop serving the API."""
+        if self._runner:
+            await self._runner.cleanup()
+            self._runner = None
+
+    def client_session(self) -> ClientSession:
+        """Return a session sending requests for the SmartThings hosts here."""
+        target = self.url
+
+        class RedirectedRequest(ClientRequest):
+            """Request whose SmartThings host is replaced by the server."""
+
+            def __init__(self, method: str, url: URL, **kwargs: Any) -> None:
+                if url.host in API_HOSTS:
+                    url = url.with_scheme(target.scheme).with_host(
+                        target.host
+                    ).with_port(target.port)
+                super().__init__(method, url, **kwargs)
+
+        return ClientSession(request_class=RedirectedRequest)
+
+    def event_payload(self, events: list[dict[str, Any]]) -> dict[str, Any]:
+        """Return the webhook payload delivering events to the installed app."""
+        return {
+            "lifecycle": "EVENT",
+            "executionId": str(uuid.uuid4()),
+            "locale": "en",
+            "version": "1.0.0",
+            "eventData": {
+                "authToken": str(uuid.uuid4()),
+                "installedApp": {
+                    "installedAppId": self.installed_app_id,
+                    "locationId": self.location_id,
+                    "config": {},
+                },
+                "events": events,
+            },
+            "settings": {"appId": self.app_id},
+        }
+
+    def sign(self, url: URL, body: bytes) -> dict[str, str]:
+        """Return the headers of a webhook request signed by the app key."""
+        headers = {
+            "Content-Type": "application/json",
+            "Date": formatdate(usegmt=True),
+            "Digest": "SHA-256="
+            + base64.b64encode(hashlib.sha256(body).digest()).decode(),
+        }
+        return self._signer.sign(headers, method="POST", path=url.raw_path_qs)
+
+    async def async_post_events(
+        self, session: ClientSession, url: URL, events: list[dict[str, Any]]
+    ) -> int:
+        """Deliver events to a webhook with a signed request and return the status."""
+        body = json.dumps(self.event_payload(events)).encode()
+        async with session.post(url, data=body, headers=self.sign(url, body)) as resp:
+            await resp.read()
+            return resp.status
+
+    @web.middleware
+    async def _count_requests(self, request: web.Request, handler: Any) -> Any:
+        self.requests += 1
+        return await handler(request)
+
+    @web.middleware
+    async def _inject_faults(self, request: web.Request, handler: Any) -> Any:
+        faults = self.faults
+        if delay := faults.latency + self._random.uniform(0, faults.jitter):
+            await asyncio.sleep(delay)
+        draw = self._random.random()
+        if draw < faults.rate_limit_rate:
+            self.injected["rate_limited"] += 1
+            return _error_response(
+                HTTPStatus.TOO_MANY_REQUESTS,
+                "TooManyRequestError",
+                headers={"Retry-After": str(faults.retry_after)},
+            )
+        if draw < faults.rate_limit_rate + faults.error_rate:
+            self.injected["errors"] += 1
+            return _error_response(HTTPStatus.SERVICE_UNAVAILABLE, "UnexpectedError")
+        return await handler(request)
+
+    async def _get_app(self, request: web.Request) -> web.Response:
+        if request.match_info["app_id"] != self.app_id:
+            raise web.HTTPForbidden
+        return web.json_response(
+            {
+                "appName": f"homeassistant.{self.app_id[:8]}",
+                "appId": self.app_id,
+                "appType": "WEBHOOK_SMART_APP",
+                "classifications": ["AUTOMATION"],
+                "displayName": "Home Assistant",
+                "description": "Benchmark",
+                "singleInstance": True,
+                "webhookSmartApp": {
+                    "targetUrl": "https://example.com/api/webhook/benchmark",
+                    "publicKey": self._key.public_key().export_key().decode(),
+                },
+                "createdDate": TIMESTAMP,
+                "lastUpdatedDate": TIMESTAMP,
+            }
+        )
+
+    async def _get_installed_app(self, request: web.Request) -> web.Response:
+        if request.match_info["installed_app_id"] != self.installed_app_id:
+            raise web.HTTPForbidden
+        return web.json_response(
+            {
+                "installedAppId": self.installed_app_id,
+                "installedAppType": "WEBHOOK_SMART_APP",
+                "installedAppStatus": "AUTHORIZED",
+                "displayName": "Home Assistant",
+                "appId": self.app_id,
+                "referenceId": None,
+                "locationId": self.location_id,
+                "createdDate": TIMESTAMP,
+                "lastUpdatedDate": TIMESTAMP,
+                "classifications": ["AUTOMATION"],
+            }
+        )
+
+    async def _get_subscriptions(self, request: web.Request) -> web.Response:
+        return web.json_response({"items": list(self.subscriptions.values())})
+
+    async def _create_subscription(self, request: web.Request) -> web.Response:
+        data = await request.json()
+        subscription = {
+            **data,
+            "id": str(uuid.uuid4()),
+            "installedAppId": request.match_info["installed_app_id"],
+        }
+        self.subscriptions[subscription["id"]] = subscription
+        return web.json_response(subscription)
+
+    async def _delete_subscription(self, request: web.Request) -> web.Response:
+        self.subscriptions.pop(request.match_info["subscription_id"], None)
+        return web.json_response({"count": 1})
+
+    async def _get_devices(self, request: web.Request) -> web.Response:
+        location_ids = request.query.getall("locationId", [])
+        device_ids = request.query.getall("deviceId", [])
+        devices = [
+            device
+            for device in self.devices.values()
+            if (not location_ids or device["locationId"] in location_ids)
+            and (not device_ids or device["deviceId"] in device_ids)
+        ]
+        page = int(request.query.get("page", 0))
+        page_items = devices[page * PAGE_SIZE : (page + 1) * PAGE_SIZE]
+        if self.inline_status and request.query.get("includeStatus") == "true":
+            page_items = [self._with_status(device) for device in page_items]
+        response: dict[str, Any] = {"items": page_items}
+        if (page + 1) * PAGE_SIZE < len(devices):
+            # The next link carries the filters of the request, like the API
+            query = [
+                (key, value) for key, value in request.query.items() if key != "page"
+            ]
+            query.append(("page", str(page + 1)))
+            response["_links"] = {
+                "next": {"href": f"{API_BASE}devices?{urlencode(query)}"}
+            }
+        return web.json_response(response)
+
+    def _with_status(self, device: dict[str, Any]) -> dict[str, Any]:
+        """Return the device with the status of each capability included."""
+        status = self.statuses[device["deviceId"]]["components"]
+        return {
+            **device,
+            "components": [
+                {
+                    **component,
+                    "capabilities": [
+                        {
+                            **capability,
+                            "status": status[component["id"]][capability["id"]],
+                        }
+                        for capability in component["capabilities"]
+                    ],
+                }
+                for component in device["components"]
+            ],
+        }
+
+    async def _get_device(self, request: web.Request) -> web.Response:
+        if (device := self.devices.get(request.match_info["device_id"])) is None:
+            raise web.HTTPNotFound
+        return web.json_response(device)
+
+    async def _get_device_status(self, request: web.Request) -> web.Response:
+        if (status := self.statuses.get(request.match_info["device_id"])) is None:
+            raise web.HTTPNotFound
+        return web.json_response(status)
+
+    async def _post_commands(self, request: web.Request) -> web.Response:
+        device_id = request.match_info["device_id"]
+        if device_id not in self.devices:
+            raise web.HTTPNotFound
+        data = await request.json()
+        self.commands.append((device_id, data["commands"]))
+        return web.json_response(
+            {"results": [{"id": str(uuid.uuid4()), "status": "ACCEPTED"}]}
+        )
+
+    def history(self, device_id: str) -> list[dict[str, Any]]:
+        """Return the power consumption reports of a device, oldest first."""
+        if (events := self.histories.get(device_id)) is not None:
+            return events
+        events = self.histories[device_id] = []
+        status = self.statuses.get(device_id, {}).get("components", {})
+        if "powerConsumptionReport" not in status.get("main", {}):
+            return events
+        rand = random.Random(device_id)
+        end = datetime.now(UTC).replace(second=0, microsecond=0)
+        start = end - HISTORY_REPORTS * HISTORY_INTERVAL
+        energy = 0.0
+        for index in range(HISTORY_REPORTS):
+            report_start = start + index * HISTORY_INTERVAL
+            report_end = report_start + HISTORY_INTERVAL
+            delta = round(rand.uniform(10, 40), 1)
+            energy += delta
+            epoch = int(report_end.timestamp() * 1000)
+            events.append(
+                {
+                    "deviceId": device_id,
+                    "locationId": self.location_id,
+                    "component": "main",
+                    "capability": "powerConsumptionReport",
+                    "attribute": "powerConsumption",
+                    "value": {
+                        "start": report_start.isoformat(),
+                        "end": report_end.isoformat(),
+                        "energy": round(energy, 1),
+                        "deltaEnergy": delta,
+                        "power": round(delta * 4, 1),
+                    },
+                    "time": report_end.isoformat(),
+                    "epoch": epoch,
+                    "hash": hashlib.md5(f"{device_id}{epoch}".encode()).hexdigest(),
+                }
+            )
+        return events
+
+    async def _get_history(self, request: web.Request) -> web.Response:
+        events = [
+            event
+            for device_id in request.query.getall("deviceId", [])
+            for event in self.history(device_id)
+        ]
+        events.sort(
+            key=lambda event: event["epoch"],
+            reverse=request.query.get("oldestFirst") != "true",
+        )
+        if "pagingAfterHash" in request.query:
+            after = next(
+                (
+                    index + 1
+                    for index, event in enumerate(events)
+                    if event["hash"] == request.query["pagingAfterHash"]
+                ),
+                0,
+            )
+            events = events[after:]
+        response: dict[str, Any] = {"items": events[:HISTORY_PAGE_SIZE]}
+        if len(events) > HISTORY_PAGE_SIZE:
+            last = events[HISTORY_PAGE_SIZE - 1]
+            query = [
+                (key, value)
+                for key, value in request.query.items()
+                if not key.startswith("pagingAfter")
+            ]
+            query.extend(
+                [
+                    ("pagingAfterEpoch", str(last["epoch"])),
+                    ("pagingAfterHash", last["hash"]),
+                ]
+            )
+            response["_links"] = {
+                "next": {"href": f"{API_BASE}history/devices?{urlencode(query)}"}
+            }
+        return web.json_response(response)
+
+    async def _get_scenes(self, request: web.Request) -> web.Response:
+        return web.json_response({"items": list(self.scenes.values())})
+
+    async def _execute_scene(self, request: web.Request) -> web.Response:
+        if request.match_info["scene_id"] not in self.scenes:
+            raise web.HTTPNotFound
+        return web.json_response({"status": "success"})
+
+    async def _generate_tokens(self, request: web.Request) -> web.Response:
+        counter = next(self._token_counter)
+        return web.json_response(
+            {
+                "access_token": f"access-{counter}",
+                "token_type": "bearer",
+                "refresh_token": f"refresh-{counter}",
+                "expires_in": 86399,
+                "scope": "r:devices:*",
+            }
+        )
+
+
+def _error_response(
+    status: HTTPStatus, code: str, headers: dict[str, str] | None = None
+) -> web.Response:
+    """Return an error with the body the SmartThings API sends."""
+    return web.json_response(
+        {
+            "requestId": str(uuid.uuid4()),
+            "error": {"code": code, "message": status.phrase, "details": []},
+        },
+        status=status,
+        headers=headers,
+    )
@@ -0,0 +1,340 @@
+"""Synthetic device fleets with a realistic mix of capabilities."""
+
+from __future__ import annotations
+
+from collections.abc import Callable, Iterator
+import random
+from typing import Any, NamedTuple
+import uuid
+
+from pysmartapp.event import EVENT_TYPE_DEVICE
+
+
+class Attribute(NamedTuple):
+    """An attribute of a capability, its initial value and later values."""
+
+    capability: str
+    attribute: str
+    value: Any
+    unit: str | None = None
+    changes: Callable[[random.Random], Any] | None = None
+
+
+class Archetype(NamedTuple):
+    """A kind of device and how common it is in a home."""
+
+    name: str
+    weight: int
+    components: dict[str, list[Attribute]]
+
+
+def _level(rng: random.Random) -> int:
+    return rng.randint(0, 100)
+
+
+def _temperature(rng: random.Random) -> float:
+    return round(rng.uniform(17, 24), 1)
+
+
+def _power(rng: random.Random) -> float:
+    return round(rng.uniform(0, 1500), 1)
+
+
+def _choice(*values: Any) -> Callable[[random.Random], Any]:
+    return lambda rng: rng.choice(values)
+
+
+SWITCH = Attribute("switch", "switch", "off", changes=_choice("on", "off"))
+BATTERY = Attribute("battery", "battery", 87, "%")
+TEMPERATURE = Attribute(
+    "temperatureMeasurement", "temperature", 21.0, "C", _temperature
+)
+HUMIDITY = Attribute(
+    "relativeHumidityMeasurement", "humidity", 45, "%", _level
+)
+# Reported by every device of the current cloud, the integration relies on it
+DISABLED_COMPONENTS = Attribute(
+    "custom.disabledComponents", "disabledComponents", []
+)
+DISABLED_CAPABILITIES = Attribute(
+    "custom.disabledCapabilities", "disabledCapabilities", []
+)
+
+ARCHETYPES = [
+    Archetype(
+        "bulb",
+        20,
+        {
+            "main": [
+                SWITCH,
+                Attribute("switchLevel", "level", 80, "%", _level),
+                Attribute("colorTemperature", "colorTemperature", 2700, "K"),
+                Attribute("colorControl", "hue", 0),
+                Attribute("colorControl", "saturation", 0),
+            ]
+        },
+    ),
+    Archetype(
+        "dimmer",
+        8,
+        {"main": [SWITCH, Attribute("switchLevel", "level", 50, "%", _level)]},
+    ),
+    Archetype(
+        "plug",
+        15,
+        {
+            "main": [
+                SWITCH,
+                Attribute("powerMeter", "power", 0.0, "W", _power),
+                Attribute("energyMeter", "energy", 12.3, "kWh"),
+            ]
+        },
+    ),
+    Archetype(
+        "contact",
+        15,
+        {
+            "main": [
+                Attribute(
+                    "contactSensor",
+                    "contact",
+                    "closed",
+                    changes=_choice("open", "closed"),
+                ),
+                BATTERY,
+                TEMPERATURE,
+            ]
+        },
+    ),
+    Archetype(
+        "motion",
+        12,
+        {
+            "main": [
+                Attribute(
+                    "motionSensor",
+                    "motion",
+                    "inactive",
+                    changes=_choice("active", "inactive"),
+                ),
+                Attribute("illuminanceMeasurement", "illuminance", 120, "lux", _level),
+                BATTERY,
+                TEMPERATURE,
+            ]
+        },
+    ),
+    Archetype(
+        "leak",
+        4,
+        {
+            "main": [
+                Attribute("waterSensor", "water", "dry", changes=_choice("wet", "dry")),
+                BATTERY,
+            ]
+        },
+    ),
+    Archetype(
+        "climate",
+        5,
+        {
+            "main": [
+                TEMPERATURE,
+                HUMIDITY,
+                Attribute("thermostatMode", "thermostatMode", "heat"),
+                Attribute(
+                    "thermostatMode",
+                    "supportedThermostatModes",
+                    ["off", "heat", "cool", "auto"],
+                ),
+                Attribute(
+                    "thermostatHeatingSetpoint",
+                    "heatingSetpoint",
+                    20.0,
+                    "C",
+                    _temperature,
+                ),
+                Attribute("thermostatCoolingSetpoint", "coolingSetpoint", 24.0, "C"),
+                Attribute(
+                    "thermostatOperatingState",
+                    "thermostatOperatingState",
+                    "idle",
+                    changes=_choice("idle", "heating"),
+                ),
+                Attribute("thermostatFanMode", "thermostatFanMode", "auto"),
+                Attribute(
+                    "thermostatFanMode", "supportedThermostatFanModes", ["auto", "on"]
+                ),
+            ]
+        },
+    ),
+    Archetype(
+        "lock",
+        4,
+        {
+            "main": [
+                Attribute("lock", "lock", "locked", changes=_choice("locked", "unlocked")),
+                BATTERY,
+            ]
+        },
+    ),
+    Archetype(
+        "garage",
+        2,
+        {"main": [Attribute("doorControl", "door", "closed")]},
+    ),
+    Archetype(
+        "fan",
+        3,
+        {"main": [SWITCH, Attribute("fanSpeed", "fanSpeed", 1, changes=_choice(0, 1, 2, 3))]},
+    ),
+    Archetype(
+        "tv",
+        4,
+        {
+            "main": [
+                SWITCH,
+                Attribute("audioVolume", "volume", 15, "%", _level),
+                Attribute("audioMute", "mute", "unmuted"),
+                Attribute("mediaPlayback", "playbackStatus", "stopped"),
+                Attribute("mediaInputSource", "inputSource", "HDMI1"),
+                Attribute(
+                    "mediaInputSource",
+                    "supportedInputSources",
+                    ["HDMI1", "HDMI2", "digitalTv"],
+                ),
+            ]
+        },
+    ),
+    Archetype(
+        "refrigerator",
+        2,
+        {
+            "main": [
+                Attribute("refrigerationSetpoint", "refrigerationSetpoint", 3, "C"),
+                Attribute(
+                    "powerConsumptionReport",
+                    "powerConsumption",
+                    {"energy": 1200, "power": 90},
+                ),
+            ],
+            "freezer": [
+                Attribute(
+                    "temperatureMeasurement", "temperature", -18, "C", _temperature
+                ),
+                Attribute(
+                    "contactSensor",
+                    "contact",
+                    "closed",
+                    changes=_choice("open", "closed"),
+                ),
+            ],
+            "cooler": [
+                Attribute(
+                    "temperatureMeasurement", "temperature", 3, "C", _temperature
+                ),
+                Attribute(
+                    "contactSensor",
+                    "contact",
+                    "closed",
+                    changes=_choice("open", "closed"),
+                ),
+            ],
+        },
+    ),
+]
+
+
+class FleetDevice(NamedTuple):
+    """A generated device as returned by the API."""
+
+    archetype: Archetype
+    device: dict[str, Any]
+    status: dict[str, Any]
+
+
+def generate_fleet(
+    size: int, location_id: str, seed: int = 0
+) -> list[FleetDevice]:
+    """Generate devices with archetypes picked by weight."""
+    rng = random.Random(seed)
+    archetypes = rng.choices(
+        ARCHETYPES, weights=[archetype.weight for archetype in ARCHETYPES], k=size
+    )
+    fleet = []
+    for index, archetype in enumerate(archetypes):
+        device_id = str(uuid.UUID(int=rng.getrandbits(128), version=4))
+        attributes_of = {
+            component_id: [
+                *attributes,
+                DISABLED_COMPONENTS if component_id == "main" else DISABLED_CAPABILITIES,
+            ]
+            for component_id, attributes in archetype.components.items()
+        }
+        components = [
+            {
+                "id": component_id,
+                "capabilities": [
+                    {"id": capability, "version": 1}
+                    for capability in dict.fromkeys(
+                        attribute.capability for attribute in attributes
+                    )
+                ],
+                "categories": [],
+            }
+            for component_id, attributes in attributes_of.items()
+        ]
+        status: dict[str, dict[str, dict[str, Any]]] = {}
+        for component_id, attributes in attributes_of.items():
+            capabilities = status.setdefault(component_id, {})
+            for attribute in attributes:
+                capabilities.setdefault(attribute.capability, {})[
+                    attribute.attribute
+                ] = {"value": attribute.value, "unit": attribute.unit}
+        fleet.append(
+            FleetDevice(
+                archetype,
+                {
+                    "deviceId": device_id,
+                    "name": f"{archetype.name}-{index}",
+                    "label": f"{archetype.name.title()} {index}",
+                    "locationId": location_id,
+                    "type": "ENDPOINT_APP",
+                    "components": components,
+                },
+                {"components": status},
+            )
+        )
+    return fleet
+
+
+def generate_events(
+    fleet: list[FleetDevice], count: int, seed: int = 0
+) -> Iterator[dict[str, Any]]:
+    """Generate device events of the attributes that change over time."""
+    rng = random.Random(seed)
+    changing = [
+        (device, component_id, attribute)
+        for device in fleet
+        for component_id, attributes in device.archetype.components.items()
+        for attribute in attributes
+        if attribute.changes is not None
+    ]
+    for _ in range(count):
+        device, component_id, attribute = rng.choice(changing)
+        value = attribute.changes(rng)
+        yield {
+            "eventType": EVENT_TYPE_DEVICE,
+            "deviceEvent": {
+                "subscriptionName": attribute.capability,
+                "eventId": str(uuid.UUID(int=rng.getrandbits(128), version=4)),
+                "locationId": device.device["locationId"],
+                "deviceId": device.device["deviceId"],
+                "componentId": component_id,
+                "capability": attribute.capability,
+                "attribute": attribute.attribute,
+                "value": value,
+                "valueType": "number" if isinstance(value, (int, float)) else "string",
+                "stateChange": True,
+            },
+        }
+
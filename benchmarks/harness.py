@@ -0,0 +1,317 @@
+"""Home Assistant instance running the integration against local data.
+
+A self-contained instance is created with the helpers of the development
+dependency pytest-homeassistant-custom-component. Benchmarks are run as
+modules from the repository root, e.g. python -m benchmarks.replay.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+from collections.abc import AsyncIterator, Callable, Coroutine, Iterable, Iterator
+from contextlib import asynccontextmanager, contextmanager
+from datetime import timedelta
+import importlib
+import json
+import logging
+import sys
+import tempfile
+from typing import Any
+from unittest.mock import MagicMock, patch
+
+from aiohttp import web
+from pytest_homeassistant_custom_component.common import (
+    MockConfigEntry,
+    async_test_home_assistant,
+)
+from yarl import URL
+
+from homeassistant import loader
+from homeassistant.components import webhook
+from homeassistant.config_entries import ConfigEntryState
+from homeassistant.const import CONF_ACCESS_TOKEN, CONF_WEBHOOK_ID, EVENT_STATE_CHANGED
+from homeassistant.core import Event, HomeAssistant, StateMachine, callback
+from homeassistant.helpers.entity_platform import EntityPlatform
+
+from custom_components.notsosmartthings import DeviceBroker
+from custom_components.notsosmartthings.const import (
+    CONF_INSTALLED_APP_ID,
+    CONF_LOCATION_ID,
+    DATA_BROKERS,
+    DOMAIN,
+    PLATFORMS,
+)
+from custom_components.notsosmartthings.device import DeviceEntity
+from custom_components.notsosmartthings.smartapp import setup_smartapp_endpoint
+
+from .fake_cloud import FakeCloud
+
+PACKAGE = "custom_components.notsosmartthings"
+
+
+@asynccontextmanager
+async def async_bench_hass() -> AsyncIterator[HomeAssistant]:
+    """Yield a running instance with the SmartApp endpoint set up."""
+    with tempfile.TemporaryDirectory() as config_dir:
+        async with async_test_home_assistant(config_dir=config_dir) as hass:
+            # Custom integrations are disabled by default in the test instance
+            hass.data.pop(loader.DATA_CUSTOM_COMPONENTS, None)
+            hass.config.external_url = "https://example.com"
+            logging.getLogger("homeassistant.loader").setLevel(logging.ERROR)
+            await setup_smartapp_endpoint(hass, False)
+            yield hass
+
+
+@asynccontextmanager
+async def async_serve_webhooks(hass: HomeAssistant) -> AsyncIterator[URL]:
+    """Serve the webhooks of the instance and yield the URL of the SmartApp.
+
+    The http integration is not set up by the benchmark instance, requests
+    are handed to the webhook integration like its view does.
+    """
+
+    async def handle(request: web.Request) -> web.StreamResponse:
+        return await webhook.async_handle_webhook(
+            hass, request.match_info["webhook_id"], request
+        )
+
+    app = web.Application()
+    app.router.add_post("/api/webhook/{webhook_id}", handle)
+    runner = web.AppRunner(app, access_log=None)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    host, port = runner.addresses[0][:2]
+    try:
+        yield URL.build(
+            scheme="http",
+            host=host,
+            port=port,
+            path=webhook.async_generate_path(hass.data[DOMAIN][CONF_WEBHOOK_ID]),
+        )
+    finally:
+        await runner.cleanup()
+
+
+@asynccontextmanager
+async def async_cloud_entry(
+    hass: HomeAssistant, cloud: FakeCloud
+) -> AsyncIterator[MockConfigEntry]:
+    """Start the fake cloud and yield a config entry of its installed app.
+
+    The API client of the integration is connected to the cloud while the
+    context is active, the entry is unloaded when it ends. The energy
+    history of the cloud is imported, its statistics are not recorded.
+    """
+    await cloud.async_start()
+    session = cloud.client_session()
+    # The webhook is registered by the instance without serving HTTP, the
+    # media player component registers its image view regardless
+    hass.config.components.update({"http", "webhook", "recorder"})
+    hass.http = MagicMock()
+    entry = MockConfigEntry(
+        domain=DOMAIN, title="Home", data=cloud.entry_data(), version=2
+    )
+    entry.add_to_hass(hass)
+    try:
+        with (
+            patch(f"{PACKAGE}.api.async_get_clientsession", return_value=session),
+            patch(f"{PACKAGE}.energy.async_add_external_statistics"),
+        ):
+            yield entry
+            if entry.state is ConfigEntryState.LOADED:
+                await hass.config_entries.async_unload(entry.entry_id)
+    finally:
+        await session.close()
+        await cloud.async_stop()
+
+
+@contextmanager
+def lift_rate_limit() -> Iterator[None]:
+    """Lift the account rate limit of API requests while active."""
+    with (
+        patch(f"{PACKAGE}.api.RATE_LIMIT_CAPACITY", 10**6),
+        patch(f"{PACKAGE}.api.RATE_LIMIT_REFILL_RATE", 10**6),
+    ):
+        yield
+
+
+def device_from_snapshot(data: dict[str, Any], api: Any = None) -> DeviceEntity:
+    """Create a device with its status from snapshot data."""
+    device = DeviceEntity(api, data["device"])
+    device.status.apply_data(data["status"])
+    return device
+
+
+def add_entry(
+    hass: HomeAssistant,
+    installed_app_id: str,
+    location_id: str = "location",
+    title: str = "Home",
+) -> MockConfigEntry:
+    """Add a loaded config entry of an installed app."""
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        title=title,
+        data={
+            CONF_ACCESS_TOKEN: "benchmark",
+            CONF_INSTALLED_APP_ID: installed_app_id,
+            CONF_LOCATION_ID: location_id,
+        },
+    )
+    entry.add_to_hass(hass)
+    entry.mock_state(hass, ConfigEntryState.LOADED)
+    return entry
+
+
+async def async_add_broker(
+    hass: HomeAssistant, entry: MockConfigEntry, devices: Iterable[DeviceEntity]
+) -> DeviceBroker:
+    """Create the broker of the entry without connecting it to the SmartApp."""
+    broker = await hass.async_add_import_executor_job(
+        DeviceBroker, hass, entry, None, None, list(devices), []
+    )
+    hass.data[DOMAIN][DATA_BROKERS][entry.entry_id] = broker
+    return broker
+
+
+async def async_setup_platform(
+    hass: HomeAssistant, entry: MockConfigEntry, platform: str
+) -> EntityPlatform:
+    """Set up the entities of a platform without forwarding the entry."""
+    module = importlib.import_module(f"{PACKAGE}.{platform}")
+    entity_platform = EntityPlatform(
+        hass=hass,
+        logger=logging.getLogger(module.__name__),
+        domain=platform,
+        platform_name=DOMAIN,
+        platform=module,
+        scan_interval=timedelta(seconds=30),
+        entity_namespace=None,
+    )
+    await entity_platform.async_setup_entry(entry)
+    return entity_platform
+
+
+async def async_setup_platforms(
+    hass: HomeAssistant, entry: MockConfigEntry
+) -> dict[str, int]:
+    """Set up the entities of every platform and return their number."""
+    counts = {}
+    for platform in PLATFORMS:
+        entity_platform = await async_setup_platform(hass, entry, platform)
+        counts[str(platform)] = len(entity_platform.entities)
+    await hass.async_block_till_done()
+    return counts
+
+
+class StateWrites:
+    """Count the states written by entities and how many changed."""
+
+    def __init__(self) -> None:
+        """Initialize the counters."""
+        self.writes = 0
+        self.changes = 0
+
+    def reset(self) -> None:
+        """Reset the counters."""
+        self.writes = 0
+        self.changes = 0
+
+
+@contextmanager
+def count_state_writes(hass: HomeAssistant) -> Iterator[StateWrites]:
+    """Count state writes while the context is active."""
+    counter = StateWrites()
+    original = StateMachine.async_set_internal
+
+    def async_set_internal(self: StateMachine, *args: Any, **kwargs: Any) -> None:
+        counter.writes += 1
+        original(self, *args, **kwargs)
+
+    @callback
+    def state_changed(_event: Event) -> None:
+        counter.changes += 1
+
+    StateMachine.async_set_internal = async_set_internal
+    remove = hass.bus.async_listen(EVENT_STATE_CHANGED, state_changed)
+    try:
+        yield counter
+    finally:
+        remove()
+        StateMachine.async_set_internal = original
+
+
+class TaskCount:
+    """Count the tasks created in the event loop."""
+
+    def __init__(self) -> None:
+        """Initialize the counter."""
+        self.tasks = 0
+
+
+@contextmanager
+def count_tasks(hass: HomeAssistant) -> Iterator[TaskCount]:
+    """Count the tasks created in the loop of the instance while active.
+
+    Eager tasks are created by Home Assistant without the task factory of
+    the loop, the task class it uses is replaced to count them as well.
+    """
+    counter = TaskCount()
+    loop = hass.loop
+    original = loop.get_task_factory()
+
+    class CountedTask(asyncio.Task):
+        """Task counted when created."""
+
+        def __init__(self, *args: Any, **kwargs: Any) -> None:
+            counter.tasks += 1
+            super().__init__(*args, **kwargs)
+
+    def task_factory(
+        loop: asyncio.AbstractEventLoop, coro: Coroutine[Any, Any, Any], **kwargs: Any
+    ) -> asyncio.Future[Any]:
+        if original is not None:
+            counter.tasks += 1
+            return original(loop, coro, **kwargs)
+        return CountedTask(coro, loop=loop, **kwargs)
+
+    loop.set_task_factory(task_factory)
+    try:
+        with patch("homeassistant.util.async_.Task", CountedTask):
+            yield counter
+    finally:
+        loop.set_task_factory(original)
+
+
+def percentile(samples: list[float], percent: float) -> float | None:
+    """Return the nearest-rank percentile of the samples."""
+    if not samples:
+        return None
+    ordered = sorted(samples)
+    index = max(0, min(len(ordered) - 1, round(len(ordered) * percent / 100) - 1))
+    return ordered[index]
+
+
+def run_cli(
+    doc: str,
+    add_arguments: Callable[[argparse.ArgumentParser], None],
+    run: Callable[[argparse.Namespace], Coroutine[Any, Any, dict[str, Any]]],
+) -> None:
+    """Run a benchmark from the command line and print its report.
+
+    The options of the benchmark are added to those all benchmarks share,
+    the report is also written to the file given with --output.
+    """
+    parser = argparse.ArgumentParser(description=doc.splitlines()[0])
+    add_arguments(parser)
+    parser.add_argument("--output", help="write the report to a file")
+    args = parser.parse_args()
+
+    report = asyncio.run(run(args))
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as file:
+            json.dump(report, file, indent=2)
+    json.dump(report, sys.stdout, indent=2)
+    print()
@@ -0,0 +1,58 @@
+"""Measure the memory held per entity for a fleet of a given entity count.
+
+The fleet is sized from the entities per device of a sample fleet, then
+its devices are set up platform by platform while tracing allocations:
+
+    python -m benchmarks.memory --entities 5000 --output memory.json
+"""
+
+from __future__ import annotations
+
+import argparse
+import sys
+from typing import Any
+
+from .fleet import generate_fleet
+from .harness import async_bench_hass, run_cli
+from .scale import LOCATION_ID, async_measure_memory
+
+SAMPLE_DEVICES = 200
+
+
+def count_entities(result: dict[str, Any]) -> int:
+    """Return the entities set up by a memory measurement."""
+    return sum(platform["entities"] for platform in result["platforms"].values())
+
+
+async def async_run(entities: int) -> dict[str, Any]:
+    """Size a fleet for the entity count and measure its memory."""
+    async with async_bench_hass() as hass:
+        sample = await async_measure_memory(
+            hass, generate_fleet(SAMPLE_DEVICES, LOCATION_ID)
+        )
+    per_device = count_entities(sample) / SAMPLE_DEVICES
+    devices = max(1, round(entities / per_device))
+    async with async_bench_hass() as hass:
+        result = await async_measure_memory(
+            hass, generate_fleet(devices, LOCATION_ID)
+        )
+    print(
+        f"{count_entities(result)} entities of {devices} devices hold"
+        f" {result['bytes_per_entity']} bytes each",
+        file=sys.stderr,
+    )
+    return {"devices": devices, "entities": count_entities(result), **result}
+
+
+def add_arguments(parser: argparse.ArgumentParser) -> None:
+    """Add the options of the command line."""
+    parser.add_argument("--entities", type=int, default=5000)
+
+
+def main() -> None:
+    """Run the benchmark from the command line."""
+    run_cli(__doc__, add_arguments, lambda args: async_run(args.entities))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,143 @@
+"""Replay recorded webhook payloads into brokers built from a snapshot.
+
+Recordings are made with the smartthings.start_recording service:
+
+    python -m benchmarks.replay smartthings_snapshot.json \
+        smartthings_webhooks.jsonl.gz.1 smartthings_webhooks.jsonl.gz --speed 10
+
+Events are replayed at their original pace divided by --speed, or as fast
+as possible with --max. The report is written as JSON.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+from collections.abc import Coroutine
+import gzip
+import json
+import time
+from typing import Any
+
+from pysmartapp.event import EventRequest
+
+from .harness import (
+    add_entry,
+    async_add_broker,
+    async_bench_hass,
+    async_setup_platforms,
+    count_state_writes,
+    device_from_snapshot,
+    percentile,
+    run_cli,
+)
+
+LIFECYCLE_EVENT = "EVENT"
+
+
+def read_records(paths: list[str]) -> list[dict[str, Any]]:
+    """Read the records of the recordings in the order they were received."""
+    records = []
+    for path in paths:
+        with gzip.open(path, "rt", encoding="utf-8") as file:
+            records.extend(json.loads(line) for line in file if line.strip())
+    records.sort(key=lambda record: record["received"])
+    return records
+
+
+async def async_replay(
+    snapshot: dict[str, Any], records: list[dict[str, Any]], speed: float | None
+) -> dict[str, Any]:
+    """Replay the event records and return the report."""
+    async with async_bench_hass() as hass:
+        brokers = []
+        entities = 0
+        for entry_data in snapshot["entries"]:
+            entry = add_entry(hass, entry_data["installed_app_id"])
+            devices = [device_from_snapshot(data) for data in entry_data["devices"]]
+            brokers.append(await async_add_broker(hass, entry, devices))
+            entities += sum((await async_setup_platforms(hass, entry)).values())
+
+        requests = [
+            record
+            for record in records
+            if record["payload"].get("lifecycle") == LIFECYCLE_EVENT
+        ]
+        handler_times: list[float] = []
+        end_to_end_times: list[float] = []
+        events = 0
+        with count_state_writes(hass) as writes:
+            started = time.perf_counter()
+            first_received = requests[0]["received"] if requests else 0.0
+            for record in requests:
+                if speed:
+                    due = (record["received"] - first_received) / speed
+                    if (delay := due - (time.perf_counter() - started)) > 0:
+                        await asyncio.sleep(delay)
+                request = EventRequest(record["payload"])
+                events += len(request.events)
+                start = time.perf_counter()
+                for broker in brokers:
+                    # pylint: disable-next=protected-access
+                    await broker._event_handler(request, None, None)
+                handled = time.perf_counter()
+                # Let the entities of the updated devices write their state
+                await hass.async_block_till_done()
+                handler_times.append(handled - start)
+                end_to_end_times.append(time.perf_counter() - start)
+            elapsed = time.perf_counter() - started
+
+    def milliseconds(samples: list[float], percent: float) -> float | None:
+        value = percentile(samples, percent)
+        return None if value is None else round(value * 1000, 3)
+
+    return {
+        "devices": sum(len(broker.devices) for broker in brokers),
+        "entities": entities,
+        "requests": len(requests),
+        "events": events,
+        "speed": speed,
+        "elapsed": round(elapsed, 3),
+        "events_per_sec": round(events / elapsed, 1) if elapsed else None,
+        "handler_ms": {
+            "p50": milliseconds(handler_times, 50),
+            "p99": milliseconds(handler_times, 99),
+        },
+        "end_to_end_ms": {
+            "p50": milliseconds(end_to_end_times, 50),
+            "p99": milliseconds(end_to_end_times, 99),
+        },
+        "state_writes": writes.writes,
+        "state_changes": writes.changes,
+    }
+
+
+def add_arguments(parser: argparse.ArgumentParser) -> None:
+    """Add the options of the command line."""
+    parser.add_argument("snapshot", help="device snapshot written with the recording")
+    parser.add_argument("recordings", nargs="+", help="recorded webhook files")
+    pace = parser.add_mutually_exclusive_group()
+    pace.add_argument(
+        "--speed", type=float, default=1.0, help="multiple of the original pace"
+    )
+    pace.add_argument(
+        "--max", action="store_true", help="replay as fast as possible"
+    )
+
+
+def replay_cli(args: argparse.Namespace) -> Coroutine[Any, Any, dict[str, Any]]:
+    """Return the replay of the recordings given on the command line."""
+    with open(args.snapshot, encoding="utf-8") as file:
+        snapshot = json.load(file)
+    return async_replay(
+        snapshot, read_records(args.recordings), None if args.max else args.speed
+    )
+
+
+def main() -> None:
+    """Run the replay from the command line."""
+    run_cli(__doc__, add_arguments, replay_cli)
+
+
+if __name__ == "__main__":
+    main()
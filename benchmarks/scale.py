@@ -0,0 +1,219 @@
+"""Measure how the integration scales with the size of the device fleet.
+
+Each fleet is served by a local fake SmartThings cloud and set up through
+the config entry, then the same devices are set up again platform by
+platform while tracing memory allocations:
+
+    python -m benchmarks.scale --sizes 10 100 1000 5000 --output scale.json
+
+The account rate limit is lifted unless --rate-limit is given, so setup
+times reflect the integration rather than the request budget.
+"""
+
+from __future__ import annotations
+
+import argparse
+from contextlib import nullcontext
+import itertools
+import sys
+import time
+import tracemalloc
+from typing import Any
+
+from pysmartapp.event import EventRequest
+
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers import entity_registry as er
+
+from custom_components.notsosmartthings.const import DATA_BROKERS, DOMAIN, PLATFORMS
+from custom_components.notsosmartthings.device import DeviceEntity
+
+from .fake_cloud import FakeCloud
+from .fleet import FleetDevice, generate_events, generate_fleet
+from .harness import (
+    add_entry,
+    async_add_broker,
+    async_bench_hass,
+    async_cloud_entry,
+    async_setup_platform,
+    count_state_writes,
+    lift_rate_limit,
+    percentile,
+    run_cli,
+)
+
+LOCATION_ID = "6b4e6f6c-9c4a-4f53-9b43-5d5c1c2e0a71"
+SCENES = 5
+ASSIGN_ROUNDS = 5
+
+
+async def async_measure_setup(
+    hass: HomeAssistant, fleet: list[FleetDevice], events: int, batch: int
+) -> dict[str, Any]:
+    """Set up a config entry against the fake cloud and replay events."""
+    cloud = FakeCloud(LOCATION_ID)
+    cloud.add_devices(fleet)
+    for index in range(SCENES):
+        cloud.add_scene(f"Scene {index}")
+    async with async_cloud_entry(hass, cloud) as entry:
+        start = time.perf_counter()
+        if not await hass.config_entries.async_setup(entry.entry_id):
+            raise RuntimeError(f"Setup failed in state {entry.state}")
+        await hass.async_block_till_done()
+        setup = time.perf_counter() - start
+
+        broker = hass.data[DOMAIN][DATA_BROKERS][entry.entry_id]
+        devices = list(broker.devices.values())
+        assign = []
+        for _ in range(ASSIGN_ROUNDS):
+            start = time.perf_counter()
+            # pylint: disable-next=protected-access
+            broker._assign_capabilities(devices)
+            assign.append(time.perf_counter() - start)
+
+        entities: dict[str, int] = dict.fromkeys(map(str, PLATFORMS), 0)
+        for entity in er.async_entries_for_config_entry(
+            er.async_get(hass), entry.entry_id
+        ):
+            entities[entity.domain] += 1
+
+        return {
+            "setup_s": round(setup, 3),
+            "setup_stages_s": broker.setup_timings,
+            "api_requests": cloud.requests,
+            "assign_capabilities_ms": round(min(assign) * 1000, 3),
+            "entities": entities,
+            "events": await async_measure_events(
+                hass, broker, fleet, cloud, events, batch
+            ),
+        }
+
+
+async def async_measure_events(
+    hass: HomeAssistant,
+    broker: Any,
+    fleet: list[FleetDevice],
+    cloud: FakeCloud,
+    count: int,
+    batch: int,
+) -> dict[str, Any]:
+    """Handle generated events and return the throughput."""
+    generated = generate_events(fleet, count)
+    requests = []
+    while chunk := list(itertools.islice(generated, batch)):
+        requests.append(EventRequest(cloud.event_payload(chunk)))
+    latencies = []
+    with count_state_writes(hass) as writes:
+        started = time.perf_counter()
+        for request in requests:
+            start = time.perf_counter()
+            # pylint: disable-next=protected-access
+            await broker._event_handler(request, None, None)
+            await hass.async_block_till_done()
+            latencies.append(time.perf_counter() - start)
+        elapsed = time.perf_counter() - started
+    p99 = percentile(latencies, 99)
+    return {
+        "events": count,
+        "batch": batch,
+        "events_per_sec": round(count / elapsed, 1) if elapsed else None,
+        "request_p99_ms": None if p99 is None else round(p99 * 1000, 3),
+        "state_writes": writes.writes,
+    }
+
+
+async def async_measure_memory(
+    hass: HomeAssistant, fleet: list[FleetDevice]
+) -> dict[str, Any]:
+    """Set up the platforms one by one and return the memory they allocate."""
+    entry = add_entry(hass, "memory")
+    tracemalloc.start()
+    try:
+        before = tracemalloc.get_traced_memory()[0]
+        devices = []
+        for device in fleet:
+            entity = DeviceEntity(None, device.device)
+            entity.status.apply_data(device.status)
+            devices.append(entity)
+        device_bytes = tracemalloc.get_traced_memory()[0] - before
+
+        before = tracemalloc.get_traced_memory()[0]
+        await async_add_broker(hass, entry, devices)
+        broker_bytes = tracemalloc.get_traced_memory()[0] - before
+
+        platforms = {}
+        for platform in PLATFORMS:
+            before = tracemalloc.get_traced_memory()[0]
+            start = time.perf_counter()
+            entity_platform = await async_setup_platform(hass, entry, platform)
+            await hass.async_block_till_done()
+            elapsed = time.perf_counter() - start
+            allocated = tracemalloc.get_traced_memory()[0] - before
+            count = len(entity_platform.entities)
+            platforms[str(platform)] = {
+                "entities": count,
+                "setup_ms": round(elapsed * 1000, 3),
+                "bytes_per_entity": round(allocated / count) if count else None,
+            }
+    finally:
+        tracemalloc.stop()
+
+    entities = sum(platform["entities"] for platform in platforms.values())
+    entity_bytes = sum(
+        platform["bytes_per_entity"] * platform["entities"]
+        for platform in platforms.values()
+        if platform["entities"]
+    )
+    return {
+        "bytes_per_device": round(device_bytes / len(fleet)) if fleet else None,
+        "broker_bytes": broker_bytes,
+        "bytes_per_entity": round(entity_bytes / entities) if entities else None,
+        "platforms": platforms,
+    }
+
+
+async def async_run(
+    sizes: list[int], events: int, batch: int, rate_limit: bool
+) -> dict[str, Any]:
+    """Run the benchmark for each fleet size."""
+    results = {}
+    with nullcontext() if rate_limit else lift_rate_limit():
+        for size in sizes:
+            fleet = generate_fleet(size, LOCATION_ID)
+            async with async_bench_hass() as hass:
+                result = await async_measure_setup(hass, fleet, events, batch)
+            async with async_bench_hass() as hass:
+                # Timings are inflated by tracing, compare them between sizes
+                result["memory"] = await async_measure_memory(hass, fleet)
+            results[str(size)] = {"devices": size, **result}
+            print(f"{size} devices set up in {result['setup_s']}s", file=sys.stderr)
+    return {"rate_limit": rate_limit, "sizes": results}
+
+
+def add_arguments(parser: argparse.ArgumentParser) -> None:
+    """Add the options of the command line."""
+    parser.add_argument(
+        "--sizes", type=int, nargs="+", default=[10, 100, 1000, 5000]
+    )
+    parser.add_argument(
+        "--events", type=int, default=2000, help="events handled per fleet"
+    )
+    parser.add_argument(
+        "--batch", type=int, default=1, help="events delivered per webhook request"
+    )
+    parser.add_argument(
+        "--rate-limit", action="store_true", help="keep the account rate limit"
+    )
+
+
+def main() -> None:
+    """Run the benchmark from the command line."""
+    run_cli(
+        __doc__,
+        add_arguments,
+        lambda args: async_run(args.sizes, args.events, args.batch, args.rate_limit),
+    )
+
+
+if __name__ == "__main__":
+    main()
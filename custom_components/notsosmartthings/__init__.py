@@ -3,46 +3,70 @@
 from __future__ import annotations
 
 import asyncio
-from collections.abc import Iterable
+from collections import Counter
+from collections.abc import AsyncIterator, Callable, Iterable
 from http import HTTPStatus
 import importlib
 import logging
+import time
+from typing import Any
 
 from aiohttp.client_exceptions import ClientConnectionError, ClientResponseError
 from pysmartapp.event import EVENT_TYPE_DEVICE
-from pysmartthings import APIInvalidGrant, Attribute, Capability, SmartThings
+from pysmartthings import APIInvalidGrant, Attribute, Capability, SceneEntity
 
-from homeassistant.config_entries import SOURCE_IMPORT, ConfigEntry
-from homeassistant.const import CONF_ACCESS_TOKEN, CONF_CLIENT_ID, CONF_CLIENT_SECRET
-from homeassistant.core import HomeAssistant
+from homeassistant.config_entries import SOURCE_IMPORT, ConfigEntry, ConfigEntryState
+from homeassistant.const import CONF_ACCESS_TOKEN, Platform
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
 from homeassistant.exceptions import (
     ConfigEntryAuthFailed,
     ConfigEntryError,
     ConfigEntryNotReady,
 )
-from homeassistant.helpers import config_validation as cv
-from homeassistant.helpers.aiohttp_client import async_get_clientsession
-from homeassistant.helpers.dispatcher import async_dispatcher_send
+from homeassistant.helpers import config_validation as cv, device_registry as dr
+from homeassistant.helpers.debounce import Debouncer
+from homeassistant.helpers.dispatcher import (
+    async_dispatcher_connect,
+    async_dispatcher_send,
+)
 from homeassistant.helpers.event import async_track_time_interval
 from homeassistant.helpers.typing import ConfigType
 from homeassistant.loader import async_get_loaded_integration
 from homeassistant.setup import SetupPhases, async_pause_setup
 
+from .api import async_get_account, async_get_api, async_load_missing_status
 from .config_flow import SmartThingsFlowHandler  # noqa: F401
 from .const import (
     CONF_APP_ID,
     CONF_INSTALLED_APP_ID,
     CONF_LOCATION_ID,
-    CONF_REFRESH_TOKEN,
     DATA_BROKERS,
     DATA_MANAGER,
+    DATA_TOKEN_MANAGERS,
+    DEVICE_REFRESH_COOLDOWN,
+    DEVICE_REFRESH_INTERVAL,
     DOMAIN,
     EVENT_BUTTON,
+    EVENT_CAPABILITIES,
+    IGNORED_CAPABILITIES,
     PLATFORMS,
+    SIGNAL_SMARTTHINGS_DEVICES_ADDED,
+    SIGNAL_SMARTTHINGS_SCENES_ADDED,
     SIGNAL_SMARTTHINGS_UPDATE,
-    TOKEN_REFRESH_INTERVAL,
 )
+from .device import DeviceEntity
+from .energy import EnergyHistory
+from .metrics import (
+    COUNT_BUCKETS,
+    METRIC_DISPATCH_FAN_OUT,
+    METRIC_EVENT_HANDLER,
+    async_get_metrics,
+)
+from .optimistic import OptimisticTracker
+from .scene_catalog import SceneCatalog
+from .services import async_setup_services
 from .smartapp import (
+    async_forget_app,
     format_unique_id,
     setup_smartapp,
     setup_smartapp_endpoint,
@@ -51,6 +75,8 @@ from .smartapp import (
     validate_installed_app,
     validate_webhook_requirements,
 )
+from .throttle import ThrottlePolicy
+from .tokens import TokenManager, async_get_token_manager
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -60,6 +86,7 @@ CONFIG_SCHEMA = cv.config_entry_only_config_schema(DOMAIN)
 async def async_setup(hass: HomeAssistant, config: ConfigType) -> bool:
     """Initialize the SmartThings platform."""
     await setup_smartapp_endpoint(hass, False)
+    async_setup_services(hass)
     return True
 
 
@@ -102,7 +129,9 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
         )
         return False
 
-    api = SmartThings(async_get_clientsession(hass), entry.data[CONF_ACCESS_TOKEN])
+    # Entries of the same account share the client and their lookups
+    account = async_get_account(hass, entry.data[CONF_ACCESS_TOKEN])
+    api = account.api
 
     # Ensure platform modules are loaded since the DeviceBroker will
     # import them below and we want them to be cached ahead of time
@@ -110,6 +139,16 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     # to import the modules.
     await async_get_loaded_integration(hass, DOMAIN).async_get_platforms(PLATFORMS)
 
+    # Duration of each setup stage in seconds, reported by diagnostics
+    timings: dict[str, float] = {}
+    setup_started = stage_started = time.monotonic()
+
+    def record_stage(stage: str) -> None:
+        nonlocal stage_started
+        now = time.monotonic()
+        timings[stage] = round(now - stage_started, 3)
+        stage_started = now
+
     #remove_entry = False
     try:
         # See if the app is already setup. This occurs when there are
@@ -118,55 +157,27 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
         smart_app = manager.smartapps.get(entry.data[CONF_APP_ID])
         if not smart_app:
             # Validate and setup the app.
-            app = await api.app(entry.data[CONF_APP_ID])
+            app = await account.async_get_app(entry.data[CONF_APP_ID])
             smart_app = setup_smartapp(hass, app)
+        record_stage("app")
 
         # Validate and retrieve the installed app.
         installed_app = await validate_installed_app(
             api, entry.data[CONF_INSTALLED_APP_ID]
         )
+        record_stage("installed_app")
 
-        # Get scenes
-        scenes = await async_get_entry_scenes(entry, api)
+        # Get scenes, from the cache when there is one. Cached scenes are
+        # refreshed in the background once the platforms are set up.
+        scenes = SceneCatalog(hass, entry, api)
+        if not (cached_scenes := await scenes.async_load()):
+            await scenes.async_refresh()
+        record_stage("scenes")
 
         # Get SmartApp token to sync subscriptions
-        token = await api.generate_tokens(
-            entry.data[CONF_CLIENT_ID],
-            entry.data[CONF_CLIENT_SECRET],
-            entry.data[CONF_REFRESH_TOKEN],
-        )
-        hass.config_entries.async_update_entry(
-            entry, data={**entry.data, CONF_REFRESH_TOKEN: token.refresh_token}
-        )
-
-        # Get devices and their current status
-        devices = await api.devices(location_ids=[installed_app.location_id])
-
-        async def retrieve_device_status(device):
-            try:
-                await device.status.refresh()
-            except ClientResponseError:
-                _LOGGER.debug(
-                    (
-                        "Unable to update status for device: %s (%s), the device will"
-                        " be excluded"
-                    ),
-                    device.label,
-                    device.device_id,
-                    exc_info=True,
-                )
-                devices.remove(device)
-
-        await asyncio.gather(*(retrieve_device_status(d) for d in devices.copy()))
-
-        # Sync device subscriptions
-        await smartapp_sync_subscriptions(
-            hass,
-            token.access_token,
-            installed_app.location_id,
-            installed_app.installed_app_id,
-            devices,
-        )
+        tokens = async_get_token_manager(hass, entry)
+        access_token = await tokens.async_get_access_token()
+        record_stage("token")
 
         # Setup device broker
         with async_pause_setup(hass, SetupPhases.WAIT_IMPORT_PLATFORMS):
@@ -174,11 +185,38 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
             # modules when its created. In the future this should be
             # refactored to not do this.
             broker = await hass.async_add_import_executor_job(
-                DeviceBroker, hass, entry, token, smart_app, devices, scenes
+                DeviceBroker, hass, entry, tokens, smart_app, [], scenes.scenes
             )
-        broker.connect()
+        broker.setup_timings = timings
         hass.data[DOMAIN][DATA_BROKERS][entry.entry_id] = broker
-    
+        record_stage("broker")
+
+        try:
+            # Hand the devices to the platforms as the listing arrives, the
+            # platforms are set up once the first device needing them is in
+            await broker.async_load_devices(
+                account.async_iter_devices(installed_app.location_id),
+                setup_started,
+            )
+            record_stage("devices")
+
+            # Sync device subscriptions
+            broker.subscriptions = await smartapp_sync_subscriptions(
+                hass,
+                access_token,
+                installed_app.location_id,
+                installed_app.installed_app_id,
+                broker.devices.values(),
+                entry.data[CONF_ACCESS_TOKEN],
+            )
+            record_stage("subscriptions")
+        except Exception:
+            # Platforms set up so far are set up again when retrying
+            hass.data[DOMAIN][DATA_BROKERS].pop(entry.entry_id)
+            await hass.config_entries.async_unload_platforms(entry, broker.platforms)
+            raise
+        broker.connect()
+
     except APIInvalidGrant as ex:
         raise ConfigEntryAuthFailed from ex
 
@@ -193,40 +231,43 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
         _LOGGER.debug(ex, exc_info=True)
         raise ConfigEntryNotReady from ex
 
-    await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
+    if cached_scenes:
+        entry.async_create_background_task(
+            hass, scenes.async_update(), "smartthings scenes refresh"
+        )
+    entry.async_on_unload(scenes.async_start())
+    # Fill the gaps in the energy statistics left while not running
+    entry.async_on_unload(
+        EnergyHistory(hass, entry, api, broker.devices).async_start()
+    )
+    entry.async_on_unload(entry.add_update_listener(async_update_options))
     return True
 
 
-async def async_get_entry_scenes(entry: ConfigEntry, api):
-    """Get the scenes within an integration."""
-    try:
-        return await api.scenes(location_id=entry.data[CONF_LOCATION_ID])
-    except ClientResponseError as ex:
-        if ex.status == HTTPStatus.FORBIDDEN:
-            _LOGGER.exception(
-                (
-                    "Unable to load scenes for configuration entry '%s' because the"
-                    " access token does not have the required access"
-                ),
-                entry.title,
-            )
-        else:
-            raise
-    return []
+async def async_update_options(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Reload the entry when its throttle rules changed.
+
+    The entry is also updated when its tokens are refreshed, which must not
+    reload it.
+    """
+    broker = hass.data[DOMAIN][DATA_BROKERS].get(entry.entry_id)
+    if broker and ThrottlePolicy(entry.options).rules != broker.throttle.rules:
+        await hass.config_entries.async_reload(entry.entry_id)
 
 
 async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Unload a config entry."""
     broker = hass.data[DOMAIN][DATA_BROKERS].pop(entry.entry_id, None)
-    if broker:
-        broker.disconnect()
+    if not broker:
+        return True
+    broker.disconnect()
 
-    return await hass.config_entries.async_unload_platforms(entry, PLATFORMS)
+    return await hass.config_entries.async_unload_platforms(entry, broker.platforms)
 
 
 async def async_remove_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
     """Perform clean-up when entry is being removed."""
-    api = SmartThings(async_get_clientsession(hass), entry.data[CONF_ACCESS_TOKEN])
+    api = async_get_api(hass, entry.data[CONF_ACCESS_TOKEN])
 
     # Remove the installed_app, which if already removed raises a HTTPStatus.FORBIDDEN error.
     installed_app_id = entry.data[CONF_INSTALLED_APP_ID]
@@ -243,6 +284,11 @@ async def async_remove_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
             raise
     _LOGGER.debug("Removed installed app %s", installed_app_id)
 
+    # Remove the cached scenes, energy cursors and token of the entry
+    await SceneCatalog(hass, entry, api).async_remove()
+    await EnergyHistory(hass, entry, api, {}).async_remove()
+    hass.data[DOMAIN][DATA_TOKEN_MANAGERS].pop(entry.data[CONF_INSTALLED_APP_ID], None)
+
     # Remove the app if not referenced by other entries, which if already
     # removed raises a HTTPStatus.FORBIDDEN error.
     all_entries = hass.config_entries.async_entries(DOMAIN)
@@ -265,6 +311,7 @@ async def async_remove_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
             _LOGGER.debug("App %s has already been removed", app_id, exc_info=True)
         else:
             raise
+    await async_forget_app(hass, app_id)
     _LOGGER.debug("Removed app %s", app_id)
 
     if len(all_entries) == 1:
@@ -278,22 +325,38 @@ class DeviceBroker:
         self,
         hass: HomeAssistant,
         entry: ConfigEntry,
-        token,
+        tokens: TokenManager,
         smart_app,
         devices: Iterable,
-        scenes: Iterable,
+        scenes: dict[str, SceneEntity],
     ) -> None:
         """Create a new instance of the DeviceBroker."""
         self._hass = hass
         self._entry = entry
         self._installed_app_id = entry.data[CONF_INSTALLED_APP_ID]
         self._smart_app = smart_app
-        self._token = token
+        self.tokens = tokens
         self._event_disconnect = None
         self._regenerate_token_remove = None
+        self._refresh_devices_remove = None
+        self._refresh_devices_debouncer: Debouncer | None = None
+        self._scenes_added_disconnect = None
         self._assignments = self._assign_capabilities(devices)
         self.devices = {device.device_id: device for device in devices}
-        self.scenes = {scene.scene_id: scene for scene in scenes}
+        self._consumed = {
+            device.device_id: self._compile_consumed(device) for device in devices
+        }
+        self.scenes = scenes
+        self.optimistic = OptimisticTracker(hass, self.devices)
+        self.metrics = async_get_metrics(hass)
+        self.event_counts: Counter[str] = Counter()
+        self.dropped_events: Counter[str] = Counter()
+        self.throttle = ThrottlePolicy(entry.options)
+        self.setup_timings: dict[str, float] = {}
+        self.subscriptions: dict[str, Any] = {}
+        self.platforms: set[Platform] = set()
+        # Devices added after setup whose capabilities were not subscribed
+        self._unsynced: list[DeviceEntity] = []
 
     def _assign_capabilities(self, devices: Iterable):
         """Assign platforms to capabilities."""
@@ -319,42 +382,345 @@ class DeviceBroker:
             assignments[device.device_id] = slots
         return assignments
 
+    def _compile_consumed(self, device: DeviceEntity) -> frozenset[tuple[str, str]]:
+        """Return the (component, capability) keys of the events to apply.
+
+        These are the capabilities of enabled components assigned to a
+        platform or read by its entities, unless ignored or disabled. Keys
+        leave out the attribute as entities read any attribute of their
+        capabilities, such as supported values and ranges.
+        """
+        slots = self._assignments.get(device.device_id, {})
+        consumed = {*slots, *EVENT_CAPABILITIES}
+        for platform in set(slots.values()):
+            platform_module = importlib.import_module(f".{platform}", self.__module__)
+            consumed.update(getattr(platform_module, "READ_CAPABILITIES", ()))
+        consumed.difference_update(IGNORED_CAPABILITIES)
+
+        statuses = {"main": device.status, **device.status.components}
+        disabled_components = device.status.attributes["disabledComponents"].value
+        keys = set()
+        for component_id, capabilities in {
+            "main": device.capabilities,
+            **device.components,
+        }.items():
+            if component_id in (disabled_components or ()):
+                continue
+            disabled = (
+                status.attributes["disabledCapabilities"].value
+                if (status := statuses.get(component_id))
+                else None
+            ) or ()
+            keys.update(
+                (component_id, capability)
+                for capability in capabilities
+                if capability in consumed and capability not in disabled
+            )
+        return frozenset(keys)
+
     def connect(self):
         """Connect handlers/listeners for device/lifecycle events."""
 
-        # Setup interval to regenerate the refresh token on a periodic basis.
-        # Tokens expire in 30 days and once expired, cannot be recovered.
-        async def regenerate_refresh_token(now):
-            """Generate a new refresh token and update the config entry."""
-            await self._token.refresh(
-                self._entry.data[CONF_CLIENT_ID],
-                self._entry.data[CONF_CLIENT_SECRET],
-            )
-            self._hass.config_entries.async_update_entry(
-                self._entry,
-                data={
-                    **self._entry.data,
-                    CONF_REFRESH_TOKEN: self._token.refresh_token,
-                },
-            )
-            _LOGGER.debug(
-                "Regenerated refresh token for installed app: %s",
-                self._installed_app_id,
-            )
+        # Refresh the token ahead of expiry. Refresh tokens expire in 30 days
+        # and once expired, cannot be recovered.
+        self._regenerate_token_remove = self.tokens.async_start()
 
-        self._regenerate_token_remove = async_track_time_interval(
-            self._hass, regenerate_refresh_token, TOKEN_REFRESH_INTERVAL
+        # Pick up devices added or removed in SmartThings without a reload
+        self._refresh_devices_remove = async_track_time_interval(
+            self._hass, self._async_refresh_devices_interval, DEVICE_REFRESH_INTERVAL
+        )
+        self._refresh_devices_debouncer = Debouncer(
+            self._hass,
+            _LOGGER,
+            cooldown=DEVICE_REFRESH_COOLDOWN,
+            immediate=True,
+            function=self.async_refresh_devices,
         )
 
         # Connect handler to incoming device events
         self._event_disconnect = self._smart_app.connect_event(self._event_handler)
 
+        # Reconcile status set optimistically by commands with push events
+        self.optimistic.async_start()
+
+        # Set up the scene platform once the first scene is added
+        self._scenes_added_disconnect = async_dispatcher_connect(
+            self._hass,
+            SIGNAL_SMARTTHINGS_SCENES_ADDED.format(self._entry.entry_id),
+            self._async_scenes_added,
+        )
+
     def disconnect(self):
         """Disconnects handlers/listeners for device/lifecycle events."""
         if self._regenerate_token_remove:
             self._regenerate_token_remove()
+        if self._refresh_devices_remove:
+            self._refresh_devices_remove()
+        if self._refresh_devices_debouncer:
+            self._refresh_devices_debouncer.async_shutdown()
         if self._event_disconnect:
             self._event_disconnect()
+        if self._scenes_added_disconnect:
+            self._scenes_added_disconnect()
+        self.optimistic.async_stop()
+
+    @property
+    def installed_app_id(self) -> str:
+        """Get the installed app whose events are handled."""
+        return self._installed_app_id
+
+    @callback
+    def async_listen_devices_added(
+        self, target: Callable[[list[DeviceEntity]], None]
+    ) -> CALLBACK_TYPE:
+        """Call the target with the devices added after setup."""
+        return async_dispatcher_connect(
+            self._hass,
+            SIGNAL_SMARTTHINGS_DEVICES_ADDED.format(self._entry.entry_id),
+            target,
+        )
+
+    def required_platforms(self) -> set[Platform]:
+        """Return the platforms with entities for the devices and scenes."""
+        platforms = {
+            platform
+            for slots in self._assignments.values()
+            for platform in slots.values()
+        }
+        # Sensors also hold the diagnostic entities of the entry
+        platforms.add(Platform.SENSOR)
+        if self.scenes:
+            platforms.add(Platform.SCENE)
+        return platforms
+
+    async def async_setup_platforms(self, platforms: set[Platform]) -> None:
+        """Set up the platforms that were not set up yet.
+
+        Platforms set up this way add all devices and scenes on their own,
+        so they are set up after the other platforms were signalled.
+        """
+        if not self._new_platforms(platforms):
+            return
+        # Wait for the setup of the entry, it holds the lock until done
+        async with self._entry.setup_lock:
+            if self._entry.state is not ConfigEntryState.LOADED:
+                return
+            await self._async_forward_platforms(platforms)
+
+    def _new_platforms(self, platforms: set[Platform]) -> list[Platform]:
+        return [
+            platform
+            for platform in PLATFORMS
+            if platform in platforms and platform not in self.platforms
+        ]
+
+    async def _async_forward_platforms(self, platforms: set[Platform]) -> None:
+        """Forward the entry to the platforms not set up yet."""
+        if not (new := self._new_platforms(platforms)):
+            return
+        self.platforms.update(new)
+        _LOGGER.debug("Setting up platforms %s", new)
+        try:
+            await self._hass.config_entries.async_forward_entry_setups(
+                self._entry, new
+            )
+        except Exception:
+            # Set up again by the next caller
+            self.platforms.difference_update(new)
+            raise
+
+    async def async_load_devices(
+        self, pages: AsyncIterator[list[DeviceEntity]], started: float
+    ) -> None:
+        """Add the devices of the entry while it is set up, page by page.
+
+        Devices listed with their status are handed to the platforms right
+        away, the others once their own status was retrieved. Devices whose
+        status could not be retrieved are excluded. The time from the start
+        of the setup to the first and last devices being added is recorded.
+        """
+
+        async def async_add(devices: list[DeviceEntity]) -> None:
+            self.async_register_devices(devices)
+            await self._async_forward_platforms(self.required_platforms())
+            elapsed = round(time.monotonic() - started, 3)
+            self.setup_timings.setdefault("first_entity", elapsed)
+            self.setup_timings["last_entity"] = elapsed
+
+        async def async_add_refreshed(device: DeviceEntity) -> None:
+            if not await async_load_missing_status([device]):
+                await async_add([device])
+
+        refreshes: list[asyncio.Task] = []
+        try:
+            async for devices in pages:
+                for device in devices:
+                    if not device.status_loaded:
+                        refreshes.append(
+                            self._hass.async_create_task(
+                                async_add_refreshed(device),
+                                f"smartthings device status {device.device_id}",
+                                eager_start=False,
+                            )
+                        )
+                if loaded := [device for device in devices if device.status_loaded]:
+                    await async_add(loaded)
+        finally:
+            await asyncio.gather(*refreshes, return_exceptions=True)
+        for task in refreshes:
+            task.result()
+        # Sensors and scenes are set up even without devices
+        await self._async_forward_platforms(self.required_platforms())
+
+    @callback
+    def _async_scenes_added(self, scenes: list[SceneEntity]) -> None:
+        if Platform.SCENE not in self.platforms:
+            self._entry.async_create_task(
+                self._hass, self.async_setup_platforms({Platform.SCENE})
+            )
+
+    async def _async_refresh_devices_interval(self, now) -> None:
+        await self._refresh_devices_debouncer.async_call()
+
+    async def async_refresh_devices(self) -> None:
+        """Add the devices created and remove those deleted since setup.
+
+        The devices are listed with their status, only the status of added
+        devices the listing did not include it for is fetched.
+        """
+        account = async_get_account(self._hass, self._entry.data[CONF_ACCESS_TOKEN])
+        try:
+            devices = await account.async_get_devices(
+                self._entry.data[CONF_LOCATION_ID]
+            )
+        except (ClientResponseError, ClientConnectionError) as ex:
+            _LOGGER.debug("Unable to refresh the device list: %s", ex)
+            return
+        current = {device.device_id for device in devices}
+        if removed := [
+            device
+            for device_id, device in self.devices.items()
+            if device_id not in current
+        ]:
+            self.async_remove_devices(removed)
+        if added := [
+            device for device in devices if device.device_id not in self.devices
+        ]:
+            await self.async_add_devices(added)
+        else:
+            # Retry what failed for devices added before
+            await self._async_sync_added()
+
+    async def async_add_devices(self, devices: list[DeviceEntity]) -> None:
+        """Add devices and the entities of their capabilities."""
+        # Devices whose status could not be retrieved are added later
+        for device in await async_load_missing_status(devices):
+            devices.remove(device)
+        if not devices:
+            return
+        self.async_register_devices(devices)
+        for device in devices:
+            _LOGGER.info("Added device %s (%s)", device.label, device.device_id)
+        self._unsynced.extend(devices)
+        await self._async_sync_added()
+
+    async def _async_sync_added(self) -> None:
+        """Subscribe to the capabilities of added devices and set up platforms.
+
+        Both are retried on the next refresh of the devices when they fail.
+        """
+        try:
+            # Subscribe to capabilities no other device had
+            subscribed = set(self.subscriptions.get("capabilities", []))
+            if any(
+                capability not in subscribed
+                for device in self._unsynced
+                for capability in device.capabilities
+            ):
+                self.subscriptions = await smartapp_sync_subscriptions(
+                    self._hass,
+                    await self.tokens.async_get_access_token(),
+                    self._entry.data[CONF_LOCATION_ID],
+                    self._installed_app_id,
+                    self.devices.values(),
+                    self._entry.data[CONF_ACCESS_TOKEN],
+                )
+            self._unsynced.clear()
+
+            await self.async_setup_platforms(self.required_platforms())
+        except Exception as ex:  # noqa: BLE001
+            _LOGGER.warning(
+                "Unable to subscribe to or set up the devices added, retrying on"
+                " the next refresh: %s",
+                ex,
+            )
+
+    @callback
+    def async_register_devices(self, devices: list[DeviceEntity]) -> None:
+        """Assign the capabilities of devices and signal the platforms."""
+        self._assignments.update(self._assign_capabilities(devices))
+        for device in devices:
+            self.devices[device.device_id] = device
+            self._consumed[device.device_id] = self._compile_consumed(device)
+            self.optimistic.async_add_device(device)
+        async_dispatcher_send(
+            self._hass,
+            SIGNAL_SMARTTHINGS_DEVICES_ADDED.format(self._entry.entry_id),
+            devices,
+        )
+
+    @callback
+    def async_remove_devices(self, devices: list[DeviceEntity]) -> None:
+        """Remove devices, their entities are removed with the device entry."""
+        device_registry = dr.async_get(self._hass)
+        for device in devices:
+            del self.devices[device.device_id]
+            self._assignments.pop(device.device_id, None)
+            self._consumed.pop(device.device_id, None)
+            self.optimistic.async_remove_device(device)
+            if device_entry := device_registry.async_get_device(
+                identifiers={(DOMAIN, device.device_id)}
+            ):
+                device_registry.async_update_device(
+                    device_entry.id, remove_config_entry_id=self._entry.entry_id
+                )
+            _LOGGER.info("Removed device %s (%s)", device.label, device.device_id)
+
+    @callback
+    def _async_recompile_consumed(self, device: DeviceEntity) -> None:
+        """Compile the keys of a device again after its disabled parts changed.
+
+        The events of keys added were dropped, so the status of the device
+        is refreshed when there are any.
+        """
+        consumed = self._compile_consumed(device)
+        if consumed - self._consumed.get(device.device_id, frozenset()):
+            self._entry.async_create_background_task(
+                self._hass,
+                self._async_refresh_status(device),
+                f"smartthings refresh status {device.device_id}",
+            )
+        self._consumed[device.device_id] = consumed
+
+    async def _async_refresh_status(self, device: DeviceEntity) -> None:
+        """Refresh the status of a device and update its entities."""
+        try:
+            await device.refresh_status()
+        except (ClientResponseError, ClientConnectionError) as ex:
+            _LOGGER.debug(
+                "Unable to update status for device: %s (%s): %s",
+                device.label,
+                device.device_id,
+                ex,
+            )
+            return
+        async_dispatcher_send(
+            self._hass, SIGNAL_SMARTTHINGS_UPDATE, {device.device_id}
+        )
+
+    def get_assignments(self, device_id: str) -> dict[str, str]:
+        """Get the platform assigned to each capability of the device."""
+        return self._assignments.get(device_id, {})
 
     def get_assigned(self, device_id: str, platform: str):
         """Get the capabilities assigned to the platform."""
@@ -373,11 +739,25 @@ class DeviceBroker:
         if req.installed_app_id != self._installed_app_id:
             return
 
+        start = time.perf_counter()
         updated_devices = set()
+        self.event_counts["received"] += len(req.events)
         for evt in req.events:
             if evt.event_type != EVENT_TYPE_DEVICE:
+                self.event_counts["ignored_type"] += 1
                 continue
             if not (device := self.devices.get(evt.device_id)):
+                self.event_counts["unknown_device"] += 1
+                # Most likely added since the device list was fetched
+                if self._refresh_devices_debouncer:
+                    self._refresh_devices_debouncer.async_schedule_call()
+                continue
+            if (evt.component_id, evt.capability) not in self._consumed[
+                evt.device_id
+            ]:
+                # Read by no entity, counted to show noisy unused capabilities
+                self.event_counts["dropped"] += 1
+                self.dropped_events[evt.capability] += 1
                 continue
             device.status.apply_attribute_update(
                 evt.component_id,
@@ -386,6 +766,15 @@ class DeviceBroker:
                 evt.value,
                 data=evt.data,
             )
+            if (
+                evt.capability in EVENT_CAPABILITIES
+                and evt.capability != Capability.button
+            ):
+                # The disabled capabilities or components changed
+                self._async_recompile_consumed(device)
+            self.optimistic.async_confirm(
+                evt.device_id, evt.component_id, evt.attribute, evt.value
+            )
 
             # Fire events for buttons
             if (
@@ -401,6 +790,7 @@ class DeviceBroker:
                     "data": evt.data,
                 }
                 self._hass.bus.async_fire(EVENT_BUTTON, data)
+                self.event_counts["button"] += 1
                 _LOGGER.debug("Fired button event: %s", data)
             else:
                 data = {
@@ -414,6 +804,16 @@ class DeviceBroker:
                 }
                 _LOGGER.debug("Push update received: %s", data)
 
+            self.event_counts["applied"] += 1
             updated_devices.add(device.device_id)
 
         async_dispatcher_send(self._hass, SIGNAL_SMARTTHINGS_UPDATE, updated_devices)
+
+        if self.metrics.enabled:
+            entry_id = self._entry.entry_id
+            self.metrics.observe(
+                METRIC_EVENT_HANDLER, time.perf_counter() - start, entry_id
+            )
+            self.metrics.observe(
+                METRIC_DISPATCH_FAN_OUT, len(updated_devices), entry_id, COUNT_BUCKETS
+            )
@@ -0,0 +1,535 @@
+"""SmartThings API client shared by the integration."""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import AsyncIterator, Sequence
+from functools import partial
+from http import HTTPStatus
+import logging
+import time
+from typing import Any
+
+from aiohttp import (
+    ClientConnectionError,
+    ClientResponseError,
+    ClientSession,
+    ServerTimeoutError,
+)
+from pysmartthings import AppEntity, SceneEntity, SmartThings
+from pysmartthings.api import API_DEVICES, Api
+
+from homeassistant.const import CONF_ACCESS_TOKEN
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.aiohttp_client import async_get_clientsession
+
+from .const import (
+    API_HEDGE_DELAY,
+    API_MAX_RETRIES,
+    API_REQUEST_TIMEOUT,
+    CONF_LOCATION_ID,
+    DATA_ACCOUNTS,
+    DEVICE_FETCH_MAX_AGE,
+    DOMAIN,
+    RATE_LIMIT_CAPACITY,
+    RATE_LIMIT_REFILL_RATE,
+)
+from .device import DeviceEntity
+from .metrics import (
+    COUNT_BUCKETS,
+    METRIC_API_LATENCY,
+    METRIC_API_QUEUE_DEPTH,
+    METRIC_API_RATE_LIMIT_WAIT,
+    METRIC_API_RATE_LIMITED,
+    Metrics,
+    async_get_metrics,
+)
+from .ratelimit import RateLimiter, RequestPriority, parse_retry_after
+from .resilience import (
+    CircuitBreakers,
+    CircuitState,
+    async_hedged,
+    backoff_delay,
+    endpoint_name,
+    is_retryable,
+    is_transient,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+API_DEVICE_HISTORY = "history/devices"
+
+
+def request_priority(method: str, url: str) -> RequestPriority:
+    """Return the priority class of an API request."""
+    if method == "post" and url.endswith(("/commands", "/execute")):
+        return RequestPriority.COMMAND
+    return RequestPriority.REFRESH
+
+
+class SmartThingsApi(Api):
+    """Api sending requests through the shared rate limiter and breakers.
+
+    Idempotent reads are retried with jittered exponential backoff and
+    hedged when slow. Other requests are only retried when they were
+    rejected by rate limiting, as they may otherwise have been applied.
+    """
+
+    __slots__ = ["_limiter", "_breakers", "_metrics"]
+
+    def __init__(
+        self,
+        session: ClientSession,
+        token: str,
+        limiter: RateLimiter,
+        breakers: CircuitBreakers,
+        metrics: Metrics,
+    ) -> None:
+        """Create a new API."""
+        super().__init__(session, token)
+        self._limiter = limiter
+        self._breakers = breakers
+        self._metrics = metrics
+
+    @property
+    def limiter(self) -> RateLimiter:
+        """Get the rate limiter requests are drawn from."""
+        return self._limiter
+
+    @property
+    def breakers(self) -> CircuitBreakers:
+        """Get the circuit breakers guarding the endpoints."""
+        return self._breakers
+
+    async def request(
+        self, method: str, url: str, params: dict = None, data: dict = None
+    ):
+        """Perform a request against the specified parameters."""
+        breaker = self._breakers.get(
+            endpoint_name(method, url.removeprefix(self._api_base))
+        )
+        idempotent = method == "get"
+        send = partial(self._async_send, breaker.endpoint, method, url, params, data)
+        attempt = 0
+        while True:
+            breaker.before_request()
+            try:
+                if idempotent:
+                    result = await async_hedged(
+                        send,
+                        API_HEDGE_DELAY,
+                        lambda: breaker.state is CircuitState.CLOSED
+                        and self._limiter.budget >= 1,
+                    )
+                else:
+                    result = await send()
+            except asyncio.CancelledError:
+                breaker.record_cancelled()
+                raise
+            except Exception as ex:
+                if is_transient(ex):
+                    breaker.record_failure()
+                else:
+                    breaker.record_neutral()
+                if attempt >= API_MAX_RETRIES or not is_retryable(ex, idempotent):
+                    raise
+                delay = backoff_delay(attempt)
+                attempt += 1
+                _LOGGER.debug(
+                    "Retrying '%s' in %.2fs (attempt %s) after error: %s",
+                    breaker.endpoint,
+                    delay,
+                    attempt,
+                    ex,
+                )
+                await asyncio.sleep(delay)
+                continue
+            breaker.record_success()
+            return result
+
+    async def _async_send(self, endpoint: str, method: str, url: str, params, data):
+        """Send a single request once the rate limiter grants a slot."""
+        priority = request_priority(method, url)
+        metrics = self._metrics if self._metrics.enabled else None
+        if metrics:
+            metrics.observe(
+                METRIC_API_QUEUE_DEPTH, self._limiter.queued, bounds=COUNT_BUCKETS
+            )
+        waited = await self._limiter.acquire(priority)
+        if metrics:
+            metrics.observe(METRIC_API_RATE_LIMIT_WAIT, waited, priority.name.lower())
+        start = time.perf_counter()
+        try:
+            async with asyncio.timeout(API_REQUEST_TIMEOUT):
+                return await super().request(method, url, params, data)
+        except ServerTimeoutError:
+            raise
+        except TimeoutError as ex:
+            # Raised as aiohttp does, callers handle connection errors
+            raise ServerTimeoutError(
+                f"Timeout on '{endpoint}' after {API_REQUEST_TIMEOUT}s"
+            ) from ex
+        except ClientResponseError as ex:
+            if ex.status == HTTPStatus.TOO_MANY_REQUESTS:
+                self._limiter.async_pause(parse_retry_after(ex.headers))
+                if metrics:
+                    metrics.increment(METRIC_API_RATE_LIMITED, endpoint)
+            raise
+        finally:
+            # Always recorded, diagnostics report the latencies
+            self._metrics.observe(
+                METRIC_API_LATENCY, time.perf_counter() - start, endpoint
+            )
+
+    async def iter_items(
+        self, resource: str, params: Sequence | None = None
+    ) -> AsyncIterator[list[dict]]:
+        """Yield the items of a listing page by page as the pages arrive.
+
+        The params are only sent with the first request, the next links
+        carry them along with the paging cursor.
+        """
+        resp = await self.get(resource, params=params)
+        while True:
+            yield resp.get("items", [])
+            if not (next_link := self._get_next_link(resp)):
+                return
+            resp = await self.request("get", next_link, None, None)
+
+    async def generate_tokens(
+        self, client_id: str, client_secret: str, refresh_token: str
+    ):
+        """Obtain a new access and refresh token ahead of other requests."""
+        await self._limiter.acquire(RequestPriority.AUTH)
+        return await super().generate_tokens(client_id, client_secret, refresh_token)
+
+
+class SmartThingsClient(SmartThings):
+    """SmartThings client whose requests go through the shared API policies."""
+
+    __slots__ = []
+
+    def __init__(
+        self,
+        session: ClientSession,
+        token: str,
+        limiter: RateLimiter,
+        breakers: CircuitBreakers,
+        metrics: Metrics,
+    ) -> None:
+        """Initialize the client."""
+        # Entities created by the client (devices, scenes, tokens) keep a
+        # reference to this service, so their requests are guarded as well.
+        self._service = SmartThingsApi(session, token, limiter, breakers, metrics)
+
+    @property
+    def limiter(self) -> RateLimiter:
+        """Get the rate limiter requests are drawn from."""
+        return self._service.limiter
+
+    @property
+    def breakers(self) -> CircuitBreakers:
+        """Get the circuit breakers guarding the endpoints."""
+        return self._service.breakers
+
+    async def devices(
+        self,
+        *,
+        location_ids: Sequence[str] | None = None,
+        capabilities: Sequence[str] | None = None,
+        device_ids: Sequence[str] | None = None,
+        include_status: bool = False,
+    ) -> list[DeviceEntity]:
+        """Retrieve SmartThings devices."""
+        return [
+            device
+            async for devices in self.iter_devices(
+                location_ids=location_ids,
+                capabilities=capabilities,
+                device_ids=device_ids,
+                include_status=include_status,
+            )
+            for device in devices
+        ]
+
+    async def iter_devices(
+        self,
+        *,
+        location_ids: Sequence[str] | None = None,
+        capabilities: Sequence[str] | None = None,
+        device_ids: Sequence[str] | None = None,
+        include_status: bool = False,
+    ) -> AsyncIterator[list[DeviceEntity]]:
+        """Yield the SmartThings devices of each page of the listing.
+
+        With include_status the status is requested with the listing and
+        applied to the devices it was returned for, the status of other
+        devices must be refreshed.
+        """
+        params = []
+        if location_ids:
+            params.extend([("locationId", lid) for lid in location_ids])
+        if capabilities:
+            params.extend([("capability", cap) for cap in capabilities])
+        if device_ids:
+            params.extend([("deviceId", did) for did in device_ids])
+        if include_status:
+            params.append(("includeStatus", "true"))
+        async for items in self._service.iter_items(API_DEVICES, params):
+            devices = []
+            for data in items:
+                device = DeviceEntity(self._service, data)
+                if include_status:
+                    device.apply_inline_status(data)
+                devices.append(device)
+            yield devices
+
+    async def iter_device_history(
+        self,
+        location_id: str,
+        device_id: str,
+        *,
+        after: tuple[int, str] | None = None,
+    ) -> AsyncIterator[list[dict]]:
+        """Yield the events of a device oldest first, page by page.
+
+        With after, only the events following the event of that epoch and
+        hash are yielded.
+        """
+        params = [
+            ("locationId", location_id),
+            ("deviceId", device_id),
+            ("oldestFirst", "true"),
+        ]
+        if after:
+            params.extend(
+                [("pagingAfterEpoch", str(after[0])), ("pagingAfterHash", after[1])]
+            )
+        async for items in self._service.iter_items(API_DEVICE_HISTORY, params):
+            yield items
+
+    async def device(self, device_id: str) -> DeviceEntity:
+        """Retrieve a device with the specified ID."""
+        entity = await self._service.get_device(device_id)
+        return DeviceEntity(self._service, entity)
+
+    def scene_entity(self, data: dict[str, Any]) -> SceneEntity:
+        """Create a scene from previously retrieved data."""
+        return SceneEntity(self._service, data)
+
+
+class DeviceListing:
+    """Devices of the locations of an account as the listing pages arrive."""
+
+    def __init__(self, locations: set[str]) -> None:
+        """Create an empty listing of the locations."""
+        self.devices: dict[str, list[DeviceEntity]] = {
+            location: [] for location in locations
+        }
+        self.claimed: set[str] = set()
+        self.done = False
+        self.error: BaseException | None = None
+        self.fetched = 0.0
+        self._updated = asyncio.Event()
+
+    @callback
+    def async_add(self, devices: list[DeviceEntity]) -> None:
+        """Add the devices of a page and wake up the readers."""
+        for device in devices:
+            if device.location_id in self.devices:
+                self.devices[device.location_id].append(device)
+        self._async_notify()
+
+    @callback
+    def async_finish(self, error: BaseException | None = None) -> None:
+        """Mark the listing complete, or failed with the error."""
+        self.done = True
+        self.error = error
+        self.fetched = time.monotonic()
+        self._async_notify()
+
+    @callback
+    def _async_notify(self) -> None:
+        self._updated.set()
+        self._updated = asyncio.Event()
+
+    async def async_iter(self, location_id: str) -> AsyncIterator[list[DeviceEntity]]:
+        """Yield the devices of a location listed since the previous page."""
+        devices = self.devices[location_id]
+        index = 0
+        while True:
+            if index < len(devices):
+                page = devices[index:]
+                index = len(devices)
+                yield page
+                continue
+            if self.done:
+                if self.error is not None:
+                    raise self.error
+                return
+            await self._updated.wait()
+
+
+class AccountContext:
+    """API state shared by the config entries of a personal access token.
+
+    Entries in several locations of one account draw from the same client,
+    rate limiter and circuit breakers. Lookups they would otherwise repeat
+    concurrently during setup are made once: apps are cached, and devices
+    are fetched with their status for every location of the account in a
+    single listing.
+    """
+
+    def __init__(self, hass: HomeAssistant, access_token: str) -> None:
+        """Create the context of the access token."""
+        self._hass = hass
+        self.access_token = access_token
+        self.limiter = RateLimiter(RATE_LIMIT_CAPACITY, RATE_LIMIT_REFILL_RATE)
+        self.breakers = CircuitBreakers()
+        self.metrics = async_get_metrics(hass)
+        self.api = SmartThingsClient(
+            async_get_clientsession(hass),
+            access_token,
+            self.limiter,
+            self.breakers,
+            self.metrics,
+        )
+        self._apps: dict[str, asyncio.Task[AppEntity]] = {}
+        self._devices: DeviceListing | None = None
+
+    async def async_get_app(self, app_id: str) -> AppEntity:
+        """Return an app, fetched once for all entries of the account."""
+        if (task := self._apps.get(app_id)) is None or (
+            task.done() and (task.cancelled() or task.exception())
+        ):
+            task = self._apps[app_id] = self._hass.async_create_task(
+                self.api.app(app_id), f"smartthings app {app_id}", eager_start=False
+            )
+        return await asyncio.shield(task)
+
+    async def async_get_devices(self, location_id: str) -> list[DeviceEntity]:
+        """Return the devices of a location."""
+        return [
+            device
+            async for devices in self.async_iter_devices(location_id)
+            for device in devices
+        ]
+
+    async def async_iter_devices(
+        self, location_id: str
+    ) -> AsyncIterator[list[DeviceEntity]]:
+        """Yield the devices of a location as the pages of the listing arrive.
+
+        The first caller lists the devices of every location with an entry
+        of the account, the others take their share of that listing. Each
+        share is handed out once so later calls fetch current devices.
+        """
+        listing = self._devices
+        if (
+            listing is None
+            or location_id not in listing.devices
+            or location_id in listing.claimed
+            or listing.error is not None
+            or (
+                listing.done
+                and time.monotonic() - listing.fetched > DEVICE_FETCH_MAX_AGE
+            )
+        ):
+            listing = self._devices = DeviceListing(
+                {location_id} | self._account_locations()
+            )
+            self._hass.async_create_task(
+                self._async_fetch_devices(listing),
+                "smartthings devices",
+                eager_start=False,
+            )
+        listing.claimed.add(location_id)
+        async for devices in listing.async_iter(location_id):
+            yield devices
+
+    def _account_locations(self) -> set[str]:
+        return {
+            entry.data[CONF_LOCATION_ID]
+            for entry in self._hass.config_entries.async_entries(DOMAIN)
+            if entry.data.get(CONF_ACCESS_TOKEN) == self.access_token
+            and entry.disabled_by is None
+            and CONF_LOCATION_ID in entry.data
+        }
+
+    async def _async_fetch_devices(self, listing: DeviceListing) -> None:
+        try:
+            async for devices in self.api.iter_devices(
+                location_ids=sorted(listing.devices), include_status=True
+            ):
+                listing.async_add(devices)
+        except asyncio.CancelledError:
+            listing.async_finish(
+                ClientConnectionError("The device listing was cancelled")
+            )
+            raise
+        except Exception as ex:  # noqa: BLE001
+            # Raised to the readers of the listing
+            listing.async_finish(ex)
+        else:
+            listing.async_finish()
+
+
+async def async_load_missing_status(
+    devices: list[DeviceEntity],
+) -> list[DeviceEntity]:
+    """Refresh the status of the devices listed without it.
+
+    Return the devices whose status could not be retrieved.
+    """
+    missing = [device for device in devices if not device.status_loaded]
+    if missing:
+        _LOGGER.debug(
+            "Refreshing the status of %s of %s devices", len(missing), len(devices)
+        )
+    failed = []
+
+    async def refresh(device: DeviceEntity) -> None:
+        try:
+            await device.refresh_status()
+        except (ClientResponseError, ClientConnectionError):
+            _LOGGER.debug(
+                "Unable to update status for device: %s (%s)",
+                device.label,
+                device.device_id,
+                exc_info=True,
+            )
+            failed.append(device)
+
+    await asyncio.gather(*(refresh(device) for device in missing))
+    return failed
+
+
+@callback
+def async_get_account(hass: HomeAssistant, access_token: str) -> AccountContext:
+    """Return the context shared by all callers of the personal access token."""
+    accounts: dict[str, AccountContext] = hass.data[DOMAIN][DATA_ACCOUNTS]
+    if (account := accounts.get(access_token)) is None:
+        account = accounts[access_token] = AccountContext(hass, access_token)
+    return account
+
+
+@callback
+def async_get_api(
+    hass: HomeAssistant, token: str, account_token: str | None = None
+) -> SmartThingsClient:
+    """Return a client for the token sharing the account wide API policies.
+
+    The rate limiter and circuit breakers default to those of the token
+    itself. Installed app tokens pass the personal access token they were
+    issued under, as both count against the same account.
+    """
+    account = async_get_account(hass, account_token or token)
+    if token == account.access_token:
+        return account.api
+    return SmartThingsClient(
+        async_get_clientsession(hass),
+        token,
+        account.limiter,
+        account.breakers,
+        account.metrics,
+    )
@@ -2,7 +2,7 @@
 
 from __future__ import annotations
 
-from collections.abc import Sequence
+from collections.abc import Iterable, Sequence
 
 from pysmartthings import Attribute, Capability
 
@@ -12,7 +12,7 @@ from homeassistant.components.binary_sensor import (
 )
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import EntityCategory, Platform
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 
 from .const import DATA_BROKERS, DOMAIN
@@ -56,25 +56,33 @@ async def async_setup_entry(
 ) -> None:
     """Add binary sensors for a config entry."""
     broker = hass.data[DOMAIN][DATA_BROKERS][config_entry.entry_id]
-    sensors = []
-    for device in broker.devices.values():
-        capabilities = broker.get_assigned(device.device_id, Platform.BINARY_SENSOR)
-        device_components = get_device_components(device)
-
-        for component_id in list(device_components.keys()):
-            attributes = device_components[component_id]["attributes"]
-            disabled_capabilities = device_components[component_id]["disabled_capabilities"]
-            for capability in capabilities:
-                attrib = CAPABILITY_TO_ATTRIB[capability]
-                if capability in disabled_capabilities: 
-                    continue
-
-                if attributes is None or attrib in attributes:
-                    sensors.append(
-                        SmartThingsBinarySensor(device, attrib, component_id)
-                    )
-    
-    async_add_entities(sensors)
+
+    @callback
+    def async_add_devices(devices: Iterable[DeviceEntity]) -> None:
+        sensors = []
+        for device in devices:
+            capabilities = broker.get_assigned(
+                device.device_id, Platform.BINARY_SENSOR
+            )
+            device_components = get_device_components(device)
+
+            for component_id in list(device_components.keys()):
+                attributes = device_components[component_id]["attributes"]
+                disabled_capabilities = device_components[component_id]["disabled_capabilities"]
+                for capability in capabilities:
+                    attrib = CAPABILITY_TO_ATTRIB[capability]
+                    if capability in disabled_capabilities: 
+                        continue
+
+                    if attributes is None or attrib in attributes:
+                        sensors.append(
+                            SmartThingsBinarySensor(device, attrib, component_id)
+                        )
+
+        async_add_entities(sensors)
+
+    async_add_devices(broker.devices.values())
+    config_entry.async_on_unload(broker.async_listen_devices_added(async_add_devices))
 
 
 def get_capabilities(capabilities: Sequence[str]) -> Sequence[str] | None:
@@ -25,7 +25,7 @@ from homeassistant.components.climate import (
 )
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import ATTR_TEMPERATURE, UnitOfTemperature, Platform
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 
 from .const import DATA_BROKERS, DOMAIN
@@ -94,43 +94,77 @@ FAN_OSCILLATION_TO_SWING = {
 WIND = "wind"
 WINDFREE = "windFree"
 
+AC_CAPABILITIES = [
+    Capability.air_conditioner_mode,
+    Capability.air_conditioner_fan_mode,
+    Capability.switch,
+    Capability.temperature_measurement,
+    Capability.thermostat_cooling_setpoint,
+]
+
+# Read by the entities without being assigned to the platform
+READ_CAPABILITIES = [
+    Capability.fan_oscillation_mode,
+    "custom.airConditionerOptionalMode",
+]
+
 UNIT_MAP = {"C": UnitOfTemperature.CELSIUS, "F": UnitOfTemperature.FAHRENHEIT}
 
 _LOGGER = logging.getLogger(__name__)
 
 
+def _changed(compiled: dict[str, Any], status, attribute: str) -> bool:
+    """Return True if the attribute holds another value than when compiled.
+
+    A value is only replaced when the device reports the attribute, so it
+    is only compared when it was reported since.
+    """
+    value = status.attributes[attribute].value
+    if attribute in compiled and (
+        (previous := compiled[attribute]) is value or previous == value
+    ):
+        return False
+    compiled[attribute] = value
+    return True
+
+
 async def async_setup_entry(
     hass: HomeAssistant,
     config_entry: ConfigEntry,
     async_add_entities: AddEntitiesCallback,
 ) -> None:
     """Add climate entities for a config entry."""
-    ac_capabilities = [
-        Capability.air_conditioner_mode,
-        Capability.air_conditioner_fan_mode,
-        Capability.switch,
-        Capability.temperature_measurement,
-        Capability.thermostat_cooling_setpoint,
-    ]
-
     broker = hass.data[DOMAIN][DATA_BROKERS][config_entry.entry_id]
-    entities: list[ClimateEntity] = []
-    for device in broker.devices.values():
-        capabilities = broker.get_assigned(device.device_id, CLIMATE_DOMAIN)
-        device_components = get_device_components(device)
-        if not broker.any_assigned(device.device_id, CLIMATE_DOMAIN):
-            continue
-        for component_id in list(device_components.keys()):
-            attributes = device_components[component_id]["attributes"]
-            disabled_capabilities = device_components[component_id]["disabled_capabilities"]
-            for capability in capabilities:
-                if capability in disabled_capabilities:
-                    continue
-                if capability in ac_capabilities:
-                    entities.append(SmartThingsAirConditioner(device))
-                else:
-                    entities.append(SmartThingsThermostat(device))
-        async_add_entities(entities, True)
+
+    @callback
+    def async_add_devices(devices: Iterable[DeviceEntity]) -> None:
+        entities: list[ClimateEntity] = []
+        for device in devices:
+            if (entity := _create_entity(broker, device)) is not None:
+                entities.append(entity)
+        async_add_entities(entities)
+
+    async_add_devices(broker.devices.values())
+    config_entry.async_on_unload(broker.async_listen_devices_added(async_add_devices))
+
+
+def _create_entity(broker, device: DeviceEntity) -> ClimateEntity | None:
+    """Return the climate entity of the device, if it has one.
+
+    The climate entities represent the main component, one is created when
+    a climate capability assigned to the device is enabled on it.
+    """
+    if not (capabilities := broker.get_assigned(device.device_id, CLIMATE_DOMAIN)):
+        return None
+    component = get_device_components(device)["main"]
+    if all(
+        capability in component["disabled_capabilities"]
+        for capability in capabilities
+    ):
+        return None
+    if all(capability in device.capabilities for capability in AC_CAPABILITIES):
+        return SmartThingsAirConditioner(device)
+    return SmartThingsThermostat(device)
 
 
 def get_capabilities(capabilities: Sequence[str]) -> Sequence[str] | None:
@@ -159,14 +193,7 @@ def get_capabilities(capabilities: Sequence[str]) -> Sequence[str] | None:
     if all(capability in capabilities for capability in thermostat_capabilities):
         return supported
     # Or must have all of these A/C capabilities
-    ac_capabilities = [
-        Capability.air_conditioner_mode,
-        Capability.air_conditioner_fan_mode,
-        Capability.switch,
-        Capability.temperature_measurement,
-        Capability.thermostat_cooling_setpoint,
-    ]
-    if all(capability in capabilities for capability in ac_capabilities):
+    if all(capability in capabilities for capability in AC_CAPABILITIES):
         return supported
     return None
 
@@ -178,6 +205,7 @@ class SmartThingsThermostat(SmartThingsEntity, ClimateEntity):
         """Init the class."""
         super().__init__(device)
         self._attr_supported_features = self._determine_features()
+        self._compiled: dict[str, Any] = {}
         self._hvac_mode = None
         self._hvac_modes = None
 
@@ -200,7 +228,7 @@ class SmartThingsThermostat(SmartThingsEntity, ClimateEntity):
 
         # State is set optimistically in the command above, therefore update
         # the entity state ahead of receiving the confirming push updates
-        self.async_schedule_update_ha_state(True)
+        self._async_handle_device_update()
 
     async def async_set_hvac_mode(self, hvac_mode: HVACMode) -> None:
         """Set new target operation mode."""
@@ -209,7 +237,7 @@ class SmartThingsThermostat(SmartThingsEntity, ClimateEntity):
 
         # State is set optimistically in the command above, therefore update
         # the entity state ahead of receiving the confirming push updates
-        self.async_schedule_update_ha_state(True)
+        self._async_handle_device_update()
 
     async def async_set_temperature(self, **kwargs: Any) -> None:
         """Set new operation mode and target temperatures."""
@@ -217,7 +245,7 @@ class SmartThingsThermostat(SmartThingsEntity, ClimateEntity):
         if operation_state := kwargs.get(ATTR_HVAC_MODE):
             mode = STATE_TO_MODE[operation_state]
             await self._device.set_thermostat_mode(mode, set_status=True)
-            await self.async_update()
+            self._async_update_attrs()
 
         # Heat/cool setpoint
         heating_setpoint = None
@@ -246,20 +274,32 @@ class SmartThingsThermostat(SmartThingsEntity, ClimateEntity):
 
         # State is set optimistically in the commands above, therefore update
         # the entity state ahead of receiving the confirming push updates
-        self.async_schedule_update_ha_state(True)
+        self._async_handle_device_update()
 
-    async def async_update(self) -> None:
-        """Update the attributes of the climate device."""
-        thermostat_mode = self._device.status.thermostat_mode
-        self._hvac_mode = MODE_TO_STATE.get(thermostat_mode)
-        if self._hvac_mode is None:
-            _LOGGER.debug(
-                "Device %s (%s) returned an invalid hvac mode: %s",
-                self._device.label,
-                self._device.device_id,
-                thermostat_mode,
-            )
+    @callback
+    def _async_update_attrs(self) -> None:
+        """Update the attributes of the climate device.
+
+        The mode tables are only compiled again when the device reported
+        other modes.
+        """
+        if _changed(self._compiled, self._device.status, Attribute.thermostat_mode):
+            thermostat_mode = self._device.status.thermostat_mode
+            self._hvac_mode = MODE_TO_STATE.get(thermostat_mode)
+            if self._hvac_mode is None:
+                _LOGGER.debug(
+                    "Device %s (%s) returned an invalid hvac mode: %s",
+                    self._device.label,
+                    self._device.device_id,
+                    thermostat_mode,
+                )
+        if _changed(
+            self._compiled, self._device.status, Attribute.supported_thermostat_modes
+        ):
+            self._hvac_modes = self._compile_hvac_modes()
 
+    def _compile_hvac_modes(self) -> list[HVACMode]:
+        """Return the operation modes of the supported thermostat modes."""
         modes = set()
         supported_modes = self._device.status.supported_thermostat_modes
         if isinstance(supported_modes, Iterable):
@@ -283,7 +323,7 @@ class SmartThingsThermostat(SmartThingsEntity, ClimateEntity):
                 self._device.device_id,
                 supported_modes,
             )
-        self._hvac_modes = list(modes)
+        return list(modes)
 
     @property
     def current_humidity(self):
@@ -359,11 +399,12 @@ class SmartThingsAirConditioner(SmartThingsEntity, ClimateEntity):
     def __init__(self, device) -> None:
         """Init the class."""
         super().__init__(device)
+        self._compiled: dict[str, Any] = {}
         self._hvac_modes = []
         self._attr_preset_mode = None
-        self._attr_preset_modes = self._determine_preset_modes()
-        self._attr_swing_modes = self._determine_swing_modes()
-        self._attr_supported_features = self._determine_supported_features()
+        self._attr_preset_modes = None
+        self._attr_swing_modes = None
+        self._async_update_attrs()
 
     def _determine_supported_features(self) -> ClimateEntityFeature:
         features = (
@@ -448,10 +489,28 @@ class SmartThingsAirConditioner(SmartThingsEntity, ClimateEntity):
         # the entity state ahead of receiving the confirming push updates
         self.async_write_ha_state()
 
-    async def async_update(self) -> None:
-        """Update the calculated fields of the AC."""
+    @callback
+    def _async_update_attrs(self) -> None:
+        """Update the calculated fields of the AC.
+
+        The mode tables are only compiled again when the device reported
+        other supported modes.
+        """
+        status = self._device.status
+        if _changed(self._compiled, status, Attribute.supported_ac_modes):
+            self._hvac_modes = self._compile_hvac_modes()
+        if _changed(
+            self._compiled, status, Attribute.supported_fan_oscillation_modes
+        ):
+            self._attr_swing_modes = self._determine_swing_modes()
+        if _changed(self._compiled, status, "supportedAcOptionalMode"):
+            self._attr_preset_modes = self._determine_preset_modes()
+            self._attr_supported_features = self._determine_supported_features()
+
+    def _compile_hvac_modes(self) -> list[HVACMode]:
+        """Return the operation modes of the supported AC modes."""
         modes = {HVACMode.OFF}
-        for mode in self._device.status.supported_ac_modes:
+        for mode in self._device.status.supported_ac_modes or []:
             if (state := AC_MODE_TO_STATE.get(mode)) is not None:
                 modes.add(state)
             else:
@@ -461,7 +520,7 @@ class SmartThingsAirConditioner(SmartThingsEntity, ClimateEntity):
                     self._device.device_id,
                     mode,
                 )
-        self._hvac_modes = list(modes)
+        return list(modes)
 
     @property
     def current_temperature(self) -> float | None:
@@ -540,7 +599,7 @@ class SmartThingsAirConditioner(SmartThingsEntity, ClimateEntity):
         # setting the fan must reset the preset mode (it deactivates the windFree function)
         self._attr_preset_mode = None
 
-        self.async_schedule_update_ha_state(True)
+        self._async_handle_device_update()
 
     @property
     def swing_mode(self) -> str:
@@ -10,18 +10,37 @@ from pysmartthings import APIResponseError, AppOAuth, SmartThings
 from pysmartthings.installedapp import format_install_url
 import voluptuous as vol
 
-from homeassistant.config_entries import SOURCE_REAUTH, ConfigFlow, ConfigFlowResult
+from homeassistant.config_entries import (
+    SOURCE_REAUTH,
+    ConfigEntry,
+    ConfigFlow,
+    ConfigFlowResult,
+    OptionsFlow,
+)
 from homeassistant.const import CONF_ACCESS_TOKEN, CONF_CLIENT_ID, CONF_CLIENT_SECRET
-from homeassistant.helpers.aiohttp_client import async_get_clientsession
+from homeassistant.core import callback
+from homeassistant.helpers.selector import (
+    SelectSelector,
+    SelectSelectorConfig,
+    SelectSelectorMode,
+)
 
+from .api import async_get_api
 from .const import (
     APP_OAUTH_CLIENT_NAME,
     APP_OAUTH_SCOPES,
     CONF_APP_ID,
+    CONF_DEADBAND,
+    CONF_DEADBAND_PERCENT,
     CONF_INSTALLED_APP_ID,
     CONF_LOCATION_ID,
+    CONF_MAX_STALENESS,
+    CONF_MIN_INTERVAL,
     CONF_REFRESH_TOKEN,
+    CONF_THROTTLE,
+    CONF_THROTTLE_TARGET,
     DOMAIN,
+    THROTTLE_DEFAULTS,
     VAL_UID_MATCHER,
 )
 from .smartapp import (
@@ -47,6 +66,12 @@ class SmartThingsFlowHandler(ConfigFlow, domain=DOMAIN):
     app_id: str
     location_id: str
 
+    @staticmethod
+    @callback
+    def async_get_options_flow(config_entry: ConfigEntry) -> OptionsFlow:
+        """Get the options flow of an entry."""
+        return SmartThingsOptionsFlowHandler()
+
     def __init__(self) -> None:
         """Create a new instance of the flow handler."""
         self.access_token: str | None = None
@@ -109,11 +134,10 @@ class SmartThingsFlowHandler(ConfigFlow, domain=DOMAIN):
             return self._show_step_pat(errors)
 
         # Setup end-point
-        self.api = SmartThings(async_get_clientsession(self.hass), self.access_token)
+        self.api = async_get_api(self.hass, self.access_token)
         try:
             app = await find_app(self.hass, self.api)
             if app:
-                await app.refresh()  # load all attributes
                 await update_app(self.hass, app)
                 # Find an existing entry to copy the oauth client
                 existing = next(
@@ -297,3 +321,73 @@ class SmartThingsFlowHandler(ConfigFlow, domain=DOMAIN):
         location = await self.api.location(data[CONF_LOCATION_ID])
 
         return self.async_create_entry(title=location.name, data=data)
+
+
+class SmartThingsOptionsFlowHandler(OptionsFlow):
+    """Handle the throttle rules of a SmartThings entry.
+
+    A rule applies to a capability or an attribute, an attribute rule taking
+    precedence. A rule set to all zeros turns throttling off for its
+    capability or attribute, the deadband of the sensor included.
+    """
+
+    target: str
+
+    def _throttle(self) -> dict[str, dict[str, float]]:
+        return {
+            **THROTTLE_DEFAULTS,
+            **self.config_entry.options.get(CONF_THROTTLE, {}),
+        }
+
+    async def async_step_init(
+        self, user_input: dict[str, Any] | None = None
+    ) -> ConfigFlowResult:
+        """Select the capability or attribute to throttle."""
+        if user_input is not None:
+            self.target = user_input[CONF_THROTTLE_TARGET].strip()
+            return await self.async_step_rule()
+
+        return self.async_show_form(
+            step_id="init",
+            data_schema=vol.Schema(
+                {
+                    vol.Required(CONF_THROTTLE_TARGET): SelectSelector(
+                        SelectSelectorConfig(
+                            options=sorted(self._throttle()),
+                            custom_value=True,
+                            mode=SelectSelectorMode.DROPDOWN,
+                        )
+                    )
+                }
+            ),
+        )
+
+    async def async_step_rule(
+        self, user_input: dict[str, Any] | None = None
+    ) -> ConfigFlowResult:
+        """Set the rule of the selected capability or attribute."""
+        throttle = self._throttle()
+        if user_input is not None:
+            throttle[self.target] = user_input
+            return self.async_create_entry(
+                data={**self.config_entry.options, CONF_THROTTLE: throttle}
+            )
+
+        rule = throttle.get(self.target, {})
+        return self.async_show_form(
+            step_id="rule",
+            data_schema=vol.Schema(
+                {
+                    vol.Required(key, default=rule.get(key, 0)): vol.All(
+                        vol.Coerce(float), vol.Range(min=0)
+                    )
+                    for key in (
+                        CONF_MIN_INTERVAL,
+                        CONF_DEADBAND,
+                        CONF_DEADBAND_PERCENT,
+                        CONF_MAX_STALENESS,
+                    )
+                }
+            ),
+            description_placeholders={"target": self.target},
+        )
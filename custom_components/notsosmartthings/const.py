@@ -17,18 +17,36 @@ CONF_INSTALLED_APP_ID = "installed_app_id"
 CONF_INSTANCE_ID = "instance_id"
 CONF_LOCATION_ID = "location_id"
 CONF_REFRESH_TOKEN = "refresh_token"
+CONF_THROTTLE = "throttle"
+CONF_THROTTLE_TARGET = "target"
+CONF_MIN_INTERVAL = "min_interval"
+CONF_DEADBAND = "deadband"
+CONF_DEADBAND_PERCENT = "deadband_percent"
+CONF_MAX_STALENESS = "max_staleness"
 
+DATA_ACCOUNTS = "accounts"
+DATA_APPS = "apps"
 DATA_MANAGER = "manager"
+DATA_METRICS = "metrics"
 DATA_BROKERS = "brokers"
+DATA_RECORDER = "recorder"
+DATA_TOKEN_MANAGERS = "token_managers"
 EVENT_BUTTON = "smartthings.button"
 
 SIGNAL_SMARTTHINGS_UPDATE = "smartthings_update"
+SIGNAL_SMARTTHINGS_DEVICES_ADDED = "smartthings_devices_added_{}"
+SIGNAL_SMARTTHINGS_SCENES_ADDED = "smartthings_scenes_added_{}"
+SIGNAL_SMARTTHINGS_SCENES_UPDATED = "smartthings_scenes_updated_{}"
 SIGNAL_SMARTAPP_PREFIX = "smartthings_smartap_"
 
 SETTINGS_INSTANCE_ID = "hassInstanceId"
 
 SUBSCRIPTION_WARNING_LIMIT = 40
 
+# Apps whose settings are compared at once when looking for the app of
+# this installation.
+FIND_APP_CONCURRENCY = 4
+
 STORAGE_KEY = DOMAIN
 STORAGE_VERSION = 1
 
@@ -54,7 +72,75 @@ IGNORED_CAPABILITIES = [
     "ocf",
 ]
 
-TOKEN_REFRESH_INTERVAL = timedelta(days=14)
+# Capabilities whose events are applied although no platform is assigned
+# them: buttons fire events, and the disabled capabilities and components
+# decide which other events are applied.
+EVENT_CAPABILITIES = [
+    "button",
+    "custom.disabledCapabilities",
+    "custom.disabledComponents",
+]
+
+# Access tokens are refreshed ahead of expiry, which also rotates the
+# refresh token before it expires after 30 days of disuse.
+TOKEN_REFRESH_MARGIN = timedelta(minutes=30)
+TOKEN_REFRESH_RETRY = timedelta(minutes=5)
+
+# Devices added or removed in SmartThings are picked up by comparing the
+# device list periodically, or soon after an event of an unknown device.
+DEVICE_REFRESH_INTERVAL = timedelta(minutes=15)
+DEVICE_REFRESH_COOLDOWN = 60  # seconds
+
+# Devices listed for all locations of an account are handed out to the
+# entries setting up for this long before they are fetched again.
+DEVICE_FETCH_MAX_AGE = 60  # seconds
+
+# Scenes are cached between restarts and compared with the API periodically.
+SCENE_REFRESH_INTERVAL = timedelta(minutes=30)
+SCENE_ACTIVATE_TIMEOUT = 60  # seconds
+
+# Writes of frequently reporting meters are throttled by default, the rules
+# of capabilities or attributes are changed in the options of the entry.
+THROTTLE_DEFAULTS = {
+    "powerMeter": {CONF_MIN_INTERVAL: 10, CONF_MAX_STALENESS: 300},
+    "energyMeter": {CONF_MIN_INTERVAL: 60, CONF_MAX_STALENESS: 900},
+    "powerConsumptionReport": {CONF_MIN_INTERVAL: 60, CONF_MAX_STALENESS: 900},
+}
+
+# Energy reported by power consumption reports is imported into long-term
+# statistics from the device history, following a cursor per device.
+ENERGY_HISTORY_SAVE_DELAY = 10  # seconds
+
+# Request budget shared by every API caller using the same access token.
+RATE_LIMIT_CAPACITY = 20
+RATE_LIMIT_REFILL_RATE = 4  # requests per second
+RATE_LIMIT_DEFAULT_RETRY_AFTER = 10  # seconds, when the 429 has no Retry-After
+
+# Retry and circuit breaker policy of API requests.
+API_REQUEST_TIMEOUT = 30
+API_MAX_RETRIES = 3
+API_BACKOFF_BASE = 0.5
+API_BACKOFF_MAX = 8
+API_HEDGE_DELAY = 2
+CIRCUIT_FAILURE_THRESHOLD = 5
+CIRCUIT_RESET_TIMEOUT = 30
+
+# Seconds to wait for a push event confirming an optimistic status update
+# before fetching the status of the device.
+OPTIMISTIC_CONFIRM_TIMEOUT = 15
+OPTIMISTIC_LATENCY_SAMPLES = 100
+
+# On-demand profiling of the event loop.
+PROFILE_DEFAULT_DURATION = 60  # seconds
+PROFILE_MAX_DURATION = 600
+PROFILE_TOP_FUNCTIONS = 25
+
+# Opt-in recording of webhook payloads for replay.
+RECORDER_FILENAME = "smartthings_webhooks.jsonl.gz"
+RECORDER_SNAPSHOT_FILENAME = "smartthings_snapshot.json"
+RECORDER_MAX_BYTES = 5 * 1024 * 1024
+RECORDER_BACKUP_COUNT = 5
+RECORDER_FLUSH_INTERVAL = timedelta(seconds=10)
 
 VAL_UID = "^(?:([0-9a-fA-F]{32})|([0-9a-fA-F]{8}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{12}))$"
 VAL_UID_MATCHER = re.compile(VAL_UID)
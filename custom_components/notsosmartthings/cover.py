@@ -2,10 +2,10 @@
 
 from __future__ import annotations
 
-from collections.abc import Sequence
+from collections.abc import Iterable, Sequence
 from typing import Any
 
-from pysmartthings import Attribute, Capability
+from pysmartthings import Attribute, Capability, DeviceEntity
 
 from homeassistant.components.cover import (
     ATTR_POSITION,
@@ -17,7 +17,7 @@ from homeassistant.components.cover import (
 )
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import ATTR_BATTERY_LEVEL
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 
 from .const import DATA_BROKERS, DOMAIN
@@ -40,14 +40,19 @@ async def async_setup_entry(
 ) -> None:
     """Add covers for a config entry."""
     broker = hass.data[DOMAIN][DATA_BROKERS][config_entry.entry_id]
-    async_add_entities(
-        [
-            SmartThingsCover(device)
-            for device in broker.devices.values()
-            if broker.any_assigned(device.device_id, COVER_DOMAIN)
-        ],
-        True,
-    )
+
+    @callback
+    def async_add_devices(devices: Iterable[DeviceEntity]) -> None:
+        async_add_entities(
+            [
+                SmartThingsCover(device)
+                for device in devices
+                if broker.any_assigned(device.device_id, COVER_DOMAIN)
+            ]
+        )
+
+    async_add_devices(broker.devices.values())
+    config_entry.async_on_unload(broker.async_listen_devices_added(async_add_devices))
 
 
 def get_capabilities(capabilities: Sequence[str]) -> Sequence[str] | None:
@@ -100,7 +105,7 @@ class SmartThingsCover(SmartThingsEntity, CoverEntity):
         await self._device.close(set_status=True)
         # State is set optimistically in the commands above, therefore update
         # the entity state ahead of receiving the confirming push updates
-        self.async_schedule_update_ha_state(True)
+        self._async_handle_device_update()
 
     async def async_open_cover(self, **kwargs: Any) -> None:
         """Open the cover."""
@@ -108,7 +113,7 @@ class SmartThingsCover(SmartThingsEntity, CoverEntity):
         await self._device.open(set_status=True)
         # State is set optimistically in the commands above, therefore update
         # the entity state ahead of receiving the confirming push updates
-        self.async_schedule_update_ha_state(True)
+        self._async_handle_device_update()
 
     async def async_set_cover_position(self, **kwargs: Any) -> None:
         """Move the cover to a specific position."""
@@ -122,7 +127,8 @@ class SmartThingsCover(SmartThingsEntity, CoverEntity):
         else:
             await self._device.set_level(kwargs[ATTR_POSITION], set_status=False)
 
-    async def async_update(self) -> None:
+    @callback
+    def _async_update_attrs(self) -> None:
         """Update the attrs of the cover."""
         if Capability.door_control in self._device.capabilities:
             self._state = VALUE_TO_STATE.get(self._device.status.door)
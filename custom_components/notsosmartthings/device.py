@@ -1,11 +1,90 @@
 import logging
 
-from pysmartthings.device import DeviceEntity as OriginalDeviceEntity
-from typing import List
+from collections.abc import Callable
+from pysmartthings.api import Api
+from pysmartthings.device import (
+    DeviceEntity as OriginalDeviceEntity,
+    DeviceStatus as OriginalDeviceStatus,
+    STATUS_NONE,
+    Status,
+)
+from typing import Any, List
+
+from homeassistant.helpers.device_registry import DeviceInfo
+
+from .const import DOMAIN
 
 _LOGGER = logging.getLogger(__name__)
 
+OptimisticListener = Callable[[str, Status, Any], None]
+
+
+class DeviceStatus(OriginalDeviceStatus):
+    """Device status reporting the values set optimistically by commands."""
+
+    def __init__(self, api: Api, device_id: str, data: dict | None = None):
+        """Create a new instance of the DeviceStatus class."""
+        self.optimistic_listener: OptimisticListener | None = None
+        super().__init__(api, device_id, data)
+
+    def update_attribute_value(self, attribute: str, value):
+        """Update the value of an attribute and report the optimistic change."""
+        previous = self._attributes.get(attribute, STATUS_NONE)
+        super().update_attribute_value(attribute, value)
+        if self.optimistic_listener is not None:
+            self.optimistic_listener(attribute, previous, value)
+
+
 class DeviceEntity(OriginalDeviceEntity):
+    def __init__(
+        self, api: Api, data: dict | None = None, device_id: str | None = None
+    ):
+        """Create a new instance of the DeviceEntity class."""
+        super().__init__(api, data, device_id)
+        self._status = DeviceStatus(api, self._device_id)
+        self._device_info: DeviceInfo | None = None
+        self.status_loaded = False
+
+    @property
+    def device_info(self) -> DeviceInfo:
+        """Get the device registry information shared by the entities."""
+        if self._device_info is None:
+            self._device_info = DeviceInfo(
+                configuration_url="https://account.smartthings.com",
+                identifiers={(DOMAIN, self._device_id)},
+                manufacturer=self._status.ocf_manufacturer_name,
+                model=self._status.ocf_model_number,
+                name=self._label,
+                hw_version=self._status.ocf_hardware_version,
+                sw_version=self._status.ocf_firmware_version,
+            )
+        return self._device_info
+
+    def apply_inline_status(self, data: dict) -> bool:
+        """Apply the status included with the device by the device listing.
+
+        Return False, leaving the status untouched, when any capability
+        of the device came without its status.
+        """
+        components = {}
+        for component in data.get("components") or []:
+            capabilities = {}
+            for capability in component["capabilities"]:
+                if (status := capability.get("status")) is None:
+                    return False
+                capabilities[capability["id"]] = status
+            components[component["id"]] = capabilities
+        if not components:
+            return False
+        self._status.apply_data({"components": components})
+        self.status_loaded = True
+        return True
+
+    async def refresh_status(self) -> None:
+        """Retrieve the status of the device from the API."""
+        await self._status.refresh()
+        self.status_loaded = True
+
     @property
     def disabled_components(self) -> List[str]:
         """Get the list of disabled components for this device.."""
@@ -24,4 +103,4 @@ class DeviceEntity(OriginalDeviceEntity):
         
         if self._status._attributes.get("disabledCapabilities"):
             return self._status._attributes["disabledCapabilities"].value
-        return []
\ No newline at end of file
+        return []
@@ -0,0 +1,78 @@
+"""Diagnostics support for SmartThings."""
+
+from __future__ import annotations
+
+from typing import Any
+
+from homeassistant.components.diagnostics import async_redact_data
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import CONF_ACCESS_TOKEN, CONF_CLIENT_ID, CONF_CLIENT_SECRET
+from homeassistant.core import HomeAssistant
+
+from .api import async_get_account
+from .const import CONF_REFRESH_TOKEN, DATA_BROKERS, DOMAIN
+from .metrics import async_get_metrics
+
+TO_REDACT = {
+    CONF_ACCESS_TOKEN,
+    CONF_CLIENT_ID,
+    CONF_CLIENT_SECRET,
+    CONF_REFRESH_TOKEN,
+    "label",
+    "location_id",
+}
+
+
+async def async_get_config_entry_diagnostics(
+    hass: HomeAssistant, entry: ConfigEntry
+) -> dict[str, Any]:
+    """Return diagnostics for a config entry.
+
+    Everything is taken from the state held by the broker, no requests are
+    made to the SmartThings cloud.
+    """
+    account = async_get_account(hass, entry.data[CONF_ACCESS_TOKEN])
+    diagnostics: dict[str, Any] = {
+        "entry": async_redact_data(entry.as_dict(), TO_REDACT),
+        "api": {
+            "rate_limiter": account.limiter.as_dict(),
+            "circuit_breakers": account.breakers.as_dict(),
+            "metrics": async_get_metrics(hass).as_dict(),
+        },
+    }
+    if (broker := hass.data[DOMAIN][DATA_BROKERS].get(entry.entry_id)) is None:
+        return diagnostics
+
+    diagnostics["broker"] = {
+        "device_count": len(broker.devices),
+        "scene_count": len(broker.scenes),
+        "setup_timings": broker.setup_timings,
+        "subscriptions": {
+            **broker.subscriptions,
+            "required": len(broker.subscriptions.get("capabilities", [])),
+        },
+        "events": dict(broker.event_counts),
+        "dropped_events": dict(broker.dropped_events.most_common()),
+        "optimistic": broker.optimistic.as_dict(),
+        "throttle": broker.throttle.as_dict(),
+    }
+    diagnostics["devices"] = async_redact_data(
+        {
+            device_id: {
+                "label": device.label,
+                "type": device.type,
+                "components": device.components,
+                "assignments": broker.get_assignments(device_id),
+                "status": {
+                    component_id: status.values
+                    for component_id, status in [
+                        ("main", device.status),
+                        *device.status.components.items(),
+                    ]
+                },
+            }
+            for device_id, device in broker.devices.items()
+        },
+        TO_REDACT,
+    )
+    return diagnostics
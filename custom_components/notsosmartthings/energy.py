@@ -0,0 +1,195 @@
+"""Import of the energy of power consumption reports into statistics."""
+
+from __future__ import annotations
+
+import asyncio
+from collections import defaultdict
+from collections.abc import Mapping
+from datetime import datetime
+import logging
+from typing import Any
+
+from aiohttp import ClientConnectionError, ClientResponseError
+from pysmartthings import Attribute, Capability
+
+from homeassistant.components.recorder.models import StatisticData, StatisticMetaData
+from homeassistant.components.recorder.statistics import async_add_external_statistics
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import UnitOfEnergy
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers.storage import Store
+from homeassistant.util import dt as dt_util
+
+from .api import SmartThingsClient
+from .const import DOMAIN, ENERGY_HISTORY_SAVE_DELAY, STORAGE_VERSION
+from .device import DeviceEntity
+from .resilience import CircuitState
+
+_LOGGER = logging.getLogger(__name__)
+
+
+def statistic_id(device_id: str) -> str:
+    """Return the id of the energy statistic of a device."""
+    return f"{DOMAIN}:energy_{device_id.replace('-', '_').lower()}"
+
+
+def report_energy(
+    report: Mapping[str, Any], meter: float | None
+) -> tuple[float | None, float | None]:
+    """Return the energy of a report in kWh and the meter reading after it.
+
+    The delta of the report is used when it has one, otherwise the change
+    of the meter since the previous report.
+    """
+    energy = report.get("energy")
+    if (delta := report.get("deltaEnergy")) is None and None not in (energy, meter):
+        delta = energy - meter
+    if delta is None or delta < 0:
+        return None, energy
+    return delta / 1000, energy
+
+
+class EnergyHistory:
+    """Energy of the power consumption reports of the devices of an entry.
+
+    The history of each device is read after the cursor of the last event
+    imported, the reports it holds summed per hour and written to external
+    statistics in one import per page. The history is read on setup and
+    again once the API is reachable after the circuit breakers opened.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        entry: ConfigEntry,
+        api: SmartThingsClient,
+        devices: Mapping[str, DeviceEntity],
+    ) -> None:
+        """Create the importer of an entry."""
+        self._hass = hass
+        self._entry = entry
+        self._api = api
+        self._devices = devices
+        self._store = Store[dict[str, dict[str, Any]]](
+            hass, STORAGE_VERSION, f"{DOMAIN}.energy.{entry.entry_id}"
+        )
+        self._cursors: dict[str, dict[str, Any]] | None = None
+        self._task: asyncio.Task | None = None
+        self._reachable = True
+
+    @callback
+    def async_start(self) -> CALLBACK_TYPE:
+        """Import the history now and after reconnecting, return a callback to stop."""
+        self.async_schedule_import()
+        return self._api.breakers.async_add_listener(self._async_breakers_changed)
+
+    @callback
+    def _async_breakers_changed(self) -> None:
+        reachable = self._api.breakers.state is CircuitState.CLOSED
+        if reachable and not self._reachable:
+            self.async_schedule_import()
+        self._reachable = reachable
+
+    @callback
+    def async_schedule_import(self) -> None:
+        """Import the history in the background, unless it is being imported."""
+        if "recorder" not in self._hass.config.components:
+            return
+        if self._task is None or self._task.done():
+            self._task = self._entry.async_create_background_task(
+                self._hass, self.async_import(), "smartthings energy history"
+            )
+
+    async def async_import(self) -> None:
+        """Import the history of every device with power consumption reports."""
+        if self._cursors is None:
+            self._cursors = await self._store.async_load() or {}
+        for device in list(self._devices.values()):
+            if Capability.power_consumption_report not in device.capabilities:
+                continue
+            try:
+                await self._async_import_device(device)
+            except (ClientResponseError, ClientConnectionError) as ex:
+                # Resumed from the cursor on the next import
+                _LOGGER.debug(
+                    "Unable to import the energy history of %s: %s", device.label, ex
+                )
+
+    async def _async_import_device(self, device: DeviceEntity) -> None:
+        cursor = self._cursors.setdefault(device.device_id, {})
+        metadata = StatisticMetaData(
+            has_mean=False,
+            has_sum=True,
+            name=f"{device.label} energy",
+            source=DOMAIN,
+            statistic_id=statistic_id(device.device_id),
+            unit_of_measurement=UnitOfEnergy.KILO_WATT_HOUR,
+        )
+        after = (cursor["epoch"], cursor["hash"]) if "epoch" in cursor else None
+        imported = 0
+        async for items in self._api.iter_device_history(
+            device.location_id, device.device_id, after=after
+        ):
+            if not items:
+                continue
+            hours: dict[float, float] = defaultdict(float)
+            for item in items:
+                if (
+                    item.get("capability") != Capability.power_consumption_report
+                    or item.get("attribute") != Attribute.power_consumption
+                    or not isinstance(report := item.get("value"), Mapping)
+                ):
+                    continue
+                energy, cursor["meter"] = report_energy(report, cursor.get("meter"))
+                if energy is None or not (
+                    started := dt_util.parse_datetime(
+                        report.get("start") or item.get("time") or ""
+                    )
+                ):
+                    continue
+                # Statistics start at the top of a UTC hour
+                hour = dt_util.as_utc(started).replace(
+                    minute=0, second=0, microsecond=0
+                )
+                hours[hour.timestamp()] += energy
+            cursor["epoch"] = items[-1]["epoch"]
+            cursor["hash"] = items[-1]["hash"]
+            if statistics := self._fold(cursor, hours):
+                async_add_external_statistics(self._hass, metadata, statistics)
+                imported += len(statistics)
+            self._store.async_delay_save(
+                lambda: self._cursors, ENERGY_HISTORY_SAVE_DELAY
+            )
+        if imported:
+            _LOGGER.debug(
+                "Imported %s hours of energy history of %s", imported, device.label
+            )
+
+    @staticmethod
+    def _fold(
+        cursor: dict[str, Any], hours: Mapping[float, float]
+    ) -> list[StatisticData]:
+        """Add the energy of each hour to the sum and return the statistics.
+
+        The last hour imported may still grow, so it is imported again when
+        more energy was reported in it. Energy of earlier hours arriving
+        late is dropped, as the sums following it were imported already.
+        """
+        statistics = []
+        for hour in sorted(hours):
+            if hour < cursor.get("hour", hour):
+                continue
+            cursor["hour"] = hour
+            cursor["sum"] = cursor.get("sum", 0.0) + hours[hour]
+            statistics.append(
+                StatisticData(
+                    start=datetime.fromtimestamp(hour, dt_util.UTC),
+                    state=cursor["sum"],
+                    sum=cursor["sum"],
+                )
+            )
+        return statistics
+
+    async def async_remove(self) -> None:
+        """Remove the cursors."""
+        await self._store.async_remove()
@@ -2,13 +2,17 @@
 
 from __future__ import annotations
 
-from pysmartthings.device import DeviceEntity
+from typing import Any
 
-from homeassistant.helpers.device_registry import DeviceInfo
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import EntityCategory
+from homeassistant.core import callback
+from homeassistant.helpers.device_registry import DeviceEntryType, DeviceInfo
 from homeassistant.helpers.dispatcher import async_dispatcher_connect
 from homeassistant.helpers.entity import Entity
 
 from .const import DOMAIN, SIGNAL_SMARTTHINGS_UPDATE
+from .device import DeviceEntity
 
 
 class SmartThingsEntity(Entity):
@@ -20,31 +24,93 @@ class SmartThingsEntity(Entity):
         """Initialize the instance."""
         self._device = device
         self._dispatcher_remove = None
+        self._state_fingerprint: tuple[Any, ...] | None = None
         self._attr_name = device.label
         self._attr_unique_id = device.device_id
-        self._attr_device_info = DeviceInfo(
-            configuration_url="https://account.smartthings.com",
-            identifiers={(DOMAIN, device.device_id)},
-            manufacturer=device.status.ocf_manufacturer_name,
-            model=device.status.ocf_model_number,
-            name=device.label,
-            hw_version=device.status.ocf_hardware_version,
-            sw_version=device.status.ocf_firmware_version,
-        )
+        # Built once per device and shared by all of its entities
+        self._attr_device_info = device.device_info
 
     async def async_added_to_hass(self):
         """Device added to hass."""
+        self._async_update_attrs()
+        if hasattr(self, "async_update"):
+            # Entities doing I/O to update are updated in a task of their own
 
-        async def async_update_state(devices):
-            """Update device state."""
-            if self._device.device_id in devices:
-                await self.async_update_ha_state(True)
+            async def async_update_state(devices):
+                """Update device state."""
+                if self._device.device_id in devices:
+                    await self.async_update_ha_state(True)
+
+        else:
+
+            @callback
+            def async_update_state(devices):
+                """Update device state."""
+                if self._device.device_id in devices:
+                    self._async_handle_device_update()
 
         self._dispatcher_remove = async_dispatcher_connect(
             self.hass, SIGNAL_SMARTTHINGS_UPDATE, async_update_state
         )
 
+    @callback
+    def _async_update_attrs(self) -> None:
+        """Update the attributes derived from the device status.
+
+        Runs in the event loop on every update of the device, so it must
+        not do I/O.
+        """
+
+    @callback
+    def _async_state_fingerprint(self) -> tuple[Any, ...]:
+        """Return what the state written for the entity is made of.
+
+        The state is only written when the fingerprint changed since the
+        last write, entities override this to leave out insignificant
+        changes.
+        """
+        return (
+            self.available,
+            self.state,
+            self.state_attributes,
+            self.extra_state_attributes,
+        )
+
+    @callback
+    def _async_handle_device_update(self) -> None:
+        """Update the derived attributes and write the state if it changed."""
+        self._async_update_attrs()
+        if (fingerprint := self._async_state_fingerprint()) == self._state_fingerprint:
+            return
+        self._state_fingerprint = fingerprint
+        super().async_write_ha_state()
+
+    @callback
+    def async_write_ha_state(self) -> None:
+        """Write the state and remember its fingerprint."""
+        self._state_fingerprint = self._async_state_fingerprint()
+        super().async_write_ha_state()
+
     async def async_will_remove_from_hass(self) -> None:
         """Disconnect the device when removed."""
         if self._dispatcher_remove:
-            self._dispatcher_remove()
\ No newline at end of file
+            self._dispatcher_remove()
+
+
+class SmartThingsDiagnosticEntity(Entity):
+    """Defines an entity reporting on the integration itself."""
+
+    _attr_should_poll = False
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+
+    def __init__(self, entry: ConfigEntry, key: str, name: str) -> None:
+        """Initialize the instance."""
+        self._attr_name = f"{entry.title} {name}"
+        self._attr_unique_id = f"{entry.entry_id}.{key}"
+        self._attr_device_info = DeviceInfo(
+            configuration_url="https://account.smartthings.com",
+            entry_type=DeviceEntryType.SERVICE,
+            identifiers={(DOMAIN, entry.entry_id)},
+            manufacturer="SmartThings",
+            name=entry.title,
+        )
@@ -2,15 +2,15 @@
 
 from __future__ import annotations
 
-from collections.abc import Sequence
+from collections.abc import Iterable, Sequence
 import math
 from typing import Any
 
-from pysmartthings import Capability
+from pysmartthings import Capability, DeviceEntity
 
 from homeassistant.components.fan import FanEntity, FanEntityFeature
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.util.percentage import (
     percentage_to_ranged_value,
@@ -31,11 +31,17 @@ async def async_setup_entry(
 ) -> None:
     """Add fans for a config entry."""
     broker = hass.data[DOMAIN][DATA_BROKERS][config_entry.entry_id]
-    async_add_entities(
-        SmartThingsFan(device)
-        for device in broker.devices.values()
-        if broker.any_assigned(device.device_id, "fan")
-    )
+
+    @callback
+    def async_add_devices(devices: Iterable[DeviceEntity]) -> None:
+        async_add_entities(
+            SmartThingsFan(device)
+            for device in devices
+            if broker.any_assigned(device.device_id, "fan")
+        )
+
+    async_add_devices(broker.devices.values())
+    config_entry.async_on_unload(broker.async_listen_devices_added(async_add_devices))
 
 
 def get_capabilities(capabilities: Sequence[str]) -> Sequence[str] | None:
@@ -3,10 +3,10 @@
 from __future__ import annotations
 
 import asyncio
-from collections.abc import Sequence
+from collections.abc import Iterable, Sequence
 from typing import Any
 
-from pysmartthings import Capability
+from pysmartthings import Capability, DeviceEntity
 
 from homeassistant.components.light import (
     ATTR_BRIGHTNESS,
@@ -20,7 +20,7 @@ from homeassistant.components.light import (
 )
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import Platform
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 
 from .const import DATA_BROKERS, DOMAIN
@@ -35,22 +35,28 @@ async def async_setup_entry(
 ) -> None:
     """Add lights for a config entry."""
     broker = hass.data[DOMAIN][DATA_BROKERS][config_entry.entry_id]
-    entities = []
 
-    for device in broker.devices.values():
-        if broker.any_assigned(device.device_id, Platform.LIGHT):
-            device_components = get_device_components(device)
+    @callback
+    def async_add_devices(devices: Iterable[DeviceEntity]) -> None:
+        entities = []
 
-            for component_id in list(device_components.keys()):
-                attributes = device_components[component_id]["attributes"]
-                disabled_capabilities = device_components[component_id][
-                    "disabled_capabilities"
-                ]
+        for device in devices:
+            if broker.any_assigned(device.device_id, Platform.LIGHT):
+                device_components = get_device_components(device)
 
-                if attributes is None or Platform.SWITCH in attributes:
-                    entities.append(SmartThingsLight(device, component_id))
+                for component_id in list(device_components.keys()):
+                    attributes = device_components[component_id]["attributes"]
+                    disabled_capabilities = device_components[component_id][
+                        "disabled_capabilities"
+                    ]
 
-    async_add_entities(entities, True)
+                    if attributes is None or Platform.SWITCH in attributes:
+                        entities.append(SmartThingsLight(device, component_id))
+
+        async_add_entities(entities)
+
+    async_add_devices(broker.devices.values())
+    config_entry.async_on_unload(broker.async_listen_devices_added(async_add_devices))
 
 
 
@@ -163,7 +169,7 @@ class SmartThingsLight(SmartThingsEntity, LightEntity):
 
         # State is set optimistically in the commands above, therefore update
         # the entity state ahead of receiving the confirming push updates
-        self.async_schedule_update_ha_state(True)
+        self._async_handle_device_update()
 
     async def async_turn_off(self, **kwargs: Any) -> None:
         """Turn the light off."""
@@ -177,9 +183,10 @@ class SmartThingsLight(SmartThingsEntity, LightEntity):
 
         # State is set optimistically in the commands above, therefore update
         # the entity state ahead of receiving the confirming push updates
-        self.async_schedule_update_ha_state(True)
+        self._async_handle_device_update()
 
-    async def async_update(self) -> None:
+    @callback
+    def _async_update_attrs(self) -> None:
         """Update entity attributes when the device status has changed."""
         status = get_device_status(self._device, self._component_id)
 
@@ -2,14 +2,14 @@
 
 from __future__ import annotations
 
-from collections.abc import Sequence
+from collections.abc import Iterable, Sequence
 from typing import Any
 
-from pysmartthings import Attribute, Capability
+from pysmartthings import Attribute, Capability, DeviceEntity
 
 from homeassistant.components.lock import LockEntity
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 
 from .const import DATA_BROKERS, DOMAIN
@@ -33,11 +33,17 @@ async def async_setup_entry(
 ) -> None:
     """Add locks for a config entry."""
     broker = hass.data[DOMAIN][DATA_BROKERS][config_entry.entry_id]
-    async_add_entities(
-        SmartThingsLock(device)
-        for device in broker.devices.values()
-        if broker.any_assigned(device.device_id, "lock")
-    )
+
+    @callback
+    def async_add_devices(devices: Iterable[DeviceEntity]) -> None:
+        async_add_entities(
+            SmartThingsLock(device)
+            for device in devices
+            if broker.any_assigned(device.device_id, "lock")
+        )
+
+    async_add_devices(broker.devices.values())
+    config_entry.async_on_unload(broker.async_listen_devices_added(async_add_devices))
 
 
 def get_capabilities(capabilities: Sequence[str]) -> Sequence[str] | None:
@@ -2,7 +2,7 @@
 
 from __future__ import annotations
 
-from collections.abc import Sequence
+from collections.abc import Iterable, Sequence
 from typing import Any
 
 from pysmartthings import APIResponseError, Capability, DeviceEntity
@@ -14,7 +14,7 @@ from homeassistant.components.media_player import (
     MediaPlayerState,
 )
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.exceptions import HomeAssistantError
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 
@@ -39,11 +39,17 @@ async def async_setup_entry(
 ) -> None:
     """Add media players for a config entry."""
     broker = hass.data[DOMAIN][DATA_BROKERS][config_entry.entry_id]
-    async_add_entities(
-        SmartThingsMediaPlayer(device)
-        for device in broker.devices.values()
-        if broker.any_assigned(device.device_id, MEDIA_PLAYER_DOMAIN)
-    )
+
+    @callback
+    def async_add_devices(devices: Iterable[DeviceEntity]) -> None:
+        async_add_entities(
+            SmartThingsMediaPlayer(device)
+            for device in devices
+            if broker.any_assigned(device.device_id, MEDIA_PLAYER_DOMAIN)
+        )
+
+    async_add_devices(broker.devices.values())
+    config_entry.async_on_unload(broker.async_listen_devices_added(async_add_devices))
 
 
 def get_capabilities(capabilities: Sequence[str]) -> Sequence[str] | None:
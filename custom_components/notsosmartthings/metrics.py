@@ -0,0 +1,199 @@
+"""In-memory performance metrics of the integration."""
+
+from __future__ import annotations
+
+from bisect import bisect_left
+from typing import Any
+
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+
+from .const import DATA_METRICS, DOMAIN
+
+# Upper bounds of the histogram buckets, values above the last bound are
+# counted in an overflow bucket.
+LATENCY_BUCKETS = (
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1,
+    2.5,
+    5,
+    10,
+    30,
+)  # seconds
+COUNT_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100, 200, 500)
+
+# Reading and decoding the body of a webhook request, then verifying its
+# signature and handling the lifecycle or events it carries.
+METRIC_WEBHOOK_READ = "webhook_read"
+METRIC_WEBHOOK_HANDLE = "webhook_handle"
+METRIC_EVENT_HANDLER = "event_handler"
+METRIC_DISPATCH_FAN_OUT = "dispatch_fan_out"
+METRIC_API_LATENCY = "api_latency"
+METRIC_API_QUEUE_DEPTH = "api_queue_depth"
+METRIC_API_RATE_LIMIT_WAIT = "api_rate_limit_wait"
+METRIC_API_RATE_LIMITED = "api_rate_limited"
+METRIC_SCENE_ACTIVATION = "scene_activation"
+
+
+class Histogram:
+    """Distribution of observed values in fixed buckets."""
+
+    __slots__ = ("bounds", "counts", "count", "total", "max")
+
+    def __init__(self, bounds: tuple[float, ...]) -> None:
+        """Create an empty histogram."""
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def observe(self, value: float) -> None:
+        """Add a value to the histogram."""
+        self.counts[bisect_left(self.bounds, value)] += 1
+        self.count += 1
+        self.total += value
+        if value > self.max:
+            self.max = value
+
+    def merge(self, other: Histogram) -> None:
+        """Add the values of a histogram with the same buckets."""
+        for index, count in enumerate(other.counts):
+            self.counts[index] += count
+        self.count += other.count
+        self.total += other.total
+        self.max = max(self.max, other.max)
+
+    @property
+    def mean(self) -> float | None:
+        """Return the average of the observed values."""
+        return self.total / self.count if self.count else None
+
+    def percentile(self, percent: float) -> float | None:
+        """Return the upper bound of the bucket holding the percentile."""
+        if not self.count:
+            return None
+        rank = self.count * percent / 100
+        seen = 0
+        for index, count in enumerate(self.counts):
+            seen += count
+            if seen >= rank and count:
+                if index == len(self.bounds):
+                    return self.max
+                return min(self.bounds[index], self.max)
+        return self.max
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return a summary of the histogram."""
+        return {
+            "count": self.count,
+            "mean": self.mean,
+            "p50": self.percentile(50),
+            "p95": self.percentile(95),
+            "p99": self.percentile(99),
+            "max": self.max if self.count else None,
+        }
+
+
+class Metrics:
+    """Registry of the histograms and counters of the integration.
+
+    Metrics are labelled, e.g. by endpoint or config entry. Nothing is
+    recorded unless a consumer enabled the registry, callers check enabled
+    before measuring so the cost when disabled is a single attribute read.
+    The API latencies are the exception, they are always recorded as the
+    diagnostics report them.
+    """
+
+    def __init__(self) -> None:
+        """Create an empty registry."""
+        self.enabled = False
+        self._consumers = 0
+        self._histograms: dict[str, dict[str | None, Histogram]] = {}
+        self._counters: dict[str, dict[str | None, int]] = {}
+
+    @callback
+    def async_enable(self) -> CALLBACK_TYPE:
+        """Start recording until the returned callback is called."""
+        self._consumers += 1
+        self.enabled = True
+
+        @callback
+        def disable() -> None:
+            self._consumers -= 1
+            self.enabled = self._consumers > 0
+
+        return disable
+
+    def observe(
+        self,
+        name: str,
+        value: float,
+        label: str | None = None,
+        bounds: tuple[float, ...] = LATENCY_BUCKETS,
+    ) -> None:
+        """Add a value to a histogram."""
+        histograms = self._histograms.setdefault(name, {})
+        if (histogram := histograms.get(label)) is None:
+            histogram = histograms[label] = Histogram(bounds)
+        histogram.observe(value)
+
+    def increment(self, name: str, label: str | None = None, amount: int = 1) -> None:
+        """Increase a counter."""
+        counters = self._counters.setdefault(name, {})
+        counters[label] = counters.get(label, 0) + amount
+
+    def histograms(self, name: str) -> dict[str | None, Histogram]:
+        """Return the histograms of a metric by label."""
+        return self._histograms.get(name, {})
+
+    def histogram(self, name: str, label: str | None = None) -> Histogram | None:
+        """Return the histogram of one label, or all labels merged if None."""
+        histograms = self.histograms(name)
+        if label is not None:
+            return histograms.get(label)
+        if not histograms:
+            return None
+        merged: Histogram | None = None
+        for histogram in histograms.values():
+            if merged is None:
+                merged = Histogram(histogram.bounds)
+            merged.merge(histogram)
+        return merged
+
+    def counter(self, name: str, label: str | None = None) -> int:
+        """Return a counter of one label, or the total if None."""
+        counters = self._counters.get(name, {})
+        if label is not None:
+            return counters.get(label, 0)
+        return sum(counters.values())
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return a summary of every metric."""
+        return {
+            "enabled": self.enabled,
+            "histograms": {
+                name: {
+                    str(label): histogram.as_dict()
+                    for label, histogram in histograms.items()
+                }
+                for name, histograms in self._histograms.items()
+            },
+            "counters": {
+                name: {str(label): count for label, count in counters.items()}
+                for name, counters in self._counters.items()
+            },
+        }
+
+
+@callback
+def async_get_metrics(hass: HomeAssistant) -> Metrics:
+    """Return the metrics registry of the integration."""
+    return hass.data[DOMAIN][DATA_METRICS]
@@ -1,7 +1,7 @@
 from __future__ import annotations
 
 from typing import Any, NamedTuple, Literal
-from collections.abc import Sequence
+from collections.abc import Iterable, Sequence
 import logging
 
 import asyncio
@@ -9,7 +9,7 @@ import asyncio
 
 from pysmartthings import Capability, Attribute
 
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.util import dt as dt_util
 
@@ -81,17 +81,23 @@ async def async_setup_entry(
 ) -> None:
     """Set up the number platform."""
     broker = hass.data[DOMAIN][DATA_BROKERS][config_entry.entry_id]
-    entities: list[NumberEntity] = []
 
-    for device in broker.devices.values():
-        _LOGGER.debug(f"Adding numbers for device: {device.label}")
-        device_components = get_device_components(device)
-        for component_id, component_info in device_components.items():
-            _LOGGER.debug(f"Adding numbers of component_id: {component_id} with {device_components[component_id]}")
-            entities.extend(
-                _get_device_number_entities(broker, device, component_id, component_info)
-            )
-    async_add_entities(entities)
+    @callback
+    def async_add_devices(devices: Iterable[DeviceEntity]) -> None:
+        entities: list[NumberEntity] = []
+
+        for device in devices:
+            _LOGGER.debug(f"Adding numbers for device: {device.label}")
+            device_components = get_device_components(device)
+            for component_id, component_info in device_components.items():
+                _LOGGER.debug(f"Adding numbers of component_id: {component_id} with {device_components[component_id]}")
+                entities.extend(
+                    _get_device_number_entities(broker, device, component_id, component_info)
+                )
+        async_add_entities(entities)
+
+    async_add_devices(broker.devices.values())
+    config_entry.async_on_unload(broker.async_listen_devices_added(async_add_devices))
 
 def _get_device_number_entities(
     broker: Any, 
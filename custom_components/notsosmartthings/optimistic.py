@@ -0,0 +1,174 @@
+"""Confirmation tracking of optimistic device state."""
+
+from __future__ import annotations
+
+from collections import deque
+from collections.abc import Mapping
+from functools import partial
+import logging
+import time
+from typing import Any, NamedTuple
+
+from aiohttp import ClientError
+from pysmartthings.device import Status
+
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers.dispatcher import async_dispatcher_send
+from homeassistant.helpers.event import async_call_later
+
+from .const import (
+    OPTIMISTIC_CONFIRM_TIMEOUT,
+    OPTIMISTIC_LATENCY_SAMPLES,
+    SIGNAL_SMARTTHINGS_UPDATE,
+)
+from .device import DeviceEntity
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class PendingChange(NamedTuple):
+    """A value set optimistically that the device has not yet confirmed."""
+
+    expected: Any
+    previous: Status
+    sent_at: float
+
+
+class OptimisticTracker:
+    """Reconcile optimistic status updates with the events that follow.
+
+    Commands sent with set_status=True update the local status right away.
+    Every such change is recorded until a push event for the same attribute
+    arrives. Changes still pending after the timeout cause one status fetch
+    of the device, rolling back whatever the device did not apply.
+    """
+
+    def __init__(self, hass: HomeAssistant, devices: Mapping[str, DeviceEntity]):
+        """Create a new tracker."""
+        self._hass = hass
+        self._devices = devices
+        self._pending: dict[str, dict[str, PendingChange]] = {}
+        self._timers: dict[str, CALLBACK_TYPE] = {}
+        self._latencies: deque[float] = deque(maxlen=OPTIMISTIC_LATENCY_SAMPLES)
+        self.tracked = 0
+        self.confirmed = 0
+        self.contradicted = 0
+        self.rolled_back = 0
+
+    @callback
+    def async_start(self) -> None:
+        """Start tracking optimistic changes of the devices."""
+        for device in self._devices.values():
+            self.async_add_device(device)
+
+    @callback
+    def async_add_device(self, device: DeviceEntity) -> None:
+        """Start tracking optimistic changes of a device."""
+        device.status.optimistic_listener = partial(self.async_track, device.device_id)
+
+    @callback
+    def async_remove_device(self, device: DeviceEntity) -> None:
+        """Stop tracking a device and forget its pending changes."""
+        device.status.optimistic_listener = None
+        self._async_clear(device.device_id)
+
+    @callback
+    def async_stop(self) -> None:
+        """Stop tracking and forget pending changes."""
+        for device in self._devices.values():
+            device.status.optimistic_listener = None
+        for cancel in self._timers.values():
+            cancel()
+        self._timers.clear()
+        self._pending.clear()
+
+    @callback
+    def async_track(
+        self, device_id: str, attribute: str, previous: Status, expected: Any
+    ) -> None:
+        """Record a value set optimistically on the main component."""
+        pending = self._pending.setdefault(device_id, {})
+        if (existing := pending.get(attribute)) is not None:
+            # Roll back to the last confirmed value, not an optimistic one.
+            previous = existing.previous
+        pending[attribute] = PendingChange(expected, previous, time.monotonic())
+        self.tracked += 1
+        if device_id not in self._timers:
+            self._timers[device_id] = async_call_later(
+                self._hass,
+                OPTIMISTIC_CONFIRM_TIMEOUT,
+                partial(self._async_expire, device_id),
+            )
+
+    @callback
+    def async_confirm(
+        self, device_id: str, component_id: str, attribute: str, value: Any
+    ) -> None:
+        """Clear the pending change matched by a push event."""
+        if component_id != "main" or not (pending := self._pending.get(device_id)):
+            return
+        if (change := pending.pop(attribute, None)) is None:
+            return
+        if value == change.expected:
+            self.confirmed += 1
+            self._latencies.append(time.monotonic() - change.sent_at)
+        else:
+            # The event carries the actual value which was already applied.
+            self.contradicted += 1
+        if not pending:
+            self._async_clear(device_id)
+
+    @callback
+    def _async_clear(self, device_id: str) -> None:
+        self._pending.pop(device_id, None)
+        if (cancel := self._timers.pop(device_id, None)) is not None:
+            cancel()
+
+    async def _async_expire(self, device_id: str, _now: Any = None) -> None:
+        """Fetch the status of a device whose changes were not confirmed."""
+        self._timers.pop(device_id, None)
+        if not (pending := self._pending.pop(device_id, None)):
+            return
+        device = self._devices[device_id]
+        try:
+            await device.status.refresh()
+        except (ClientError, TimeoutError):
+            _LOGGER.debug(
+                "Unable to refresh %s (%s), restoring previous values of %s",
+                device.label,
+                device_id,
+                list(pending),
+                exc_info=True,
+            )
+            for attribute, change in pending.items():
+                device.status.attributes[attribute] = change.previous
+            self.rolled_back += len(pending)
+        else:
+            for attribute, change in pending.items():
+                if device.status.attributes[attribute].value == change.expected:
+                    self.confirmed += 1
+                    self._latencies.append(time.monotonic() - change.sent_at)
+                else:
+                    self.rolled_back += 1
+            _LOGGER.debug(
+                "Refreshed %s (%s) after unconfirmed changes of %s",
+                device.label,
+                device_id,
+                list(pending),
+            )
+        async_dispatcher_send(self._hass, SIGNAL_SMARTTHINGS_UPDATE, {device_id})
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return confirmation statistics."""
+        latencies = sorted(self._latencies)
+        return {
+            "pending": sum(len(pending) for pending in self._pending.values()),
+            "tracked": self.tracked,
+            "confirmed": self.confirmed,
+            "contradicted": self.contradicted,
+            "rolled_back": self.rolled_back,
+            "confirmation_latency": {
+                "p50": latencies[len(latencies) // 2] if latencies else None,
+                "max": latencies[-1] if latencies else None,
+            },
+        }
@@ -0,0 +1,97 @@
+"""On-demand profiling of the work done in the event loop."""
+
+from __future__ import annotations
+
+import cProfile
+import io
+import logging
+from pathlib import Path
+import pstats
+import re
+
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.exceptions import HomeAssistantError
+from homeassistant.helpers.event import async_call_later
+from homeassistant.util import dt as dt_util
+
+from .const import PROFILE_TOP_FUNCTIONS
+
+_LOGGER = logging.getLogger(__name__)
+
+# Restricts the reported functions to the integration and its libraries.
+INTEGRATION_FILES = "|".join(
+    re.escape(part)
+    for part in (str(Path(__file__).parent), "pysmartthings", "pysmartapp", "httpsig")
+)
+
+
+class EventLoopProfiler:
+    """Profile the event loop thread for a bounded duration.
+
+    cProfile records every function run by the thread, the stats written
+    to the config directory are complete while the log only lists the
+    functions of the integration and its libraries.
+    """
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Create a new profiler."""
+        self._hass = hass
+        self._profile: cProfile.Profile | None = None
+        self._stop_timer: CALLBACK_TYPE | None = None
+
+    @property
+    def running(self) -> bool:
+        """Return True while a profile is being recorded."""
+        return self._profile is not None
+
+    @callback
+    def async_start(self, duration: float) -> None:
+        """Start profiling, stopping automatically after the duration."""
+        if self._profile is not None:
+            raise HomeAssistantError("A SmartThings profile is already running")
+        profile = cProfile.Profile()
+        try:
+            profile.enable()
+        except ValueError as ex:
+            # Only a single profiler can be active at a time
+            raise HomeAssistantError(f"Unable to start profiling: {ex}") from ex
+        self._profile = profile
+        self._stop_timer = async_call_later(self._hass, duration, self._async_expire)
+        _LOGGER.info("Started profiling the event loop for %ss", duration)
+
+    async def async_stop(self) -> str:
+        """Stop profiling and return the path of the stats file."""
+        if (profile := self._profile) is None:
+            raise HomeAssistantError("No SmartThings profile is running")
+        profile.disable()
+        self._profile = None
+        if self._stop_timer:
+            self._stop_timer()
+            self._stop_timer = None
+
+        path = self._hass.config.path(
+            f"smartthings_profile.{dt_util.utcnow():%Y%m%d%H%M%S}.pstats"
+        )
+        report = await self._hass.async_add_executor_job(_write_stats, profile, path)
+        _LOGGER.info(
+            "Wrote profile to %s (open with pstats or snakeviz), hot functions:\n%s",
+            path,
+            report,
+        )
+        return path
+
+    async def _async_expire(self, _now) -> None:
+        self._stop_timer = None
+        if self._profile is not None:
+            await self.async_stop()
+
+
+def _write_stats(profile: cProfile.Profile, path: str) -> str:
+    """Write the stats file and return the top functions as text."""
+    profile.dump_stats(path)
+    report = io.StringIO()
+    stats = pstats.Stats(profile, stream=report)
+    stats.sort_stats(pstats.SortKey.CUMULATIVE).print_stats(
+        INTEGRATION_FILES, PROFILE_TOP_FUNCTIONS
+    )
+    return report.getvalue()
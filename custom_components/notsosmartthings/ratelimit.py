@@ -0,0 +1,196 @@
+"""Account-wide rate limiting of SmartThings API requests."""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Mapping
+from email.utils import parsedate_to_datetime
+from enum import IntEnum
+import heapq
+import itertools
+import logging
+import time
+from typing import Any
+
+from homeassistant.core import callback
+from homeassistant.util import dt as dt_util
+
+from .const import RATE_LIMIT_DEFAULT_RETRY_AFTER
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class RequestPriority(IntEnum):
+    """Priority classes of API requests, lower values are served first."""
+
+    AUTH = 0
+    COMMAND = 1
+    REFRESH = 2
+
+
+class RateLimiter:
+    """Token bucket shared by every API caller using the same access token.
+
+    Requests that cannot be served immediately are queued and released in
+    priority order as the bucket refills, so a burst of refreshes from one
+    config entry cannot starve a lock command issued by another.
+    """
+
+    def __init__(self, capacity: float, refill_rate: float) -> None:
+        """Create a new rate limiter."""
+        self._capacity = capacity
+        self._refill_rate = refill_rate
+        self._tokens = capacity
+        self._updated = time.monotonic()
+        self._blocked_until = 0.0
+        self._waiters: list[tuple[int, int, asyncio.Future[None]]] = []
+        self._sequence = itertools.count()
+        self._wakeup: asyncio.TimerHandle | None = None
+        self._wait_stats = {
+            priority: {"count": 0, "total": 0.0, "max": 0.0, "last": 0.0}
+            for priority in RequestPriority
+        }
+
+    @property
+    def budget(self) -> float:
+        """Return the number of requests that can be made without waiting."""
+        now = time.monotonic()
+        if now < self._blocked_until:
+            return 0.0
+        self._refill(now)
+        return self._tokens
+
+    @property
+    def blocked_for(self) -> float:
+        """Return the seconds remaining of a server requested pause."""
+        return max(0.0, self._blocked_until - time.monotonic())
+
+    @property
+    def queued(self) -> int:
+        """Return the number of requests waiting for a slot."""
+        return sum(1 for _, _, future in self._waiters if not future.done())
+
+    @property
+    def wait_times(self) -> dict[str, dict[str, float]]:
+        """Return wait time statistics in seconds per priority class."""
+        return {
+            priority.name.lower(): {
+                "count": stats["count"],
+                "average": stats["total"] / stats["count"] if stats["count"] else 0.0,
+                "max": stats["max"],
+                "last": stats["last"],
+            }
+            for priority, stats in self._wait_stats.items()
+        }
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the current state of the limiter."""
+        return {
+            "capacity": self._capacity,
+            "refill_rate": self._refill_rate,
+            "budget": round(self.budget, 2),
+            "blocked_for": round(self.blocked_for, 2),
+            "queued": self.queued,
+            "wait_times": self.wait_times,
+        }
+
+    async def acquire(
+        self, priority: RequestPriority = RequestPriority.REFRESH
+    ) -> float:
+        """Wait for a request slot and return the seconds spent waiting."""
+        start = time.monotonic()
+        if not self._waiters and self._try_take(start):
+            self._record_wait(priority, 0.0)
+            return 0.0
+
+        future: asyncio.Future[None] = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._waiters, (priority, next(self._sequence), future))
+        self._schedule()
+        try:
+            await future
+        except asyncio.CancelledError:
+            if future.done() and not future.cancelled():
+                # The slot was granted but will not be used, hand it back.
+                self._tokens = min(self._capacity, self._tokens + 1)
+            raise
+        waited = time.monotonic() - start
+        self._record_wait(priority, waited)
+        return waited
+
+    @callback
+    def async_pause(self, retry_after: float | None) -> None:
+        """Stop granting slots for the period requested by the server."""
+        delay = RATE_LIMIT_DEFAULT_RETRY_AFTER if retry_after is None else retry_after
+        self._blocked_until = max(self._blocked_until, time.monotonic() + delay)
+        # Start refilling from empty once the pause is over
+        self._tokens = 0
+        self._updated = self._blocked_until
+        _LOGGER.debug("Rate limited by SmartThings, pausing requests for %.1fs", delay)
+        if self._wakeup:
+            self._wakeup.cancel()
+            self._wakeup = None
+        self._schedule()
+
+    def _record_wait(self, priority: RequestPriority, waited: float) -> None:
+        stats = self._wait_stats[priority]
+        stats["count"] += 1
+        stats["total"] += waited
+        stats["max"] = max(stats["max"], waited)
+        stats["last"] = waited
+
+    def _refill(self, now: float) -> None:
+        elapsed = now - self._updated
+        self._updated = now
+        self._tokens = min(self._capacity, self._tokens + elapsed * self._refill_rate)
+
+    def _try_take(self, now: float) -> bool:
+        if now < self._blocked_until:
+            return False
+        self._refill(now)
+        if self._tokens < 1:
+            return False
+        self._tokens -= 1
+        return True
+
+    def _schedule(self) -> None:
+        if self._wakeup or not self._waiters:
+            return
+        now = time.monotonic()
+        if now < self._blocked_until:
+            delay = self._blocked_until - now
+        else:
+            self._refill(now)
+            delay = max(0.0, (1 - self._tokens) / self._refill_rate)
+        self._wakeup = asyncio.get_running_loop().call_later(delay, self._release)
+
+    def _release(self) -> None:
+        """Grant slots to queued requests in priority order."""
+        self._wakeup = None
+        now = time.monotonic()
+        while self._waiters:
+            future = self._waiters[0][2]
+            if future.done():
+                heapq.heappop(self._waiters)
+                continue
+            if not self._try_take(now):
+                break
+            heapq.heappop(self._waiters)
+            future.set_result(None)
+        self._schedule()
+
+
+def parse_retry_after(headers: Mapping[str, str] | None) -> float | None:
+    """Return the delay in seconds requested by a Retry-After header."""
+    if not headers or (value := headers.get("Retry-After")) is None:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if retry_at.tzinfo is None:
+        retry_at = retry_at.replace(tzinfo=dt_util.UTC)
+    return max(0.0, (retry_at - dt_util.utcnow()).total_seconds())
@@ -0,0 +1,177 @@
+"""Opt-in recording of webhook payloads for replay and load testing."""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Mapping
+import gzip
+import json
+import logging
+import os
+import time
+from typing import Any
+
+from pysmartthings.device import DeviceEntity
+
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers.event import async_track_time_interval
+
+from .const import (
+    RECORDER_BACKUP_COUNT,
+    RECORDER_FILENAME,
+    RECORDER_FLUSH_INTERVAL,
+    RECORDER_MAX_BYTES,
+    RECORDER_SNAPSHOT_FILENAME,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+# Headers carrying the request signature, or credentials of the caller.
+STRIPPED_HEADERS = {"authorization", "cookie", "digest", "signature"}
+# Payload keys holding tokens issued to the installed app.
+REDACTED_KEYS = {"authToken", "refreshToken"}
+REDACTED = "**REDACTED**"
+
+
+def redact_payload(value: Any) -> Any:
+    """Return a copy of the payload with the tokens redacted."""
+    if isinstance(value, Mapping):
+        return {
+            key: REDACTED if key in REDACTED_KEYS else redact_payload(item)
+            for key, item in value.items()
+        }
+    if isinstance(value, list):
+        return [redact_payload(item) for item in value]
+    return value
+
+
+def snapshot_device(device: DeviceEntity) -> dict[str, Any]:
+    """Return the description and status of a device as API data."""
+    components = {"main": device.capabilities, **device.components}
+    statuses = {"main": device.status, **device.status.components}
+    return {
+        "device": {
+            "deviceId": device.device_id,
+            "name": device.name,
+            "label": device.label,
+            "locationId": device.location_id,
+            "type": device.type,
+            "components": [
+                {
+                    "id": component_id,
+                    "capabilities": [{"id": capability} for capability in capabilities],
+                }
+                for component_id, capabilities in components.items()
+            ],
+        },
+        # Attributes are not tracked per capability, which status data
+        # requires but is ignored when applied.
+        "status": {
+            "components": {
+                component_id: {
+                    "attributes": {
+                        attribute: status._asdict()
+                        for attribute, status in component.attributes.items()
+                    }
+                }
+                for component_id, component in statuses.items()
+            }
+        },
+    }
+
+
+class WebhookRecorder:
+    """Append received webhook payloads to a rotating compressed JSONL file.
+
+    Records are buffered in memory and written from the executor, a
+    snapshot of the devices of every broker is written when recording
+    starts so a recording can be replayed against the same fleet.
+    """
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Create a new recorder."""
+        self._hass = hass
+        self._path = hass.config.path(RECORDER_FILENAME)
+        self._buffer: list[str] = []
+        self._lock = asyncio.Lock()
+        self._stop_flush: CALLBACK_TYPE | None = None
+        self.recorded = 0
+
+    @property
+    def path(self) -> str:
+        """Return the path of the current recording file."""
+        return self._path
+
+    async def async_start(self, brokers: Mapping[str, Any]) -> None:
+        """Write the device snapshot and start flushing records."""
+        snapshot = {
+            "created": time.time(),
+            "entries": [
+                {
+                    "entry_id": entry_id,
+                    "installed_app_id": broker.installed_app_id,
+                    "devices": [
+                        snapshot_device(device) for device in broker.devices.values()
+                    ],
+                }
+                for entry_id, broker in brokers.items()
+            ],
+        }
+        await self._hass.async_add_executor_job(
+            _write_snapshot, self._hass.config.path(RECORDER_SNAPSHOT_FILENAME), snapshot
+        )
+        self._stop_flush = async_track_time_interval(
+            self._hass, self._async_flush, RECORDER_FLUSH_INTERVAL
+        )
+        _LOGGER.info("Recording SmartThings webhook payloads to %s", self._path)
+
+    async def async_stop(self) -> None:
+        """Stop recording and write the remaining records."""
+        if self._stop_flush:
+            self._stop_flush()
+            self._stop_flush = None
+        await self._async_flush()
+        _LOGGER.info(
+            "Stopped recording SmartThings webhook payloads, %s recorded",
+            self.recorded,
+        )
+
+    @callback
+    def async_record(self, payload: dict[str, Any], headers: Mapping[str, str]) -> None:
+        """Buffer a received payload."""
+        record = {
+            "received": time.time(),
+            "headers": {
+                name: value
+                for name, value in headers.items()
+                if name.lower() not in STRIPPED_HEADERS
+            },
+            "payload": redact_payload(payload),
+        }
+        self._buffer.append(json.dumps(record, separators=(",", ":")))
+        self.recorded += 1
+
+    async def _async_flush(self, _now: Any = None) -> None:
+        async with self._lock:
+            if not self._buffer:
+                return
+            lines, self._buffer = self._buffer, []
+            await self._hass.async_add_executor_job(_append_lines, self._path, lines)
+
+
+def _write_snapshot(path: str, snapshot: dict[str, Any]) -> None:
+    """Write the device snapshot."""
+    with open(path, "w", encoding="utf-8") as file:
+        json.dump(snapshot, file)
+
+
+def _append_lines(path: str, lines: list[str]) -> None:
+    """Append lines to the recording, rotating it when full."""
+    if os.path.exists(path) and os.path.getsize(path) >= RECORDER_MAX_BYTES:
+        for index in range(RECORDER_BACKUP_COUNT - 1, 0, -1):
+            if os.path.exists(source := f"{path}.{index}"):
+                os.replace(source, f"{path}.{index + 1}")
+        os.replace(path, f"{path}.1")
+    # Each append adds a gzip member, readers decompress them as one stream.
+    with gzip.open(path, "at", encoding="utf-8") as file:
+        file.write("\n".join(lines) + "\n")
@@ -0,0 +1,277 @@
+"""Circuit breakers and retry policy for SmartThings API requests."""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Awaitable, Callable
+from enum import StrEnum
+from http import HTTPStatus
+import logging
+import random
+import time
+from typing import Any, TypeVar
+
+from aiohttp import ClientConnectionError, ClientResponseError
+
+from homeassistant.core import CALLBACK_TYPE, callback
+from homeassistant.exceptions import HomeAssistantError
+
+from .const import (
+    API_BACKOFF_BASE,
+    API_BACKOFF_MAX,
+    CIRCUIT_FAILURE_THRESHOLD,
+    CIRCUIT_RESET_TIMEOUT,
+    VAL_UID_MATCHER,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+_T = TypeVar("_T")
+
+# Rate limiting is handled by the rate limiter and does not trip breakers.
+TRANSIENT_STATUSES = {
+    HTTPStatus.INTERNAL_SERVER_ERROR,
+    HTTPStatus.BAD_GATEWAY,
+    HTTPStatus.SERVICE_UNAVAILABLE,
+    HTTPStatus.GATEWAY_TIMEOUT,
+}
+
+
+class CircuitState(StrEnum):
+    """State of a circuit breaker."""
+
+    CLOSED = "closed"
+    HALF_OPEN = "half_open"
+    OPEN = "open"
+
+
+# Raised from entity service calls as well as during setup, where connection
+# errors are already handled as a reason to retry the setup later.
+class CircuitOpenError(HomeAssistantError, ClientConnectionError):
+    """Error raised when a request is rejected by an open circuit breaker."""
+
+    def __init__(self, endpoint: str, retry_in: float) -> None:
+        """Initialize the error."""
+        super().__init__(
+            f"SmartThings API endpoint '{endpoint}' is unavailable, "
+            f"retrying in {retry_in:.0f}s"
+        )
+        self.endpoint = endpoint
+        self.retry_in = retry_in
+
+
+def is_transient(ex: BaseException) -> bool:
+    """Return True if the error indicates the service is degraded."""
+    if isinstance(ex, CircuitOpenError):
+        return False
+    if isinstance(ex, ClientResponseError):
+        return ex.status in TRANSIENT_STATUSES
+    return isinstance(ex, (ClientConnectionError, TimeoutError))
+
+
+def is_retryable(ex: BaseException, idempotent: bool) -> bool:
+    """Return True if the request may be sent again after the error."""
+    if isinstance(ex, ClientResponseError) and (
+        ex.status == HTTPStatus.TOO_MANY_REQUESTS
+    ):
+        # Rejected before being processed, safe to send again.
+        return True
+    return idempotent and is_transient(ex)
+
+
+def backoff_delay(attempt: int) -> float:
+    """Return the jittered delay before the given retry attempt."""
+    return random.uniform(0, min(API_BACKOFF_MAX, API_BACKOFF_BASE * 2**attempt))
+
+
+def endpoint_name(method: str, resource: str) -> str:
+    """Return the endpoint of a request with ids replaced by placeholders."""
+    path = resource.split("?", 1)[0]
+    segments = [
+        "{id}" if VAL_UID_MATCHER.match(segment) else segment
+        for segment in path.strip("/").split("/")
+    ]
+    return f"{method.upper()} {'/'.join(segments)}"
+
+
+async def async_hedged(
+    factory: Callable[[], Awaitable[_T]], delay: float, allowed: Callable[[], bool]
+) -> _T:
+    """Await the factory and start a second attempt if the first is slow.
+
+    The result of whichever attempt finishes first successfully is returned
+    and the other is cancelled. The hedge is only started when allowed()
+    returns True at that time, so it never competes with queued requests.
+    """
+    primary = asyncio.ensure_future(factory())
+    done, _ = await asyncio.wait({primary}, timeout=delay)
+    if done or not allowed():
+        return await primary
+
+    hedge = asyncio.ensure_future(factory())
+    pending = {primary, hedge}
+    error: BaseException | None = None
+    try:
+        while pending:
+            done, pending = await asyncio.wait(
+                pending, return_when=asyncio.FIRST_COMPLETED
+            )
+            for task in done:
+                if task.exception() is None:
+                    return task.result()
+                error = task.exception()
+        assert error is not None
+        raise error
+    finally:
+        for task in pending:
+            task.cancel()
+
+
+class CircuitBreaker:
+    """Track failures of one API endpoint and reject requests when open."""
+
+    def __init__(
+        self,
+        endpoint: str,
+        on_change: Callable[[], None],
+        failure_threshold: int = CIRCUIT_FAILURE_THRESHOLD,
+        reset_timeout: float = CIRCUIT_RESET_TIMEOUT,
+    ) -> None:
+        """Create a new circuit breaker."""
+        self.endpoint = endpoint
+        self._on_change = on_change
+        self._failure_threshold = failure_threshold
+        self._reset_timeout = reset_timeout
+        self._state = CircuitState.CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._trial_in_flight = False
+        self.total_failures = 0
+        self.rejected = 0
+
+    @property
+    def state(self) -> CircuitState:
+        """Return the state of the breaker."""
+        if (
+            self._state is CircuitState.OPEN
+            and time.monotonic() - self._opened_at >= self._reset_timeout
+        ):
+            return CircuitState.HALF_OPEN
+        return self._state
+
+    def before_request(self) -> None:
+        """Raise CircuitOpenError if the request must not be sent."""
+        state = self.state
+        if state is CircuitState.CLOSED:
+            return
+        if state is CircuitState.HALF_OPEN and not self._trial_in_flight:
+            # Let a single trial request through to probe the endpoint.
+            self._trial_in_flight = True
+            self._set_state(CircuitState.HALF_OPEN)
+            return
+        self.rejected += 1
+        raise CircuitOpenError(
+            self.endpoint,
+            max(0.0, self._opened_at + self._reset_timeout - time.monotonic()),
+        )
+
+    def record_success(self) -> None:
+        """Record a request that reached a healthy endpoint."""
+        self._failures = 0
+        self._trial_in_flight = False
+        if self._state is not CircuitState.CLOSED:
+            _LOGGER.info("SmartThings API endpoint '%s' recovered", self.endpoint)
+            self._set_state(CircuitState.CLOSED)
+
+    def record_failure(self) -> None:
+        """Record a request that failed because the endpoint is degraded."""
+        self._failures += 1
+        self.total_failures += 1
+        if self._trial_in_flight or self._failures >= self._failure_threshold:
+            self._trial_in_flight = False
+            self._opened_at = time.monotonic()
+            if self._state is not CircuitState.OPEN:
+                _LOGGER.warning(
+                    "SmartThings API endpoint '%s' is failing, pausing requests"
+                    " for %ss",
+                    self.endpoint,
+                    self._reset_timeout,
+                )
+            self._set_state(CircuitState.OPEN)
+
+    def record_cancelled(self) -> None:
+        """Record a request that was abandoned before it completed."""
+        self._trial_in_flight = False
+
+    def record_neutral(self) -> None:
+        """Record a request rejected for reasons other than endpoint health.
+
+        Client errors tell nothing about the endpoint, so they neither reset
+        the failures nor close the breaker. A trial request is released for
+        another to probe the endpoint.
+        """
+        self._trial_in_flight = False
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the state of the breaker."""
+        return {
+            "state": self.state,
+            "consecutive_failures": self._failures,
+            "total_failures": self.total_failures,
+            "rejected": self.rejected,
+        }
+
+    def _set_state(self, state: CircuitState) -> None:
+        changed = state is not self._state
+        self._state = state
+        if changed:
+            self._on_change()
+
+
+class CircuitBreakers:
+    """Circuit breakers of all endpoints used with an access token."""
+
+    def __init__(self) -> None:
+        """Create the registry."""
+        self._breakers: dict[str, CircuitBreaker] = {}
+        self._listeners: list[CALLBACK_TYPE] = []
+
+    def get(self, endpoint: str) -> CircuitBreaker:
+        """Return the breaker of the endpoint."""
+        if (breaker := self._breakers.get(endpoint)) is None:
+            breaker = self._breakers[endpoint] = CircuitBreaker(
+                endpoint, self._async_notify
+            )
+        return breaker
+
+    @property
+    def state(self) -> CircuitState:
+        """Return the worst state across all endpoints."""
+        states = {breaker.state for breaker in self._breakers.values()}
+        for state in (CircuitState.OPEN, CircuitState.HALF_OPEN):
+            if state in states:
+                return state
+        return CircuitState.CLOSED
+
+    def as_dict(self) -> dict[str, dict[str, Any]]:
+        """Return the state of every breaker."""
+        return {
+            endpoint: breaker.as_dict()
+            for endpoint, breaker in self._breakers.items()
+        }
+
+    @callback
+    def async_add_listener(self, update_callback: CALLBACK_TYPE) -> CALLBACK_TYPE:
+        """Listen for state changes of any breaker."""
+        self._listeners.append(update_callback)
+
+        @callback
+        def remove_listener() -> None:
+            self._listeners.remove(update_callback)
+
+        return remove_listener
+
+    @callback
+    def _async_notify(self) -> None:
+        for update_callback in list(self._listeners):
+            update_callback()
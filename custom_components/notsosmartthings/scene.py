@@ -1,13 +1,29 @@
 """Support for scenes through the SmartThings cloud API."""
 
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Iterable
+import time
 from typing import Any
 
+from pysmartthings import SceneEntity
+
 from homeassistant.components.scene import Scene
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.exceptions import HomeAssistantError
+from homeassistant.helpers.dispatcher import async_dispatcher_connect
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 
-from .const import DATA_BROKERS, DOMAIN
+from .const import (
+    DATA_BROKERS,
+    DOMAIN,
+    SCENE_ACTIVATE_TIMEOUT,
+    SIGNAL_SMARTTHINGS_SCENES_ADDED,
+    SIGNAL_SMARTTHINGS_SCENES_UPDATED,
+)
+from .metrics import METRIC_SCENE_ACTIVATION, Metrics, async_get_metrics
 
 
 async def async_setup_entry(
@@ -15,23 +31,73 @@ async def async_setup_entry(
     config_entry: ConfigEntry,
     async_add_entities: AddEntitiesCallback,
 ) -> None:
-    """Add switches for a config entry."""
+    """Add scenes for a config entry."""
     broker = hass.data[DOMAIN][DATA_BROKERS][config_entry.entry_id]
-    async_add_entities(SmartThingsScene(scene) for scene in broker.scenes.values())
+    metrics = async_get_metrics(hass)
+
+    @callback
+    def async_add_scenes(scenes: Iterable[SceneEntity]) -> None:
+        async_add_entities(
+            SmartThingsScene(config_entry, metrics, scene) for scene in scenes
+        )
+
+    async_add_scenes(broker.scenes.values())
+    config_entry.async_on_unload(
+        async_dispatcher_connect(
+            hass,
+            SIGNAL_SMARTTHINGS_SCENES_ADDED.format(config_entry.entry_id),
+            async_add_scenes,
+        )
+    )
 
 
 class SmartThingsScene(Scene):
     """Define a SmartThings scene."""
 
-    def __init__(self, scene):
+    def __init__(
+        self, entry: ConfigEntry, metrics: Metrics, scene: SceneEntity
+    ) -> None:
         """Init the scene class."""
+        self._entry_id = entry.entry_id
+        self._metrics = metrics
         self._scene = scene
         self._attr_name = scene.name
         self._attr_unique_id = scene.scene_id
 
+    async def async_added_to_hass(self) -> None:
+        """Subscribe to changes of the scene in SmartThings."""
+        self.async_on_remove(
+            async_dispatcher_connect(
+                self.hass,
+                SIGNAL_SMARTTHINGS_SCENES_UPDATED.format(self._entry_id),
+                self._async_scenes_updated,
+            )
+        )
+
+    @callback
+    def _async_scenes_updated(self, scene_ids: set[str]) -> None:
+        """Update the name and attributes when the scene changed."""
+        if self._scene.scene_id in scene_ids:
+            self._attr_name = self._scene.name
+            self.async_write_ha_state()
+
     async def async_activate(self, **kwargs: Any) -> None:
         """Activate scene."""
-        await self._scene.execute()
+        start = time.perf_counter()
+        try:
+            async with asyncio.timeout(SCENE_ACTIVATE_TIMEOUT):
+                await self._scene.execute()
+        except TimeoutError as ex:
+            raise HomeAssistantError(
+                f"Timed out activating scene {self._scene.name}"
+            ) from ex
+        finally:
+            if self._metrics.enabled:
+                self._metrics.observe(
+                    METRIC_SCENE_ACTIVATION,
+                    time.perf_counter() - start,
+                    self._entry_id,
+                )
 
     @property
     def extra_state_attributes(self):
@@ -0,0 +1,157 @@
+"""Cached catalog of the scenes of a SmartThings location."""
+
+from __future__ import annotations
+
+from datetime import datetime
+from http import HTTPStatus
+import logging
+from typing import Any
+
+from aiohttp import ClientConnectionError, ClientResponseError
+from pysmartthings import SceneEntity
+
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import Platform
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers import entity_registry as er
+from homeassistant.helpers.dispatcher import async_dispatcher_send
+from homeassistant.helpers.event import async_track_time_interval
+from homeassistant.helpers.storage import Store
+
+from .api import SmartThingsClient
+from .const import (
+    CONF_LOCATION_ID,
+    DOMAIN,
+    SCENE_REFRESH_INTERVAL,
+    SIGNAL_SMARTTHINGS_SCENES_ADDED,
+    SIGNAL_SMARTTHINGS_SCENES_UPDATED,
+    STORAGE_VERSION,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+
+def scene_data(scene: SceneEntity) -> dict[str, Any]:
+    """Return the API data of a scene."""
+    return {
+        "sceneId": scene.scene_id,
+        "sceneName": scene.name,
+        "sceneIcon": scene.icon,
+        "sceneColor": scene.color,
+        "locationId": scene.location_id,
+    }
+
+
+class SceneCatalog:
+    """Scenes of the location of a config entry, cached between restarts.
+
+    Setup uses the cached scenes when there are any and refreshes them in
+    the background. Every refresh compares the scenes with the cached ones
+    and only adds, removes or updates the entities of those that changed.
+    """
+
+    def __init__(
+        self, hass: HomeAssistant, entry: ConfigEntry, api: SmartThingsClient
+    ) -> None:
+        """Create a new catalog."""
+        self._hass = hass
+        self._entry = entry
+        self._api = api
+        self._store = Store[list[dict[str, Any]]](
+            hass, STORAGE_VERSION, f"{DOMAIN}.scenes.{entry.entry_id}"
+        )
+        self.scenes: dict[str, SceneEntity] = {}
+        self._cached = False
+
+    async def async_load(self) -> bool:
+        """Load the cached scenes and return whether there were any."""
+        if (cached := await self._store.async_load()) is None:
+            return False
+        self.scenes = {
+            data["sceneId"]: self._api.scene_entity(data) for data in cached
+        }
+        self._cached = True
+        return True
+
+    async def async_refresh(self) -> None:
+        """Fetch the scenes and apply the differences with the catalog."""
+        try:
+            scenes = await self._api.scenes(
+                location_id=self._entry.data[CONF_LOCATION_ID]
+            )
+        except ClientResponseError as ex:
+            if ex.status != HTTPStatus.FORBIDDEN:
+                raise
+            _LOGGER.exception(
+                (
+                    "Unable to load scenes for configuration entry '%s' because the"
+                    " access token does not have the required access"
+                ),
+                self._entry.title,
+            )
+            scenes = []
+
+        current = {scene.scene_id: scene for scene in scenes}
+        removed = [scene_id for scene_id in self.scenes if scene_id not in current]
+        added = []
+        updated = set()
+        for scene_id, scene in current.items():
+            if (existing := self.scenes.get(scene_id)) is None:
+                self.scenes[scene_id] = scene
+                added.append(scene)
+            elif (data := scene_data(scene)) != scene_data(existing):
+                existing.apply_data(data)
+                updated.add(scene_id)
+        if not (added or removed or updated) and self._cached:
+            return
+
+        entity_registry = er.async_get(self._hass)
+        for scene_id in removed:
+            del self.scenes[scene_id]
+            if entity_id := entity_registry.async_get_entity_id(
+                Platform.SCENE, DOMAIN, scene_id
+            ):
+                entity_registry.async_remove(entity_id)
+        if added:
+            async_dispatcher_send(
+                self._hass,
+                SIGNAL_SMARTTHINGS_SCENES_ADDED.format(self._entry.entry_id),
+                added,
+            )
+        if updated:
+            async_dispatcher_send(
+                self._hass,
+                SIGNAL_SMARTTHINGS_SCENES_UPDATED.format(self._entry.entry_id),
+                updated,
+            )
+        _LOGGER.debug(
+            "Refreshed scenes of '%s': %s added, %s removed, %s updated",
+            self._entry.title,
+            len(added),
+            len(removed),
+            len(updated),
+        )
+        await self._store.async_save(
+            [scene_data(scene) for scene in self.scenes.values()]
+        )
+        self._cached = True
+
+    async def async_update(self, now: datetime | None = None) -> None:
+        """Refresh the scenes, keeping the catalog when the API fails."""
+        try:
+            await self.async_refresh()
+        except (ClientResponseError, ClientConnectionError) as ex:
+            _LOGGER.debug(
+                "Unable to refresh the scenes of '%s': %s", self._entry.title, ex
+            )
+
+    @callback
+    def async_start(self) -> CALLBACK_TYPE:
+        """Refresh the scenes periodically and return a callback to stop."""
+        return async_track_time_interval(
+            self._hass, self.async_update, SCENE_REFRESH_INTERVAL
+        )
+
+    async def async_remove(self) -> None:
+        """Remove the cached scenes."""
+        await self._store.async_remove()
@@ -1,9 +1,10 @@
 """Support for sensors through the SmartThings cloud API."""
 from __future__ import annotations
 
-from collections.abc import Sequence
+from collections.abc import Iterable, Sequence
 from typing import NamedTuple
 import logging 
+import time
 
 from pysmartthings import Attribute, Capability
 
@@ -15,6 +16,7 @@ from homeassistant.components.sensor import (
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import (
     CONCENTRATION_PARTS_PER_MILLION,
+    CONF_ACCESS_TOKEN,
     LIGHT_LUX,
     PERCENTAGE,
     EntityCategory,
@@ -25,14 +27,32 @@ from homeassistant.const import (
     UnitOfMass,
     UnitOfPower,
     UnitOfTemperature,
+    UnitOfTime,
     UnitOfVolume,
 )
-from homeassistant.core import HomeAssistant
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
+from homeassistant.helpers.event import async_call_later
 from homeassistant.util import dt as dt_util
 
+from .api import async_get_account
 from .const import DATA_BROKERS, DOMAIN
-from .entity import SmartThingsEntity
+from .entity import SmartThingsDiagnosticEntity, SmartThingsEntity
+from .metrics import (
+    METRIC_API_LATENCY,
+    METRIC_API_QUEUE_DEPTH,
+    METRIC_API_RATE_LIMIT_WAIT,
+    METRIC_API_RATE_LIMITED,
+    METRIC_SCENE_ACTIVATION,
+    METRIC_DISPATCH_FAN_OUT,
+    METRIC_EVENT_HANDLER,
+    METRIC_WEBHOOK_HANDLE,
+    METRIC_WEBHOOK_READ,
+    Metrics,
+    async_get_metrics,
+)
+from .resilience import CircuitBreakers, CircuitState
+from .throttle import Deadband, Throttle
 from .utils import format_component_name, get_device_components, get_device_status
 from .device import DeviceEntity
 
@@ -47,6 +67,8 @@ class Map(NamedTuple):
     device_class: SensorDeviceClass | None
     state_class: SensorStateClass | None
     entity_category: EntityCategory | None
+    precision: int | None = None
+    deadband: Deadband | None = None
 
 
 CAPABILITY_TO_SENSORS: dict[str, list[Map]] = {
@@ -335,6 +357,8 @@ CAPABILITY_TO_SENSORS: dict[str, list[Map]] = {
             SensorDeviceClass.POWER,
             SensorStateClass.MEASUREMENT,
             None,
+            precision=1,
+            deadband=Deadband(absolute=1.0, relative=0.02),
         )
     ],
     Capability.power_source: [
@@ -521,6 +545,8 @@ CAPABILITY_TO_SENSORS: dict[str, list[Map]] = {
             SensorDeviceClass.VOLTAGE,
             SensorStateClass.MEASUREMENT,
             None,
+            precision=1,
+            deadband=Deadband(absolute=0.5),
         )
     ],
     Capability.washer_mode: [
@@ -563,6 +589,85 @@ POWER_CONSUMPTION_REPORT_NAMES = [
 ]
 
 
+class MetricMap(NamedTuple):
+    """Tuple for mapping performance metrics to diagnostic sensors."""
+
+    metric: str
+    name: str
+    unit: str | None
+    state_class: SensorStateClass
+    per_entry: bool
+
+
+# Histograms report their 95th percentile, counters their total. Metrics
+# recorded per config entry only report the values of their own entry.
+METRIC_SENSORS = [
+    MetricMap(
+        METRIC_WEBHOOK_READ,
+        "Webhook Read Time",
+        UnitOfTime.MILLISECONDS,
+        SensorStateClass.MEASUREMENT,
+        False,
+    ),
+    MetricMap(
+        METRIC_WEBHOOK_HANDLE,
+        "Webhook Handle Time",
+        UnitOfTime.MILLISECONDS,
+        SensorStateClass.MEASUREMENT,
+        False,
+    ),
+    MetricMap(
+        METRIC_EVENT_HANDLER,
+        "Event Handler Time",
+        UnitOfTime.MILLISECONDS,
+        SensorStateClass.MEASUREMENT,
+        True,
+    ),
+    MetricMap(
+        METRIC_DISPATCH_FAN_OUT,
+        "Dispatch Fan-out",
+        None,
+        SensorStateClass.MEASUREMENT,
+        True,
+    ),
+    MetricMap(
+        METRIC_API_LATENCY,
+        "API Latency",
+        UnitOfTime.MILLISECONDS,
+        SensorStateClass.MEASUREMENT,
+        False,
+    ),
+    MetricMap(
+        METRIC_API_QUEUE_DEPTH,
+        "API Queue Depth",
+        None,
+        SensorStateClass.MEASUREMENT,
+        False,
+    ),
+    MetricMap(
+        METRIC_API_RATE_LIMIT_WAIT,
+        "API Rate Limit Wait",
+        UnitOfTime.MILLISECONDS,
+        SensorStateClass.MEASUREMENT,
+        False,
+    ),
+    MetricMap(
+        METRIC_API_RATE_LIMITED,
+        "API Rate Limited Requests",
+        None,
+        SensorStateClass.TOTAL_INCREASING,
+        False,
+    ),
+    MetricMap(
+        METRIC_SCENE_ACTIVATION,
+        "Scene Activation Latency",
+        UnitOfTime.MILLISECONDS,
+        SensorStateClass.MEASUREMENT,
+        True,
+    ),
+]
+
+
 async def async_setup_entry(
     hass: HomeAssistant,
     config_entry: ConfigEntry,
@@ -570,22 +675,42 @@ async def async_setup_entry(
 ) -> None:
     """Add sensors for a config entry."""
     broker = hass.data[DOMAIN][DATA_BROKERS][config_entry.entry_id]
-    entities: list[SensorEntity] = []
 
-    for device in broker.devices.values():
-        _LOGGER.debug(f"Adding sensors for device: {device.label}")
-        device_components = get_device_components(device)
-        for component_id in list(device_components.keys()):
-            _LOGGER.debug(f"Adding sensors of component_id: {component_id}")
-            attributes = device_components[component_id]["attributes"]
-            disabled_capabilities = device_components[component_id]["disabled_capabilities"]
-            entities.extend(
-                _get_device_sensor_entities(broker, device, component_id, attributes, disabled_capabilities)
-            )
-            entities.extend(
-                _get_device_switch_entities(broker, device, component_id, attributes)
-            ) 
-    async_add_entities(entities)
+    @callback
+    def async_add_devices(devices: Iterable[DeviceEntity]) -> None:
+        entities: list[SensorEntity] = []
+
+        for device in devices:
+            _LOGGER.debug(f"Adding sensors for device: {device.label}")
+            device_components = get_device_components(device)
+            for component_id in list(device_components.keys()):
+                _LOGGER.debug(f"Adding sensors of component_id: {component_id}")
+                attributes = device_components[component_id]["attributes"]
+                disabled_capabilities = device_components[component_id]["disabled_capabilities"]
+                entities.extend(
+                    _get_device_sensor_entities(broker, device, component_id, attributes, disabled_capabilities)
+                )
+                entities.extend(
+                    _get_device_switch_entities(broker, device, component_id, attributes)
+                ) 
+        async_add_entities(entities)
+
+    async_add_devices(broker.devices.values())
+    config_entry.async_on_unload(broker.async_listen_devices_added(async_add_devices))
+
+    metrics = async_get_metrics(hass)
+    async_add_entities(
+        [
+            SmartThingsCircuitBreakerSensor(
+                config_entry,
+                async_get_account(hass, config_entry.data[CONF_ACCESS_TOKEN]).breakers,
+            ),
+            *(
+                SmartThingsMetricSensor(config_entry, metrics, metric_map)
+                for metric_map in METRIC_SENSORS
+            ),
+        ]
+    )
 
 def _get_device_sensor_entities(
     broker, device, component_id: str | None, component_attributes: list[str] | None, disabled_capabilities: list[str] | None
@@ -612,7 +737,14 @@ def _get_device_sensor_entities(
                 _LOGGER.debug(f"adding power consumption sensor")
                 entities.extend(
                     [
-                        SmartThingsPowerConsumptionSensor(device, report_name, component_id)
+                        SmartThingsPowerConsumptionSensor(
+                            device,
+                            report_name,
+                            component_id,
+                            broker.throttle.create(
+                                capability, Attribute.power_consumption
+                            ),
+                        )
                         for report_name in POWER_CONSUMPTION_REPORT_NAMES
                     ]
                 )
@@ -640,6 +772,8 @@ def _get_device_sensor_entities(
                     m.state_class,
                     m.entity_category,
                     component_id,
+                    m.precision,
+                    broker.throttle.create(capability, m.attribute, m.deadband),
                 )
 
                 entities.append(entity)
@@ -665,6 +799,8 @@ def _get_device_switch_entities(
                         m.state_class,
                         m.entity_category,
                         component_id,
+                        m.precision,
+                        broker.throttle.create(capability, m.attribute, m.deadband),
                     )
                     for m in maps
                     if component_attributes is None
@@ -681,7 +817,113 @@ def get_capabilities(capabilities: Sequence[str]) -> Sequence[str] | None:
     ]
 
 
-class SmartThingsSensor(SmartThingsEntity, SensorEntity):
+class SmartThingsThrottledSensor(SmartThingsEntity, SensorEntity):
+    """Define a SmartThings sensor whose state writes may be throttled.
+
+    The value is taken at display precision and a change within the
+    deadband is held until the max staleness passed. Changes are written
+    no more often than the min interval, the latest one once it passed.
+    """
+
+    def __init__(self, device: DeviceEntity, throttle: Throttle | None) -> None:
+        """Init the class."""
+        super().__init__(device)
+        self._throttle = throttle
+        self._cancel_write: CALLBACK_TYPE | None = None
+        self._write_due = 0.0
+
+    @callback
+    def _async_state_fingerprint(self) -> tuple:
+        """Return the value as written, which may be held by the deadband."""
+        return (
+            self.available,
+            self._throttled_value(self.native_value),
+            self.native_unit_of_measurement,
+            self.extra_state_attributes,
+        )
+
+    def _throttled_value(self, value):
+        if not isinstance(value, (int, float)) or isinstance(value, bool):
+            return value
+        if (precision := self.suggested_display_precision) is not None:
+            value = round(value, precision)
+        if (throttle := self._throttle) is None or throttle.forced:
+            return value
+        if (
+            throttle.rule.deadband is not None
+            and self._state_fingerprint is not None
+            and isinstance(previous := self._state_fingerprint[1], (int, float))
+            and value != previous
+            and throttle.rule.deadband.contains(previous, value)
+        ):
+            throttle.held = True
+            return previous
+        return value
+
+    @callback
+    def _async_handle_device_update(self) -> None:
+        """Write the state if it changed and the throttle allows it."""
+        if (throttle := self._throttle) is None:
+            super()._async_handle_device_update()
+            return
+        self._async_update_attrs()
+        throttle.held = False
+        if self._async_state_fingerprint() == self._state_fingerprint:
+            if throttle.held:
+                throttle.saved["deadband"] += 1
+                if throttle.rule.max_staleness:
+                    self._async_schedule_write(
+                        throttle.last_write + throttle.rule.max_staleness
+                    )
+            return
+        if (due := throttle.last_write + throttle.rule.min_interval) > time.monotonic():
+            throttle.saved["min_interval"] += 1
+            self._async_schedule_write(due)
+            return
+        self.async_write_ha_state()
+
+    @callback
+    def async_write_ha_state(self) -> None:
+        """Write the state and restart the throttle interval."""
+        if self._throttle is not None:
+            self._throttle.last_write = time.monotonic()
+            self._async_cancel_write()
+        super().async_write_ha_state()
+
+    @callback
+    def _async_schedule_write(self, due: float) -> None:
+        """Write the latest state when due, unless a write is due earlier."""
+        if self._cancel_write is not None:
+            if self._write_due <= due:
+                return
+            self._cancel_write()
+        self._write_due = due
+        self._cancel_write = async_call_later(
+            self.hass, max(0.0, due - time.monotonic()), self._async_write_held
+        )
+
+    @callback
+    def _async_write_held(self, _now) -> None:
+        self._cancel_write = None
+        self._throttle.forced = True
+        try:
+            self.async_write_ha_state()
+        finally:
+            self._throttle.forced = False
+
+    @callback
+    def _async_cancel_write(self) -> None:
+        if self._cancel_write is not None:
+            self._cancel_write()
+            self._cancel_write = None
+
+    async def async_will_remove_from_hass(self) -> None:
+        """Cancel the pending write when removed."""
+        self._async_cancel_write()
+        await super().async_will_remove_from_hass()
+
+
+class SmartThingsSensor(SmartThingsThrottledSensor):
     """Define a SmartThings Sensor."""
 
     def __init__(
@@ -694,9 +936,11 @@ class SmartThingsSensor(SmartThingsEntity, SensorEntity):
         state_class: str | None,
         entity_category: EntityCategory | None,
         component_id: str | None,
+        precision: int | None = None,
+        throttle: Throttle | None = None,
     ) -> None:
         """Init the class."""
-        super().__init__(device)
+        super().__init__(device, throttle)
         self._component_id = component_id
         self._attribute = attribute
 
@@ -708,6 +952,7 @@ class SmartThingsSensor(SmartThingsEntity, SensorEntity):
         self._default_unit = default_unit
         self._attr_state_class = state_class
         self._attr_entity_category = entity_category
+        self._attr_suggested_display_precision = precision
 
     @property
     def native_value(self):
@@ -756,14 +1001,18 @@ class SmartThingsThreeAxisSensor(SmartThingsEntity, SensorEntity):
             return None
 
 
-class SmartThingsPowerConsumptionSensor(SmartThingsEntity, SensorEntity):
+class SmartThingsPowerConsumptionSensor(SmartThingsThrottledSensor):
     """Define a SmartThings Sensor."""
 
     def __init__(
-        self, device: DeviceEntity, report_name: str, component_id: str | None
+        self,
+        device: DeviceEntity,
+        report_name: str,
+        component_id: str | None,
+        throttle: Throttle | None = None,
     ) -> None:
         """Init the class."""
-        super().__init__(device)
+        super().__init__(device, throttle)
         self.report_name = report_name
         self._component_id = component_id
 
@@ -817,3 +1066,91 @@ class SmartThingsPowerConsumptionSensor(SmartThingsEntity, SensorEntity):
                         state_attributes[attribute] = value
                 return state_attributes
         return None
+
+
+class SmartThingsCircuitBreakerSensor(SmartThingsDiagnosticEntity, SensorEntity):
+    """Define a sensor reporting the state of the API circuit breakers."""
+
+    _attr_device_class = SensorDeviceClass.ENUM
+    _attr_options = [state.value for state in CircuitState]
+
+    def __init__(self, entry: ConfigEntry, breakers: CircuitBreakers) -> None:
+        """Init the class."""
+        super().__init__(entry, "api_circuit_breaker", "API Circuit Breaker")
+        self._breakers = breakers
+
+    async def async_added_to_hass(self) -> None:
+        """Listen for circuit breaker state changes."""
+        self.async_on_remove(
+            self._breakers.async_add_listener(self.async_write_ha_state)
+        )
+
+    @property
+    def native_value(self) -> str:
+        """Return the worst state across all endpoints."""
+        return self._breakers.state.value
+
+    @property
+    def extra_state_attributes(self) -> dict[str, str]:
+        """Return the endpoints that are not closed."""
+        return {
+            endpoint: info["state"].value
+            for endpoint, info in self._breakers.as_dict().items()
+            if info["state"] is not CircuitState.CLOSED
+        }
+
+
+class SmartThingsMetricSensor(SmartThingsDiagnosticEntity, SensorEntity):
+    """Define a sensor reporting a performance metric of the integration.
+
+    The sensors are disabled by default and metrics are only recorded while
+    at least one of them is enabled.
+    """
+
+    _attr_entity_registry_enabled_default = False
+    _attr_should_poll = True
+
+    def __init__(
+        self, entry: ConfigEntry, metrics: Metrics, metric_map: MetricMap
+    ) -> None:
+        """Init the class."""
+        super().__init__(entry, metric_map.metric, metric_map.name)
+        self._metrics = metrics
+        self._metric_map = metric_map
+        self._label = entry.entry_id if metric_map.per_entry else None
+        self._scale = 1000 if metric_map.unit == UnitOfTime.MILLISECONDS else 1
+        self._attr_native_unit_of_measurement = metric_map.unit
+        self._attr_state_class = metric_map.state_class
+        if metric_map.unit == UnitOfTime.MILLISECONDS:
+            self._attr_device_class = SensorDeviceClass.DURATION
+            self._attr_suggested_display_precision = 1
+
+    async def async_added_to_hass(self) -> None:
+        """Start recording metrics."""
+        self.async_on_remove(self._metrics.async_enable())
+
+    async def async_update(self) -> None:
+        """Summarize the recorded values."""
+        metric = self._metric_map.metric
+        if self._metric_map.state_class is SensorStateClass.TOTAL_INCREASING:
+            self._attr_native_value = self._metrics.counter(metric, self._label)
+            return
+
+        histogram = self._metrics.histogram(metric, self._label)
+        if histogram is None:
+            self._attr_native_value = None
+            self._attr_extra_state_attributes = None
+            return
+        attributes = {
+            key: value * self._scale if value is not None and key != "count" else value
+            for key, value in histogram.as_dict().items()
+        }
+        if not self._metric_map.per_entry and None not in (
+            labelled := self._metrics.histograms(metric)
+        ):
+            attributes["p95_by_label"] = {
+                label: labelled_histogram.percentile(95) * self._scale
+                for label, labelled_histogram in labelled.items()
+            }
+        self._attr_native_value = attributes["p95"]
+        self._attr_extra_state_attributes = attributes
@@ -0,0 +1,92 @@
+"""Services of the SmartThings integration."""
+
+from __future__ import annotations
+
+import voluptuous as vol
+
+from homeassistant.core import (
+    HomeAssistant,
+    ServiceCall,
+    ServiceResponse,
+    SupportsResponse,
+    callback,
+)
+from homeassistant.exceptions import HomeAssistantError
+import homeassistant.helpers.config_validation as cv
+
+from .const import (
+    DATA_BROKERS,
+    DATA_RECORDER,
+    DOMAIN,
+    PROFILE_DEFAULT_DURATION,
+    PROFILE_MAX_DURATION,
+)
+from .profiler import EventLoopProfiler
+from .recorder import WebhookRecorder
+
+ATTR_DURATION = "duration"
+
+SERVICE_START_PROFILE = "start_profile"
+SERVICE_STOP_PROFILE = "stop_profile"
+SERVICE_START_RECORDING = "start_recording"
+SERVICE_STOP_RECORDING = "stop_recording"
+
+START_PROFILE_SCHEMA = vol.Schema(
+    {
+        vol.Optional(ATTR_DURATION, default=PROFILE_DEFAULT_DURATION): vol.All(
+            cv.positive_float, vol.Range(max=PROFILE_MAX_DURATION)
+        )
+    }
+)
+
+
+@callback
+def async_setup_services(hass: HomeAssistant) -> None:
+    """Register the services of the integration."""
+    profiler = EventLoopProfiler(hass)
+
+    async def start_profile(call: ServiceCall) -> None:
+        """Start profiling the event loop."""
+        profiler.async_start(call.data[ATTR_DURATION])
+
+    async def stop_profile(call: ServiceCall) -> ServiceResponse:
+        """Stop profiling and write the stats file."""
+        path = await profiler.async_stop()
+        return {"filename": path} if call.return_response else None
+
+    async def start_recording(call: ServiceCall) -> None:
+        """Start recording received webhook payloads."""
+        data = hass.data[DOMAIN]
+        if data[DATA_RECORDER] is not None:
+            raise HomeAssistantError("SmartThings webhooks are already being recorded")
+        recorder = WebhookRecorder(hass)
+        await recorder.async_start(data[DATA_BROKERS])
+        data[DATA_RECORDER] = recorder
+
+    async def stop_recording(call: ServiceCall) -> ServiceResponse:
+        """Stop recording and write the remaining payloads."""
+        data = hass.data[DOMAIN]
+        if (recorder := data[DATA_RECORDER]) is None:
+            raise HomeAssistantError("SmartThings webhooks are not being recorded")
+        data[DATA_RECORDER] = None
+        await recorder.async_stop()
+        if not call.return_response:
+            return None
+        return {"filename": recorder.path, "recorded": recorder.recorded}
+
+    hass.services.async_register(
+        DOMAIN, SERVICE_START_PROFILE, start_profile, schema=START_PROFILE_SCHEMA
+    )
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_STOP_PROFILE,
+        stop_profile,
+        supports_response=SupportsResponse.OPTIONAL,
+    )
+    hass.services.async_register(DOMAIN, SERVICE_START_RECORDING, start_recording)
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_STOP_RECORDING,
+        stop_recording,
+        supports_response=SupportsResponse.OPTIONAL,
+    )
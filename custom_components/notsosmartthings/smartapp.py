@@ -3,13 +3,15 @@
 from __future__ import annotations
 import asyncio
 import functools
+from http import HTTPStatus
 import logging
 import secrets
+import time
 from typing import Any
 from urllib.parse import urlparse
 from uuid import uuid4
 
-from aiohttp import web
+from aiohttp import ClientResponseError, web
 from pysmartapp import Dispatcher, SmartAppManager
 from pysmartapp.const import SETTINGS_APP_ID
 from pysmartthings import (
@@ -31,7 +33,6 @@ from homeassistant.components import cloud, webhook
 from homeassistant.config_entries import ConfigFlowResult
 from homeassistant.const import CONF_WEBHOOK_ID
 from homeassistant.core import HomeAssistant
-from homeassistant.helpers.aiohttp_client import async_get_clientsession
 from homeassistant.helpers.dispatcher import (
     async_dispatcher_connect,
     async_dispatcher_send,
@@ -39,6 +40,7 @@ from homeassistant.helpers.dispatcher import (
 from homeassistant.helpers.network import NoURLAvailableError, get_url
 from homeassistant.helpers.storage import Store
 
+from .api import async_get_api
 from .const import (
     APP_NAME_PREFIX,
     APP_OAUTH_CLIENT_NAME,
@@ -47,9 +49,15 @@ from .const import (
     CONF_INSTALLED_APP_ID,
     CONF_INSTANCE_ID,
     CONF_REFRESH_TOKEN,
+    DATA_ACCOUNTS,
+    DATA_APPS,
     DATA_BROKERS,
     DATA_MANAGER,
+    DATA_METRICS,
+    DATA_RECORDER,
+    DATA_TOKEN_MANAGERS,
     DOMAIN,
+    FIND_APP_CONCURRENCY,
     IGNORED_CAPABILITIES,
     SETTINGS_INSTANCE_ID,
     SIGNAL_SMARTAPP_PREFIX,
@@ -57,6 +65,8 @@ from .const import (
     STORAGE_VERSION,
     SUBSCRIPTION_WARNING_LIMIT,
 )
+from .metrics import METRIC_WEBHOOK_HANDLE, METRIC_WEBHOOK_READ, Metrics
+from .tokens import async_persist_refresh_token
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -67,19 +77,89 @@ def format_unique_id(app_id: str, location_id: str) -> str:
 
 
 async def find_app(hass: HomeAssistant, api: SmartThings) -> AppEntity | None:
-    """Find an existing SmartApp for this installation of hass."""
-    apps = await api.apps()
-    for app in [app for app in apps if app.app_name.startswith(APP_NAME_PREFIX)]:
-        # Load settings to compare instance id
-        settings = await app.settings()
-        if (
-            settings.settings.get(SETTINGS_INSTANCE_ID)
-            == hass.data[DOMAIN][CONF_INSTANCE_ID]
-        ):
+    """Find an existing SmartApp for this installation of hass.
+
+    Apps found before are validated first with a single request. Otherwise
+    the settings of the apps are compared concurrently until one matches.
+    The app returned has all of its attributes loaded.
+    """
+    instance_id = hass.data[DOMAIN][CONF_INSTANCE_ID]
+    known_apps: dict[str, str] = hass.data[DOMAIN][DATA_APPS]
+    for app_id in [
+        app_id
+        for app_id, app_instance_id in known_apps.items()
+        if app_instance_id == instance_id
+    ]:
+        try:
+            app = await api.app(app_id)
+        except ClientResponseError as ex:
+            if ex.status == HTTPStatus.NOT_FOUND:
+                await async_forget_app(hass, app_id)
+                continue
+            # Belonging to the account of another access token
+            if ex.status == HTTPStatus.FORBIDDEN:
+                continue
+            raise
+        if app.app_name.startswith(APP_NAME_PREFIX):
             return app
+
+    apps = [
+        app
+        for app in await api.apps()
+        if app.app_name.startswith(APP_NAME_PREFIX) and app.app_id not in known_apps
+    ]
+    semaphore = asyncio.Semaphore(FIND_APP_CONCURRENCY)
+
+    async def matches(app: AppEntity) -> bool:
+        async with semaphore:
+            # Load settings to compare instance id
+            settings = await app.settings()
+        return settings.settings.get(SETTINGS_INSTANCE_ID) == instance_id
+
+    tasks = {asyncio.create_task(matches(app)): app for app in apps}
+    pending = set(tasks)
+    try:
+        while pending:
+            done, pending = await asyncio.wait(
+                pending, return_when=asyncio.FIRST_COMPLETED
+            )
+            if match := next((tasks[task] for task in done if task.result()), None):
+                await match.refresh()  # load all attributes
+                await async_remember_app(hass, match.app_id)
+                return match
+    finally:
+        for task in pending:
+            task.cancel()
+        await asyncio.gather(*pending, return_exceptions=True)
     return None
 
 
+async def async_remember_app(hass: HomeAssistant, app_id: str) -> None:
+    """Store the app of this installation so later lookups validate it."""
+    known_apps: dict[str, str] = hass.data[DOMAIN][DATA_APPS]
+    known_apps[app_id] = hass.data[DOMAIN][CONF_INSTANCE_ID]
+    await _async_save_config(hass)
+
+
+async def async_forget_app(hass: HomeAssistant, app_id: str) -> None:
+    """Remove a deleted app from the stored apps."""
+    if hass.data[DOMAIN][DATA_APPS].pop(app_id, None) is not None:
+        await _async_save_config(hass)
+
+
+async def _async_save_config(hass: HomeAssistant) -> None:
+    """Save the configuration of this installation to the store."""
+    store = Store[dict[str, Any]](hass, STORAGE_VERSION, STORAGE_KEY)
+    await store.async_save(
+        {
+            CONF_INSTANCE_ID: hass.data[DOMAIN][CONF_INSTANCE_ID],
+            CONF_WEBHOOK_ID: hass.data[DOMAIN][CONF_WEBHOOK_ID],
+            CONF_CLOUDHOOK_URL: hass.data[DOMAIN][CONF_CLOUDHOOK_URL],
+            DATA_APPS: hass.data[DOMAIN][DATA_APPS],
+        }
+    )
+
+
 async def validate_installed_app(api, installed_app_id: str):
     """Ensure the specified installed SmartApp is valid and functioning.
 
@@ -163,6 +243,7 @@ async def create_app(hass: HomeAssistant, api):
     oauth.scope.extend(APP_OAUTH_SCOPES)
     await api.update_app_oauth(oauth)
     _LOGGER.debug("Updated App OAuth for SmartApp '%s' (%s)", app.app_name, app.app_id)
+    await async_remember_app(hass, app.app_id)
     return app, client
 
 
@@ -266,7 +347,12 @@ async def setup_smartapp_endpoint(hass: HomeAssistant, fresh_install: bool):
     hass.data[DOMAIN] = {
         DATA_MANAGER: manager,
         CONF_INSTANCE_ID: config[CONF_INSTANCE_ID],
+        DATA_ACCOUNTS: {},
+        DATA_APPS: config.get(DATA_APPS, {}),
         DATA_BROKERS: {},
+        DATA_METRICS: Metrics(),
+        DATA_RECORDER: None,
+        DATA_TOKEN_MANAGERS: {},
         CONF_WEBHOOK_ID: config[CONF_WEBHOOK_ID],
         # Will not be present if not enabled
         CONF_CLOUDHOOK_URL: config.get(CONF_CLOUDHOOK_URL),
@@ -288,14 +374,8 @@ async def unload_smartapp_endpoint(hass: HomeAssistant):
     if cloudhook_url and cloud.async_is_logged_in(hass):
         await cloud.async_delete_cloudhook(hass, hass.data[DOMAIN][CONF_WEBHOOK_ID])
         # Remove cloudhook from storage
-        store = Store[dict[str, Any]](hass, STORAGE_VERSION, STORAGE_KEY)
-        await store.async_save(
-            {
-                CONF_INSTANCE_ID: hass.data[DOMAIN][CONF_INSTANCE_ID],
-                CONF_WEBHOOK_ID: hass.data[DOMAIN][CONF_WEBHOOK_ID],
-                CONF_CLOUDHOOK_URL: None,
-            }
-        )
+        hass.data[DOMAIN][CONF_CLOUDHOOK_URL] = None
+        await _async_save_config(hass)
         _LOGGER.debug("Cloudhook '%s' was removed", cloudhook_url)
     # Remove the webhook
     webhook.async_unregister(hass, hass.data[DOMAIN][CONF_WEBHOOK_ID])
@@ -304,6 +384,9 @@ async def unload_smartapp_endpoint(hass: HomeAssistant):
         broker.disconnect()
     # Remove all handlers from manager
     hass.data[DOMAIN][DATA_MANAGER].dispatcher.disconnect_all()
+    # Write out what has been recorded
+    if (recorder := hass.data[DOMAIN][DATA_RECORDER]) is not None:
+        await recorder.async_stop()
     # Remove the component data
     hass.data.pop(DOMAIN)
 
@@ -314,9 +397,10 @@ async def smartapp_sync_subscriptions(
     location_id: str,
     installed_app_id: str,
     devices,
-):
-    """Synchronize subscriptions of an installed up."""
-    api = SmartThings(async_get_clientsession(hass), auth_token)
+    account_token: str,
+) -> dict[str, Any]:
+    """Synchronize subscriptions of an installed up and return the plan."""
+    api = async_get_api(hass, auth_token, account_token)
     tasks = []
 
     async def create_subscription(target: str):
@@ -405,14 +489,21 @@ async def smartapp_sync_subscriptions(
         capabilities,
     )
 
+    plan = {
+        "capabilities": sorted(capabilities),
+        "limit": SUBSCRIPTION_WARNING_LIMIT,
+    }
+
     # Get current subscriptions and find differences
     subscriptions = await api.subscriptions(installed_app_id)
+    removed = 0
     for subscription in subscriptions:
         if subscription.capability in capabilities:
             capabilities.remove(subscription.capability)
         else:
             # Delete the subscription
             tasks.append(delete_subscription(subscription))
+            removed += 1
 
     # Remaining capabilities need subscriptions created
     tasks.extend([create_subscription(c) for c in capabilities])
@@ -421,6 +512,7 @@ async def smartapp_sync_subscriptions(
         await asyncio.gather(*tasks)
     else:
         _LOGGER.debug("Subscriptions for app '%s' are up-to-date", installed_app_id)
+    return {**plan, "created": len(capabilities), "removed": removed}
 
 
 async def _find_and_continue_flow(
@@ -508,10 +600,7 @@ async def smartapp_update(hass: HomeAssistant, req, resp, app):
         ),
         None,
     )
-    if entry:
-        hass.config_entries.async_update_entry(
-            entry, data={**entry.data, CONF_REFRESH_TOKEN: req.refresh_token}
-        )
+    if entry and async_persist_refresh_token(hass, entry, req.refresh_token):
         _LOGGER.debug(
             "Updated config entry '%s' for SmartApp '%s' under parent app '%s'",
             entry.entry_id,
@@ -559,6 +648,15 @@ async def smartapp_webhook(hass: HomeAssistant, webhook_id: str, request):
     validates the signature for authenticity.
     """
     manager = hass.data[DOMAIN][DATA_MANAGER]
+    metrics: Metrics = hass.data[DOMAIN][DATA_METRICS]
+    start = time.perf_counter()
     data = await request.json()
+    read = time.perf_counter()
+    # Verifies the signature, then handles the lifecycle or dispatches events
     result = await manager.handle_request(data, request.headers)
+    if metrics.enabled:
+        metrics.observe(METRIC_WEBHOOK_READ, read - start)
+        metrics.observe(METRIC_WEBHOOK_HANDLE, time.perf_counter() - read)
+    if (recorder := hass.data[DOMAIN][DATA_RECORDER]) is not None:
+        recorder.async_record(data, request.headers)
     return web.json_response(result)
@@ -2,15 +2,15 @@
 
 from __future__ import annotations
 
-from collections.abc import Sequence
+from collections.abc import Iterable, Sequence
 from typing import Any
 
-from pysmartthings import Capability
+from pysmartthings import Capability, DeviceEntity
 
 from homeassistant.components.switch import SwitchEntity
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import Platform
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 
 from .const import DATA_BROKERS, DOMAIN
@@ -24,20 +24,26 @@ async def async_setup_entry(
 ) -> None:
     """Add switches for a config entry."""
     broker = hass.data[DOMAIN][DATA_BROKERS][config_entry.entry_id]
-    entities: list[SwitchEntity] = []
 
-    for device in broker.devices.values():
-        if broker.any_assigned(device.device_id, Platform.SWITCH):
-            device_components = get_device_components(device)
+    @callback
+    def async_add_devices(devices: Iterable[DeviceEntity]) -> None:
+        entities: list[SwitchEntity] = []
 
-            for component_id in list(device_components.keys()):
-                attributes = device_components[component_id]["attributes"]
-                disabled_capabilities = device_components[component_id]["disabled_capabilities"]    
-               
-                if attributes is None or Platform.SWITCH in attributes:
-                    entities.append(SmartThingsSwitch(device, component_id))
+        for device in devices:
+            if broker.any_assigned(device.device_id, Platform.SWITCH):
+                device_components = get_device_components(device)
 
-    async_add_entities(entities)
+                for component_id in list(device_components.keys()):
+                    attributes = device_components[component_id]["attributes"]
+                    disabled_capabilities = device_components[component_id]["disabled_capabilities"]    
+                   
+                    if attributes is None or Platform.SWITCH in attributes:
+                        entities.append(SmartThingsSwitch(device, component_id))
+
+        async_add_entities(entities)
+
+    async_add_devices(broker.devices.values())
+    config_entry.async_on_unload(broker.async_listen_devices_added(async_add_devices))
 
 
 def get_capabilities(capabilities: Sequence[str]) -> Sequence[str] | None:
@@ -0,0 +1,105 @@
+"""Throttling of the state writes of frequently reporting sensors."""
+
+from __future__ import annotations
+
+from collections import Counter
+from collections.abc import Mapping
+from typing import Any, NamedTuple
+
+from .const import (
+    CONF_DEADBAND,
+    CONF_DEADBAND_PERCENT,
+    CONF_MAX_STALENESS,
+    CONF_MIN_INTERVAL,
+    CONF_THROTTLE,
+    THROTTLE_DEFAULTS,
+)
+
+
+class Deadband(NamedTuple):
+    """Changes of a numeric sensor value too small to be written."""
+
+    absolute: float = 0.0
+    relative: float = 0.0  # share of the value last written
+
+    def contains(self, previous: float, value: float) -> bool:
+        """Return True if the change from the previous value is too small."""
+        change = abs(value - previous)
+        return change < self.absolute or change < self.relative * abs(previous)
+
+
+class ThrottleRule(NamedTuple):
+    """When the changes of a sensor are written."""
+
+    min_interval: float = 0.0  # seconds between writes
+    deadband: Deadband | None = None
+    max_staleness: float = 0.0  # seconds a change within the deadband is held
+
+    @classmethod
+    def from_options(cls, options: Mapping[str, Any]) -> ThrottleRule:
+        """Create the rule from the options of a capability or attribute."""
+        absolute = options.get(CONF_DEADBAND, 0.0)
+        relative = options.get(CONF_DEADBAND_PERCENT, 0.0) / 100
+        return cls(
+            options.get(CONF_MIN_INTERVAL, 0.0),
+            Deadband(absolute, relative) if absolute or relative else None,
+            options.get(CONF_MAX_STALENESS, 0.0),
+        )
+
+
+class Throttle:
+    """Throttling state of the writes of one entity."""
+
+    def __init__(self, rule: ThrottleRule, saved: Counter[str]) -> None:
+        """Create the throttle of an entity."""
+        self.rule = rule
+        self.saved = saved
+        self.last_write = 0.0
+        self.held = False  # a change within the deadband was not written
+        self.forced = False  # the held change is being written
+
+
+class ThrottlePolicy:
+    """Throttle rules of a config entry by capability or attribute.
+
+    Rules set in the options of the entry replace the defaults of the same
+    capability or attribute. A rule of an attribute takes precedence over
+    the rule of its capability.
+    """
+
+    def __init__(self, options: Mapping[str, Any]) -> None:
+        """Create the policy from the options of the entry."""
+        self.rules: dict[str, ThrottleRule] = {
+            key: ThrottleRule.from_options(value)
+            for key, value in {
+                **THROTTLE_DEFAULTS,
+                **options.get(CONF_THROTTLE, {}),
+            }.items()
+        }
+        self.saved: Counter[str] = Counter()
+
+    def create(
+        self, capability: str, attribute: str, deadband: Deadband | None = None
+    ) -> Throttle | None:
+        """Return the throttle of a sensor, if any rule applies to it.
+
+        The deadband is used when the rule does not have one. A rule of all
+        zeros turns throttling off, the deadband included.
+        """
+        rule = self.rules.get(attribute) or self.rules.get(capability)
+        if rule == ThrottleRule():
+            return None
+        if rule is None:
+            if deadband is None:
+                return None
+            rule = ThrottleRule(deadband=deadband)
+        elif rule.deadband is None and deadband is not None:
+            rule = rule._replace(deadband=deadband)
+        return Throttle(rule, self.saved)
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the rules and the writes saved by reason."""
+        return {
+            "rules": {key: rule._asdict() for key, rule in self.rules.items()},
+            "saved": dict(self.saved),
+        }
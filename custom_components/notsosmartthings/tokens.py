@@ -0,0 +1,173 @@
+"""OAuth tokens of SmartThings installed apps."""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+
+from aiohttp import ClientConnectionError, ClientResponseError
+from pysmartthings import APIInvalidGrant, OAuthToken
+
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import CONF_ACCESS_TOKEN, CONF_CLIENT_ID, CONF_CLIENT_SECRET
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers.event import async_call_later
+
+from .api import async_get_api
+from .const import (
+    CONF_INSTALLED_APP_ID,
+    CONF_REFRESH_TOKEN,
+    DATA_TOKEN_MANAGERS,
+    DOMAIN,
+    TOKEN_REFRESH_MARGIN,
+    TOKEN_REFRESH_RETRY,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+
+@callback
+def async_persist_refresh_token(
+    hass: HomeAssistant, entry: ConfigEntry, refresh_token: str
+) -> bool:
+    """Store the refresh token in the entry and return whether it changed."""
+    if entry.data.get(CONF_REFRESH_TOKEN) == refresh_token:
+        return False
+    hass.config_entries.async_update_entry(
+        entry, data={**entry.data, CONF_REFRESH_TOKEN: refresh_token}
+    )
+    return True
+
+
+class TokenManager:
+    """Access token of an installed app, refreshed once for all callers.
+
+    Concurrent refreshes share a single request. The access token is
+    cached until shortly before it expires and refreshed in the background
+    ahead of that, so callers only wait when there is no valid token. Each
+    refresh also rotates the refresh token, which is what keeps it from
+    expiring, and the entry is only updated when the refresh token changed.
+    """
+
+    def __init__(self, hass: HomeAssistant, entry: ConfigEntry) -> None:
+        """Create a manager for the installed app of the entry."""
+        self._hass = hass
+        self._entry = entry
+        self._token: OAuthToken | None = None
+        self._expires_at = 0.0
+        self._refresh: asyncio.Task[OAuthToken] | None = None
+        self._scheduled: CALLBACK_TYPE | None = None
+        self._started = False
+
+    @property
+    def token(self) -> OAuthToken | None:
+        """Return the current token, if one was obtained."""
+        return self._token
+
+    async def async_get_access_token(self) -> str:
+        """Return a valid access token, refreshing it only when required."""
+        now = time.monotonic()
+        if self._token is None or now >= self._expires_at:
+            return (await self.async_refresh()).access_token
+        if now >= self._expires_at - TOKEN_REFRESH_MARGIN.total_seconds():
+            self._async_start_refresh()
+        return self._token.access_token
+
+    async def async_refresh(self) -> OAuthToken:
+        """Refresh the token, joining the refresh in flight if there is one."""
+        return await asyncio.shield(self._async_start_refresh())
+
+    @callback
+    def _async_start_refresh(self) -> asyncio.Task[OAuthToken]:
+        if self._refresh is None:
+            self._refresh = self._hass.async_create_task(
+                self._async_refresh(), "smartthings token refresh", eager_start=False
+            )
+            self._refresh.add_done_callback(self._async_refresh_done)
+        return self._refresh
+
+    async def _async_refresh(self) -> OAuthToken:
+        api = async_get_api(self._hass, self._entry.data[CONF_ACCESS_TOKEN])
+        token = await api.generate_tokens(
+            self._entry.data[CONF_CLIENT_ID],
+            self._entry.data[CONF_CLIENT_SECRET],
+            self._entry.data[CONF_REFRESH_TOKEN],
+        )
+        self._token = token
+        self._expires_at = time.monotonic() + token.expires_in
+        if async_persist_refresh_token(self._hass, self._entry, token.refresh_token):
+            _LOGGER.debug(
+                "Regenerated refresh token for installed app: %s",
+                self._entry.data[CONF_INSTALLED_APP_ID],
+            )
+        return token
+
+    @callback
+    def _async_refresh_done(self, task: asyncio.Task[OAuthToken]) -> None:
+        self._refresh = None
+        if task.cancelled():
+            return
+        if (ex := task.exception()) is None:
+            self._async_schedule(
+                self._token.expires_in - TOKEN_REFRESH_MARGIN.total_seconds()
+            )
+            return
+        if isinstance(ex, APIInvalidGrant):
+            _LOGGER.error(
+                "The refresh token of installed app %s is no longer valid",
+                self._entry.data[CONF_INSTALLED_APP_ID],
+            )
+            self._entry.async_start_reauth(self._hass)
+            return
+        _LOGGER.debug("Unable to refresh the token: %s", ex)
+        if isinstance(ex, (ClientResponseError, ClientConnectionError)):
+            self._async_schedule(TOKEN_REFRESH_RETRY.total_seconds())
+
+    @callback
+    def _async_schedule(self, delay: float) -> None:
+        """Schedule the next proactive refresh while the manager is started."""
+        self._async_cancel_scheduled()
+        if not self._started:
+            return
+
+        @callback
+        def refresh(now) -> None:
+            self._scheduled = None
+            self._async_start_refresh()
+
+        self._scheduled = async_call_later(self._hass, max(delay, 0), refresh)
+
+    @callback
+    def _async_cancel_scheduled(self) -> None:
+        if self._scheduled:
+            self._scheduled()
+            self._scheduled = None
+
+    @callback
+    def async_start(self) -> CALLBACK_TYPE:
+        """Refresh the token ahead of expiry until the returned callback."""
+        self._started = True
+        if self._token is not None and self._refresh is None:
+            self._async_schedule(
+                self._expires_at
+                - time.monotonic()
+                - TOKEN_REFRESH_MARGIN.total_seconds()
+            )
+
+        @callback
+        def stop() -> None:
+            self._started = False
+            self._async_cancel_scheduled()
+
+        return stop
+
+
+@callback
+def async_get_token_manager(hass: HomeAssistant, entry: ConfigEntry) -> TokenManager:
+    """Return the token manager of the installed app of the entry."""
+    managers: dict[str, TokenManager] = hass.data[DOMAIN][DATA_TOKEN_MANAGERS]
+    installed_app_id = entry.data[CONF_INSTALLED_APP_ID]
+    if (manager := managers.get(installed_app_id)) is None:
+        manager = managers[installed_app_id] = TokenManager(hass, entry)
+    return manager
@@ -1,12 +1,16 @@
 """Shared functionality to serve multiple HA components."""
 
+import sys
 from typing import Any
 from pysmartthings import DeviceStatusBase
 
 def format_component_name(
     prefix: str, suffix: str, component_id: str | None, delimiter: str = " "
 ) -> str:
-    """Format component name according to convention."""
+    """Format component name according to convention.
+
+    Names are interned, entities of the same device share their parts.
+    """
     parts = [prefix]
 
     if component_id != None and component_id != "main":
@@ -16,7 +20,7 @@ def format_component_name(
 
     component_name = delimiter.join(parts)
 
-    return component_name
+    return sys.intern(component_name)
 
 
 def get_device_status(device, component_id: str | None) -> DeviceStatusBase:
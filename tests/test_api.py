@@ -0,0 +1,58 @@
+"""Tests of the API client shared by the integration."""
+
+from __future__ import annotations
+
+import asyncio
+from unittest.mock import MagicMock, patch
+
+from aiohttp import ClientConnectionError, ServerTimeoutError
+from pysmartthings.api import Api
+import pytest
+
+from custom_components.notsosmartthings.api import SmartThingsApi
+from custom_components.notsosmartthings.metrics import Metrics
+from custom_components.notsosmartthings.ratelimit import RateLimiter
+from custom_components.notsosmartthings.resilience import (
+    CircuitBreakers,
+    is_transient,
+)
+
+API = "custom_components.notsosmartthings.api"
+
+
+def create_api() -> SmartThingsApi:
+    """Create an API whose requests are sent right away."""
+    return SmartThingsApi(
+        MagicMock(), "token", RateLimiter(10, 1), CircuitBreakers(), Metrics()
+    )
+
+
+async def hang(*args) -> None:
+    """Wait for a response that never arrives."""
+    await asyncio.Event().wait()
+
+
+def test_request_timeout_is_connection_error() -> None:
+    """A request timing out raises the timeout error of aiohttp."""
+    api = create_api()
+    with (
+        patch(f"{API}.API_REQUEST_TIMEOUT", 0.01),
+        patch.object(Api, "request", hang),
+        pytest.raises(ClientConnectionError) as exc_info,
+    ):
+        asyncio.run(api._async_send("post devices", "post", "devices", None, {}))
+    assert isinstance(exc_info.value, ServerTimeoutError)
+    assert isinstance(exc_info.value.__cause__, TimeoutError)
+    assert is_transient(exc_info.value)
+
+
+def test_server_timeout_not_wrapped() -> None:
+    """A timeout raised by aiohttp is raised as it is."""
+    api = create_api()
+    error = ServerTimeoutError("Timeout on reading data from socket")
+    with (
+        patch.object(Api, "request", side_effect=error),
+        pytest.raises(ServerTimeoutError) as exc_info,
+    ):
+        asyncio.run(api._async_send("get devices", "get", "devices", None, None))
+    assert exc_info.value is error
@@ -0,0 +1,278 @@
+"""Tests of the throttling of sensor state writes."""
+
+from __future__ import annotations
+
+from collections import Counter
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from homeassistant.components.sensor import SensorEntity
+
+from custom_components.notsosmartthings.const import THROTTLE_DEFAULTS
+from custom_components.notsosmartthings.sensor import SmartThingsThrottledSensor
+from custom_components.notsosmartthings.throttle import (
+    Deadband,
+    Throttle,
+    ThrottlePolicy,
+    ThrottleRule,
+)
+
+SENSOR = "custom_components.notsosmartthings.sensor"
+
+
+def test_deadband_absolute() -> None:
+    """Changes smaller than the absolute deadband are contained."""
+    deadband = Deadband(absolute=1.0)
+    assert deadband.contains(100.0, 100.5)
+    assert deadband.contains(100.0, 99.5)
+    assert not deadband.contains(100.0, 101.0)
+    assert not deadband.contains(100.0, 98.5)
+
+
+def test_deadband_relative() -> None:
+    """Changes smaller than a share of the previous value are contained."""
+    deadband = Deadband(relative=0.02)
+    assert deadband.contains(100.0, 101.5)
+    assert not deadband.contains(100.0, 102.5)
+    assert not deadband.contains(0.0, 0.1)
+
+
+def test_rule_from_options() -> None:
+    """Rules are created from the options of a capability or attribute."""
+    assert ThrottleRule.from_options({}) == ThrottleRule()
+    assert ThrottleRule.from_options(
+        {"min_interval": 10, "deadband_percent": 5, "max_staleness": 300}
+    ) == ThrottleRule(10, Deadband(0.0, 0.05), 300)
+    assert ThrottleRule.from_options({"deadband": 0.5}).deadband == Deadband(0.5)
+
+
+def test_policy_defaults() -> None:
+    """Capabilities with a default rule are throttled without options."""
+    policy = ThrottlePolicy({})
+    throttle = policy.create("powerMeter", "power")
+    assert throttle is not None
+    assert throttle.rule == ThrottleRule.from_options(THROTTLE_DEFAULTS["powerMeter"])
+    assert policy.create("switchLevel", "level") is None
+
+
+def test_policy_attribute_rule_takes_precedence() -> None:
+    """An attribute rule is used over the rule of its capability."""
+    policy = ThrottlePolicy({"throttle": {"power": {"min_interval": 30}}})
+    assert policy.create("powerMeter", "power").rule.min_interval == 30
+    assert policy.create("powerMeter", "other").rule.min_interval == 10
+
+
+def test_policy_sensor_deadband() -> None:
+    """The deadband of the sensor is used when the rule has none."""
+    policy = ThrottlePolicy({})
+    assert policy.create("powerMeter", "power", Deadband(1.0)).rule.deadband == (
+        Deadband(1.0)
+    )
+    assert policy.create("voltageMeasurement", "voltage", Deadband(0.5)).rule == (
+        ThrottleRule(deadband=Deadband(0.5))
+    )
+    policy = ThrottlePolicy({"throttle": {"powerMeter": {"deadband": 5}}})
+    assert policy.create("powerMeter", "power", Deadband(1.0)).rule.deadband == (
+        Deadband(5.0)
+    )
+
+
+def test_policy_zero_rule_turns_throttling_off() -> None:
+    """A rule of all zeros turns throttling off, the sensor deadband included."""
+    zeros = {"min_interval": 0, "deadband": 0, "deadband_percent": 0}
+    policy = ThrottlePolicy(
+        {"throttle": {"powerMeter": {**zeros, "max_staleness": 0}}}
+    )
+    assert policy.create("powerMeter", "power", Deadband(1.0)) is None
+
+
+def test_policy_counts_saved_writes() -> None:
+    """Throttles of a policy count the saved writes of the policy."""
+    policy = ThrottlePolicy({})
+    policy.create("powerMeter", "power").saved["deadband"] += 1
+    policy.create("energyMeter", "energy").saved["min_interval"] += 2
+    assert policy.as_dict()["saved"] == {"deadband": 1, "min_interval": 2}
+    assert policy.as_dict()["rules"]["powerMeter"]["min_interval"] == 10
+
+
+class Meter(SmartThingsThrottledSensor):
+    """Sensor whose value is set by the tests."""
+
+    _attr_suggested_display_precision = 1
+
+    def __init__(self, throttle: Throttle | None) -> None:
+        """Create the sensor."""
+        super().__init__(
+            MagicMock(label="Meter", device_id="meter", device_info=None), throttle
+        )
+        self.hass = MagicMock()
+
+    def update(self, value: float) -> None:
+        """Report a value as a device event does."""
+        self._attr_native_value = value
+        self._async_handle_device_update()
+
+
+@pytest.fixture
+def clock():
+    """Return the monotonic clock seen by the sensors."""
+    with patch(f"{SENSOR}.time") as mock_time:
+        mock_time.monotonic.return_value = 1000.0
+        yield mock_time.monotonic
+
+
+@pytest.fixture
+def timers():
+    """Return the mock scheduling the delayed writes."""
+    with patch(f"{SENSOR}.async_call_later") as call_later:
+        yield call_later
+
+
+@pytest.fixture
+def writes():
+    """Return the mock recording the state writes."""
+    with patch.object(SensorEntity, "async_write_ha_state") as write:
+        yield write
+
+
+def create_meter(
+    min_interval: float = 10.0,
+    deadband: Deadband | None = Deadband(absolute=1.0),
+    max_staleness: float = 300.0,
+) -> tuple[Meter, Counter[str]]:
+    """Create a meter with a throttle and return the writes it saves."""
+    saved: Counter[str] = Counter()
+    rule = ThrottleRule(min_interval, deadband, max_staleness)
+    return Meter(Throttle(rule, saved)), saved
+
+
+def fire(timers: MagicMock) -> None:
+    """Run the action of the last scheduled write."""
+    _hass, _delay, action = timers.call_args.args
+    action(None)
+
+
+def test_first_value_written(clock, timers, writes) -> None:
+    """The first value is written right away."""
+    meter, saved = create_meter()
+    meter.update(100.0)
+    assert writes.call_count == 1
+    assert not saved
+    timers.assert_not_called()
+
+
+def test_value_rounded_to_display_precision(clock, timers, writes) -> None:
+    """Changes below the display precision are not written."""
+    meter, _saved = create_meter(min_interval=0, deadband=None)
+    meter.update(100.0)
+    clock.return_value += 1
+    meter.update(100.04)
+    assert writes.call_count == 1
+
+
+def test_change_within_deadband_held(clock, timers, writes) -> None:
+    """A change within the deadband is held until the max staleness."""
+    meter, saved = create_meter()
+    meter.update(100.0)
+    clock.return_value += 20
+    meter.update(100.5)
+    assert writes.call_count == 1
+    assert saved == {"deadband": 1}
+    assert timers.call_args.args[1] == 280
+
+    # Held changes that follow keep the write scheduled
+    clock.return_value += 20
+    meter.update(100.6)
+    assert saved == {"deadband": 2}
+    assert timers.call_count == 1
+
+    fire(timers)
+    assert writes.call_count == 2
+    assert meter._state_fingerprint[1] == 100.6
+    assert not meter._throttle.forced
+
+
+def test_change_within_min_interval_deferred(clock, timers, writes) -> None:
+    """A change within the min interval is written once it passed."""
+    meter, saved = create_meter()
+    meter.update(100.0)
+    clock.return_value += 4
+    meter.update(150.0)
+    assert writes.call_count == 1
+    assert saved == {"min_interval": 1}
+    assert timers.call_args.args[1] == 6
+
+    clock.return_value += 6
+    fire(timers)
+    assert writes.call_count == 2
+    assert meter._state_fingerprint[1] == 150.0
+
+
+def test_change_after_min_interval_written(clock, timers, writes) -> None:
+    """A change outside of the deadband after the min interval is written."""
+    meter, saved = create_meter()
+    meter.update(100.0)
+    clock.return_value += 10
+    meter.update(102.0)
+    assert writes.call_count == 2
+    assert not saved
+
+
+def test_write_cancels_scheduled_write(clock, timers, writes) -> None:
+    """A write cancels the write scheduled for a held change."""
+    meter, _saved = create_meter()
+    meter.update(100.0)
+    clock.return_value += 20
+    meter.update(100.5)
+    cancel = timers.return_value
+
+    clock.return_value += 20
+    meter.update(105.0)
+    assert writes.call_count == 2
+    cancel.assert_called_once()
+    assert meter._cancel_write is None
+
+
+def test_change_within_min_interval_after_held_change(clock, timers, writes) -> None:
+    """A change within the min interval is written before a held change is due."""
+    meter, saved = create_meter()
+    meter.update(100.0)
+    clock.return_value += 5
+    meter.update(100.5)
+    assert timers.call_args.args[1] == 295
+    cancel = timers.return_value
+
+    clock.return_value += 1
+    meter.update(150.0)
+    assert saved == {"deadband": 1, "min_interval": 1}
+    cancel.assert_called_once()
+    assert timers.call_count == 2
+    assert timers.call_args.args[1] == 4
+
+    clock.return_value += 4
+    fire(timers)
+    assert writes.call_count == 2
+    assert meter._state_fingerprint[1] == 150.0
+
+
+def test_without_max_staleness_held_change_not_scheduled(
+    clock, timers, writes
+) -> None:
+    """Changes within the deadband are dropped without a max staleness."""
+    meter, saved = create_meter(max_staleness=0)
+    meter.update(100.0)
+    clock.return_value += 20
+    meter.update(100.5)
+    assert saved == {"deadband": 1}
+    timers.assert_not_called()
+
+
+def test_without_throttle_every_change_written(clock, timers, writes) -> None:
+    """Sensors without a throttle write every change."""
+    meter = Meter(None)
+    meter.update(100.0)
+    meter.update(100.5)
+    meter.update(100.5)
+    assert writes.call_count == 2
+    timers.assert_not_called()